@@ -9,22 +9,21 @@ import random
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from eve_gateway import GatewayError, LLMGateway, gateway_from_env
 
 
 @dataclass(frozen=True)
 class AppConfig:
     """Runtime configuration resolved from environment and local assets."""
 
-    groq_api_key: Optional[str]
-    groq_model: str
+    llm_providers: str
     technical_csv_path: Path
     core_markdown_path: Path
 
@@ -35,21 +34,16 @@ def resolve_config() -> AppConfig:
 
     here = Path(__file__).resolve().parent
     return AppConfig(
-        groq_api_key=os.getenv("GROQ_API_KEY"),
-        groq_model=os.getenv("GROQ_MODEL", "llama-3.1-70b-versatile"),
+        llm_providers=os.getenv("EVE_LLM_PROVIDERS", "groq,openai"),
         technical_csv_path=here / "eve_technical_data_20260226_112820.csv",
         core_markdown_path=here / "Igniting the EVE HEI Omega Holographic Core.md",
     )
 
 
-def build_client(cfg: AppConfig) -> Optional[OpenAI]:
-    """Create Groq OpenAI-compatible client (if configured)."""
-    if not cfg.groq_api_key:
-        return None
-    try:
-        return OpenAI(api_key=cfg.groq_api_key, base_url="https://api.groq.com/openai/v1")
-    except Exception:
-        return None
+@st.cache_resource
+def build_client(cfg: AppConfig) -> LLMGateway:
+    """Create the shared LLM gateway (Groq first, failing over to OpenAI)."""
+    return gateway_from_env(cfg.llm_providers)
 
 
 def read_text_safe(path: Path) -> str:
@@ -229,8 +223,8 @@ def render_beaches_gallery() -> None:
             st.image(f, caption=f.name, use_container_width=True)
 
 
-def render_chat(client: Optional[OpenAI], model: str) -> None:
-    """Groq chat tab (kept intact, with small robustness)."""
+def render_chat(client: LLMGateway) -> None:
+    """Groq chat tab, served through the LLM gateway."""
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
@@ -254,13 +248,11 @@ def render_chat(client: Optional[OpenAI], model: str) -> None:
 
     if client:
         try:
-            completion = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "system", "content": system_prompt}] + st.session_state.messages,
+            reply = client.complete(
+                [{"role": "system", "content": system_prompt}] + st.session_state.messages,
                 temperature=0.7,
-            )
-            reply = completion.choices[0].message.content
-        except Exception:
+            ).content
+        except GatewayError:
             reply = "Eve is temporarily offline. Mesh disruption detected."
     else:
         reply = "Groq connection unavailable. Running in offline sovereign mode."
@@ -363,7 +355,7 @@ section[data-testid="stSidebar"] {
 
     with tab4:
         glass_card_open()
-        render_chat(client=client, model=cfg.groq_model)
+        render_chat(client=client)
         glass_card_close()
 
     with tab5:
@@ -0,0 +1,29 @@
+"""
+EVE Voice AI - Batch Chat API Endpoint
+Serverless function for Vercel deployment
+
+Request handling lives in eve_api, shared with the self-hosted ASGI app.
+"""
+
+from http.server import BaseHTTPRequestHandler
+import os
+import sys
+
+# Add parent directory to path to import eve_api
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from eve_api import BATCH_PATH, serve_http
+
+
+class handler(BaseHTTPRequestHandler):
+    """Vercel serverless function handler for batch chat"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_OPTIONS(self):
+        """Handle preflight OPTIONS request"""
+        serve_http(self, BATCH_PATH)
+
+    def do_POST(self):
+        """Handle POST request with a list of messages"""
+        serve_http(self, BATCH_PATH)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+EVE Compression Benchmark - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Measures the bandwidth eve_compression saves on typical EVE API payloads,
+and what it costs in CPU. No server or keys are needed: the payloads are
+built in process the way the handlers build them.
+
+Payloads:
+    status       GET /api/chat (agent status, capabilities, admission)
+    chat         POST /api/chat answer of ~170 words
+    batch        POST /api/batch with 32 answers
+    voice        POST /api/voice base64 JSON for ~4 s of speech
+    chat-stream  POST /api/chat SSE, one event per delta, flushed per event
+
+Usage:
+    python benchmarks/compression_bench.py [--repeat 200]
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# An answer in EVE's register; repeated words and JSON keys are typical
+ANSWER = (
+    "Here is where things stand. Your ledger is up to date as of this morning, with 14 entries "
+    "recorded this week and a running balance of 2,418.50. Three tasks remain open in "
+    "EVE_UNFINISHED_TASKS.csv: renewing the domain before the end of the month, filing the Q3 "
+    "report, and reviewing the contract draft that arrived on Tuesday. The domain renewal is "
+    "the most urgent, since the registrar sends its final notice in five days. The Q3 report "
+    "needs the September figures, which are already in the ledger, so it should take about an "
+    "hour. The contract review can wait until next week unless the other party asked for a "
+    "faster turnaround. If you like, I can draft a short summary of the September figures now, "
+    "set a reminder for the domain renewal, or read the contract's key terms aloud so you can "
+    "decide whether it needs a closer look. Just let me know which one to start with."
+)
+
+
+def _status_payload() -> bytes:
+    """GET /api/chat exactly as served, with a local agent"""
+    os.environ.setdefault("EVE_STORE_PATH", "")
+    os.environ.setdefault("EVE_LOG_FILE", "")
+    from eve_api import CHAT_PATH, ApiRequest, dispatch
+    return dispatch(ApiRequest(method="GET", path=CHAT_PATH)).body
+
+
+def _chat_payload() -> bytes:
+    return json.dumps({
+        "success": True, "message": "What's left on my plate this week?", "response": ANSWER,
+        "route": "llm", "timestamp": "2026-02-13T20:00:00.000+00:00",
+    }).encode()
+
+
+def _batch_payload(items: int = 32) -> bytes:
+    # Each answer reorders the vocabulary, so the batch isn't one text repeated
+    words = ANSWER.split(" ")
+    answers = [" ".join(random.Random(i).sample(words, 45)) for i in range(items)]
+    results = [{
+        "index": i, "message": f"Summarize task {i}: {answers[i][:60]}",
+        "response": answers[i], "route": "llm", "success": True,
+        "latency_ms": round(700 + i * 13.7, 1), "duplicate_of": None,
+    } for i in range(items)]
+    return json.dumps({"success": True, "count": items, "unique": items, "results": results,
+                       "total_ms": 2480.3, "timestamp": "2026-02-13T20:00:02.480+00:00"}).encode()
+
+
+def _voice_payload(seconds: float = 4.0) -> bytes:
+    # MP3 frames are close to random bytes, so random data is a fair model
+    audio = os.urandom(int(seconds * 128_000 / 8))
+    return json.dumps({"success": True, "audio": base64.b64encode(audio).decode(),
+                       "format": "mp3", "text": ANSWER[:80]}).encode()
+
+
+def _sse_events() -> List[bytes]:
+    from eve_api import sse_event
+    words = ANSWER.split(" ")
+    events = [b": connected\n\n"]
+    for i in range(0, len(words), 2):
+        events.append(sse_event({"delta": " ".join(words[i:i + 2]) + " "}, "delta"))
+    events.append(sse_event({
+        "success": True, "route": "llm", "provider": "openai", "model": "gpt-4",
+        "usage": {"prompt_tokens": 412, "completion_tokens": 214, "total_tokens": 626},
+        "first_token_ms": 310.2, "latency_ms": 4210.5, "error": False, "cancelled": False,
+        "total_ms": 4213.1, "timestamp": "2026-02-13T20:00:04.213+00:00",
+    }, "done"))
+    return events
+
+
+def _timed(fn: Callable[[], int], repeat: int) -> Tuple[int, float]:
+    """(encoded bytes, microseconds per run)"""
+    size = fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return size, (time.perf_counter() - started) / repeat * 1e6
+
+
+def measure(body: bytes, encodings: List[str], repeat: int) -> Dict[str, Tuple[int, float]]:
+    from eve_compression import compress
+    return {encoding: _timed(lambda: len(compress(body, encoding)), repeat) for encoding in encodings}
+
+
+def measure_stream(events: List[bytes], encodings: List[str], repeat: int) -> Dict[str, Tuple[int, float]]:
+    from eve_compression import CompressedStream
+    return {encoding: _timed(lambda: sum(len(c) for c in CompressedStream(iter(events), encoding)), repeat)
+            for encoding in encodings}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200, help="encodings timed per payload")
+    args = parser.parse_args()
+
+    from eve_compression import BROTLI_AVAILABLE
+    encodings = ["gzip"] + (["br"] if BROTLI_AVAILABLE else [])
+
+    bodies = {
+        "status": _status_payload(),
+        "chat": _chat_payload(),
+        "batch": _batch_payload(),
+        "voice": _voice_payload(),
+    }
+    events = _sse_events()
+
+    print(f"Python {sys.version.split()[0]}, brotli {'available' if BROTLI_AVAILABLE else 'not installed'}\n")
+    header = f"{'payload':<12} {'raw B':>8}"
+    for encoding in encodings:
+        header += f" {encoding + ' B':>8} {'saved':>6} {'us':>7}"
+    print(header)
+
+    rows = [(name, len(body), measure(body, encodings, args.repeat)) for name, body in bodies.items()]
+    rows.append(("chat-stream", sum(len(e) for e in events), measure_stream(events, encodings, args.repeat)))
+    for name, raw, results in rows:
+        line = f"{name:<12} {raw:>8}"
+        for encoding in encodings:
+            size, micros = results[encoding]
+            line += f" {size:>8} {1 - size / raw:>6.0%} {micros:>7.0f}"
+        print(line)
+
+    print(f"\nchat-stream: {len(events)} events, each flushed on its own "
+          f"(raw {sum(len(e) for e in events) / len(events):.0f} B/event)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
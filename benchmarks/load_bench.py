@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+EVE Load Benchmark - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Drives EVE at a target request rate against local stub OpenAI and
+ElevenLabs servers (benchmarks/stub_servers.py), so no keys or credits are
+used, and reports p50/p95/p99 latency and throughput per target.
+
+Load is open-loop: requests are issued on a fixed schedule whether or not
+earlier ones have finished, and latency is measured from each request's
+scheduled start, so queueing inside EVE shows up in the numbers instead of
+silently lowering the offered rate.
+
+Targets:
+    agent          EVEAgent.chat_with_route, in process
+    agent-stream   EVEAgent.chat_stream, in process (TTFB = first delta)
+    chat           POST /api/chat through api/chat.py
+    chat-stream    POST /api/chat with "stream": true (SSE)
+    voice          POST /api/voice (base64 JSON) through api/voice.py
+    voice-stream   POST /api/voice with "stream": true
+
+HTTP targets are served by http.server, as on Vercel, or with --server asgi
+by eve_asgi under uvicorn.
+
+Usage:
+    python benchmarks/load_bench.py [--targets agent,chat,voice] [--rps 20] [--duration 10]
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_servers import ElevenLabsStub, OpenAIStub  # noqa: E402
+
+# A call returns the perf_counter time of its first byte (streams) or None
+Call = Callable[[int], Optional[float]]
+
+TARGETS = ["agent", "agent-stream", "chat", "chat-stream", "voice", "voice-stream"]
+
+
+class TargetResult:
+    """Latencies and outcomes for one target"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.first_bytes: List[float] = []
+        self.errors: Counter = Counter()
+        self.started = 0.0
+        self.finished = 0.0
+
+    @property
+    def throughput(self) -> float:
+        elapsed = self.finished - self.started
+        return len(self.latencies) / elapsed if elapsed > 0 else 0.0
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else float("nan")
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def run_load(name: str, call: Call, rps: float, duration: float, concurrency: int) -> TargetResult:
+    """Issue calls at `rps` for `duration` seconds on up to `concurrency` threads"""
+    result = TargetResult(name)
+    lock = threading.Lock()
+
+    def timed(index: int, scheduled: float):
+        try:
+            first_byte = call(index)
+        except Exception as e:
+            with lock:
+                result.errors[str(e)[:80] or type(e).__name__] += 1
+            return
+        done = time.perf_counter()
+        with lock:
+            result.latencies.append(done - scheduled)
+            if first_byte is not None:
+                result.first_bytes.append(first_byte - scheduled)
+            result.finished = max(result.finished, done)
+
+    total = max(1, int(rps * duration))
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        result.started = time.perf_counter()
+        for index in range(total):
+            scheduled = result.started + index / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(timed, index, scheduled)
+    return result
+
+
+def configure_environment(llm: OpenAIStub, tts: ElevenLabsStub, tts_cache: bool):
+    """Point EVE at the stubs; must run before EVE modules are imported"""
+    os.environ.update({
+        "EVE_LLM_PROVIDERS": "openai",
+        "OPENAI_API_KEY": "stub-key",
+        "OPENAI_MODEL": "stub-model",
+        "OPENAI_BASE_URL": llm.base_url,
+        "ELEVENLABS_API_KEY": "stub-key",
+        "ELEVENLABS_BASE_URL": tts.base_url,
+        "EVE_TTS_CACHE_MAX_MB": os.environ.get("EVE_TTS_CACHE_MAX_MB", "100") if tts_cache else "0",
+        "EVE_STORE_PATH": "",
+        "EVE_LOG_FILE": "",
+        # Every request comes from one client; per-client limits would cap the offered rate
+        "EVE_API_RATE_LIMIT": "off",
+    })
+
+
+class HttpTarget:
+    """Serves the EVE API locally and makes requests to it, one session per thread"""
+
+    def __init__(self, server: str):
+        import requests
+        self._requests = requests
+        self._local = threading.local()
+        self._stop: Callable[[], None]
+        if server == "asgi":
+            self.base_url = self._start_asgi()
+        else:
+            self.base_url = self._start_functions()
+
+    def _start_functions(self) -> str:
+        """api/*.py handlers on http.server, one port per function like Vercel's routing"""
+        import runpy
+        servers = {}
+        for path in ("/api/chat", "/api/voice"):
+            module = runpy.run_path(os.path.join(REPO_ROOT, path.lstrip("/") + ".py"))
+            handler = module["handler"]
+            handler.log_message = lambda *args: None
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            server.daemon_threads = True
+            server.request_queue_size = 1024
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers[path] = server
+        self._ports = {path: server.server_address[1] for path, server in servers.items()}
+        self._stop = lambda: [server.shutdown() for server in servers.values()]
+        return ""
+
+    def _start_asgi(self) -> str:
+        import uvicorn
+        import eve_asgi
+        server = uvicorn.Server(uvicorn.Config(eve_asgi.app, host="127.0.0.1", port=0,
+                                               log_level="warning", backlog=1024))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        self._ports = {}
+        self._stop = lambda: setattr(server, "should_exit", True)
+        return f"http://127.0.0.1:{port}"
+
+    def url(self, path: str) -> str:
+        if self.base_url:
+            return self.base_url + path
+        return f"http://127.0.0.1:{self._ports[path]}{path}"
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = self._requests.Session()
+        return self._local.session
+
+    def post(self, path: str, payload: Dict, stream: bool = False) -> Optional[float]:
+        response = self.session.post(self.url(path), json=payload, stream=stream, timeout=60)
+        first_byte = None
+        if stream:
+            for chunk in response.iter_content(chunk_size=None):
+                if chunk and first_byte is None:
+                    first_byte = time.perf_counter()
+        else:
+            response.content
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return first_byte
+
+    def stop(self):
+        self._stop()
+
+
+def build_calls(targets: List[str], server: str) -> Dict[str, Call]:
+    from eve_voice_agent import get_eve
+    agent = get_eve()
+    http = HttpTarget(server) if any(not t.startswith("agent") for t in targets) else None
+    phrases = itertools.cycle(["Good morning", "Your ledger is up to date", "Three tasks remain open"])
+
+    def agent_chat(index: int) -> Optional[float]:
+        agent.chat_with_route(f"Benchmark question {index}", include_history=False)
+        return None
+
+    def agent_stream(index: int) -> Optional[float]:
+        first_byte = None
+        for _ in agent.chat_stream(f"Benchmark question {index}", include_history=False):
+            if first_byte is None:
+                first_byte = time.perf_counter()
+        return first_byte
+
+    calls: Dict[str, Call] = {"agent": agent_chat, "agent-stream": agent_stream}
+    if http is not None:
+        calls.update({
+            "chat": lambda i: http.post("/api/chat", {"message": f"Benchmark question {i}",
+                                                      "include_history": False}),
+            "chat-stream": lambda i: http.post("/api/chat", {"message": f"Benchmark question {i}",
+                                                             "include_history": False, "stream": True},
+                                               stream=True),
+            "voice": lambda i: http.post("/api/voice", {"text": f"{next(phrases)} {i}"}),
+            "voice-stream": lambda i: http.post("/api/voice", {"text": f"{next(phrases)} {i}", "stream": True},
+                                                stream=True),
+        })
+    return {name: calls[name] for name in targets}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", default="agent,chat,chat-stream,voice",
+                        help=f"comma-separated, from: {', '.join(TARGETS)}")
+    parser.add_argument("--rps", type=float, default=20.0, help="offered requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per target")
+    parser.add_argument("--concurrency", type=int, default=256, help="maximum outstanding requests")
+    parser.add_argument("--server", choices=["functions", "asgi"], default="functions",
+                        help="serve HTTP targets as Vercel-style functions or via eve_asgi")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stub seconds to first token")
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--tokens", type=int, default=20, help="stub words per reply")
+    parser.add_argument("--token-interval", type=float, default=0.01)
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="stub seconds to first audio byte")
+    parser.add_argument("--tts-jitter", type=float, default=0.05)
+    parser.add_argument("--tts-cache", action="store_true",
+                        help="keep EVE's TTS cache on (repeated phrases are then served locally)")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = sorted(set(targets) - set(TARGETS))
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+
+    llm = OpenAIStub(latency=args.llm_latency, jitter=args.llm_jitter, tokens=args.tokens,
+                     token_interval=args.token_interval).start()
+    tts = ElevenLabsStub(latency=args.tts_latency, jitter=args.tts_jitter).start()
+    configure_environment(llm, tts, args.tts_cache)
+    calls = build_calls(targets, args.server)
+
+    print(f"Python {sys.version.split()[0]}, {args.rps:g} req/s for {args.duration:g}s per target, "
+          f"server={args.server}")
+    print(f"Stubs: LLM {args.llm_latency * 1000:.0f}+/-{args.llm_jitter * 1000:.0f} ms + "
+          f"{args.tokens} x {args.token_interval * 1000:.0f} ms tokens, "
+          f"TTS {args.tts_latency * 1000:.0f}+/-{args.tts_jitter * 1000:.0f} ms\n")
+    print(f"{'target':<14} {'ok':>6} {'err':>5} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'ttfb p50':>9} {'ttfb p95':>9}")
+    errors: Dict[str, Counter] = {}
+    for name, call in calls.items():
+        call(-1)  # Warm up clients and connection pools
+        result = run_load(name, call, args.rps, args.duration, args.concurrency)
+        latencies = [s * 1000.0 for s in result.latencies]
+        first_bytes = [s * 1000.0 for s in result.first_bytes]
+        ttfb = (f"{percentile(first_bytes, 50):>9.1f} {percentile(first_bytes, 95):>9.1f}"
+                if first_bytes else f"{'-':>9} {'-':>9}")
+        print(f"{name:<14} {len(latencies):>6} {sum(result.errors.values()):>5} {result.throughput:>7.1f} "
+              f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} "
+              f"{percentile(latencies, 99):>8.1f} {ttfb}")
+        if result.errors:
+            errors[name] = result.errors
+
+    for name, counts in errors.items():
+        print(f"\nErrors - {name}")
+        for message, count in counts.most_common(5):
+            print(f"  {count:>5}  {message}")
+    print(f"\nStub calls: LLM {llm.requests}, TTS {tts.requests}")
+    llm.stop()
+    tts.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+EVE Cold-Start Benchmark - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Times EVE's cold start the way a serverless worker sees it: every sample is
+a fresh interpreter, so nothing is warm in sys.modules. Reports the median
+and spread for importing the agent, importing each API function module, and
+constructing the agent plus a first get_status() call. With --importtime the
+slowest modules from `python -X importtime` are listed for each scenario.
+
+Usage:
+    python benchmarks/startup_bench.py [--runs 15] [--importtime]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each scenario prints its own elapsed seconds so interpreter boot is excluded
+SCENARIOS: Dict[str, str] = {
+    "import eve_voice_agent": (
+        "import time; t = time.perf_counter(); import eve_voice_agent; "
+        "print(time.perf_counter() - t)"
+    ),
+    "import api/chat.py": (
+        "import time, runpy; t = time.perf_counter(); runpy.run_path('api/chat.py'); "
+        "print(time.perf_counter() - t)"
+    ),
+    "import api/voice.py": (
+        "import time, runpy; t = time.perf_counter(); runpy.run_path('api/voice.py'); "
+        "print(time.perf_counter() - t)"
+    ),
+    "get_eve() + get_status()": (
+        "import time; t = time.perf_counter(); from eve_voice_agent import get_eve; "
+        "get_eve().get_status(); print(time.perf_counter() - t)"
+    ),
+}
+
+
+def _run(code: str, extra_args: Tuple[str, ...] = ()) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def time_scenario(code: str, runs: int) -> List[float]:
+    """Elapsed seconds for `runs` fresh-interpreter executions"""
+    _run(code)  # Warm the bytecode cache so compilation isn't measured
+    return [float(_run(code).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def import_offenders(code: str, top: int = 8) -> List[Tuple[float, str]]:
+    """Slowest modules by cumulative import time (milliseconds)"""
+    stderr = _run(code, ("-X", "importtime")).stderr
+    offenders = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        try:
+            offenders.append((int(cumulative) / 1000.0, name))
+        except ValueError:
+            continue
+    return sorted(offenders, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=15, help="fresh interpreters per scenario")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {args.runs} runs per scenario\n")
+    print(f"{'scenario':<28} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for name, code in SCENARIOS.items():
+        samples = [s * 1000.0 for s in time_scenario(code, args.runs)]
+        print(f"{name:<28} {statistics.median(samples):>10.1f} {min(samples):>8.1f} {max(samples):>8.1f}")
+
+    if args.importtime:
+        for name, code in SCENARIOS.items():
+            print(f"\nSlowest imports - {name}")
+            for millis, module in import_offenders(code):
+                print(f"  {millis:>8.1f} ms  {module.strip()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
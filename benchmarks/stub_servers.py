@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+EVE Stub Servers - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Local stand-ins for the OpenAI chat-completions and ElevenLabs
+text-to-speech APIs, so EVE can be benchmarked without keys or credits.
+Both speak enough of the real protocols for the official SDKs:
+
+- OpenAI: POST /v1/chat/completions, plain JSON or SSE streaming (with
+  stream_options.include_usage)
+- ElevenLabs: POST /v1/text-to-speech/{voice_id}[/stream], chunked MP3-ish
+  bytes sized like real speech
+
+Latency is `latency` +/- `jitter` seconds (uniform) before the first byte,
+then `token_interval` / `chunk_interval` between streamed pieces.
+
+Usage:
+    python benchmarks/stub_servers.py [--llm-latency 0.3] [--tts-latency 0.2]
+    OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 ELEVENLABS_BASE_URL=http://127.0.0.1:<port>
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# MPEG-1 Layer III frame header (128 kbps, 44.1 kHz) followed by padding
+_FAKE_FRAME = b"\xff\xfb\x90\x64" + bytes(413)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a deep accept backlog, run on a daemon thread"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handler: type, port: int = 0, latency: float = 0.3, jitter: float = 0.05):
+        super().__init__(("127.0.0.1", port), handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def first_byte_delay(self) -> float:
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def count(self):
+        with self._count_lock:
+            self.requests += 1
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-response are expected under load
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+
+
+# ── OpenAI chat completions ─────────────────────────────────────────────────
+
+class OpenAIHandler(_StubHandler):
+    server: "OpenAIStub"
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        self.server.count()
+        body = self._read_json()
+        model = body.get("model", "stub-model")
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        words = [f" word{i}" for i in range(self.server.tokens)]
+        words[0] = words[0].lstrip()
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                 "total_tokens": prompt_tokens + len(words)}
+        time.sleep(self.server.first_byte_delay())
+
+        if not body.get("stream"):
+            time.sleep(self.server.token_interval * len(words))
+            self._send_json(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(words)}}],
+                "usage": usage,
+            })
+            return
+
+        self._start_chunked("text/event-stream")
+        try:
+            for index, word in enumerate(words):
+                if index:
+                    time.sleep(self.server.token_interval)
+                delta = {"role": "assistant", "content": word} if index == 0 else {"content": word}
+                self._event({"choices": [{"index": 0, "delta": delta, "finish_reason": None}]}, model)
+            self._event({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}, model)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._event({"choices": [], "usage": usage}, model)
+            self._chunk(b"data: [DONE]\n\n")
+            self._end_chunked()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # Client cancelled the stream
+
+    def _event(self, fields: Dict[str, Any], model: str):
+        chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk",
+                 "created": int(time.time()), "model": model, **fields}
+        self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+
+
+class OpenAIStub(StubServer):
+    """
+    OpenAI-compatible chat-completions server
+
+    Args:
+        latency: Seconds to the first token (or to the full reply, before
+            token time, when not streaming)
+        jitter: Uniform +/- spread on latency
+        tokens: Words per reply
+        token_interval: Seconds between streamed tokens
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.3, jitter: float = 0.05,
+                 tokens: int = 20, token_interval: float = 0.01):
+        super().__init__(OpenAIHandler, port, latency, jitter)
+        self.tokens = max(1, tokens)
+        self.token_interval = token_interval
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+
+# ── ElevenLabs text-to-speech ───────────────────────────────────────────────
+
+_TTS_PATH = re.compile(r"^/v1/text-to-speech/[^/]+(/stream)?/?$")
+
+
+class ElevenLabsHandler(_StubHandler):
+    server: "ElevenLabsStub"
+
+    def do_POST(self):
+        match = _TTS_PATH.match(self.path.split("?", 1)[0])
+        if match is None:
+            self._send_json(404, {"detail": f"Unknown path {self.path}"})
+            return
+        self.server.count()
+        text = self._read_json().get("text", "")
+        size = max(len(_FAKE_FRAME), len(text) * self.server.bytes_per_char)
+        audio = (_FAKE_FRAME * (size // len(_FAKE_FRAME) + 1))[:size]
+        time.sleep(self.server.first_byte_delay())
+
+        if not match.group(1):
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+            return
+
+        self._start_chunked("audio/mpeg")
+        try:
+            for offset in range(0, len(audio), self.server.chunk_bytes):
+                if offset:
+                    time.sleep(self.server.chunk_interval)
+                self._chunk(audio[offset:offset + self.server.chunk_bytes])
+            self._end_chunked()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class ElevenLabsStub(StubServer):
+    """
+    ElevenLabs-compatible text-to-speech server
+
+    Args:
+        latency: Seconds to the first audio byte
+        jitter: Uniform +/- spread on latency
+        bytes_per_char: Audio bytes per input character (~1 KB is typical
+            for 128 kbps speech)
+        chunk_bytes: Size of streamed chunks
+        chunk_interval: Seconds between streamed chunks
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.2, jitter: float = 0.05,
+                 bytes_per_char: int = 1000, chunk_bytes: int = 4096, chunk_interval: float = 0.005):
+        super().__init__(ElevenLabsHandler, port, latency, jitter)
+        self.bytes_per_char = bytes_per_char
+        self.chunk_bytes = chunk_bytes
+        self.chunk_interval = chunk_interval
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--llm-port", type=int, default=8901)
+    parser.add_argument("--tts-port", type=int, default=8902)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--token-interval", type=float, default=0.01)
+    parser.add_argument("--tts-latency", type=float, default=0.2)
+    parser.add_argument("--tts-jitter", type=float, default=0.05)
+    args = parser.parse_args()
+
+    llm = OpenAIStub(args.llm_port, args.llm_latency, args.llm_jitter, args.tokens, args.token_interval).start()
+    tts = ElevenLabsStub(args.tts_port, args.tts_latency, args.tts_jitter).start()
+    print(f"OpenAI stub:     {llm.base_url}")
+    print(f"ElevenLabs stub: {tts.base_url}")
+    print("Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    llm.stop()
+    tts.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+EVE Admission Control - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Bounded concurrency for EVE's API endpoints. Each endpoint has a limiter
+with a cap on in-flight requests and a bounded FIFO wait queue. A request
+that finds the queue full is rejected at once (429); one that waits past
+the queue deadline gets a 503. Both carry a Retry-After estimated from
+recent service times. Under overload the server keeps its in-flight work
+at the cap and sheds the excess quickly, instead of piling up upstream
+model and TTS calls until every request times out.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised when a request is not admitted"""
+
+    def __init__(self, status: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status = status            # 429 queue full, 503 queue deadline passed
+        self.message = message
+        self.retry_after = retry_after  # Seconds
+
+
+class _Waiter:
+    __slots__ = ("granted", "notify")
+
+    def __init__(self, notify: Callable[[], None]):
+        self.granted = False
+        self.notify = notify
+
+
+class Permit:
+    """An admitted request's slot; release it exactly once when the work ends"""
+
+    def __init__(self, limiter: "Limiter"):
+        self._limiter = limiter
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._limiter._release(time.perf_counter() - self._started)
+
+
+class Limiter:
+    """
+    In-flight cap plus bounded FIFO queue for one endpoint
+
+    Args:
+        name: Endpoint name, for status and error messages
+        max_in_flight: Requests served at once
+        max_queue: Requests allowed to wait for a slot
+        queue_timeout: Seconds a request may wait before it is rejected
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.service_time: Optional[float] = None  # EWMA seconds per request
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def _enter(self, notify: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a free slot (returns None) or join the queue (returns the waiter)"""
+        with self._lock:
+            if self.in_flight < self.max_in_flight and not self._waiters:
+                self.in_flight += 1
+                self.admitted += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self.rejected_full += 1
+                raise Overloaded(429, f"{self.name} is at capacity; try again shortly",
+                                 self._retry_after_locked())
+            waiter = _Waiter(notify)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _give_up(self, waiter: _Waiter) -> bool:
+        """After a queue timeout: True if the slot arrived anyway, else leave the queue"""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            self.rejected_timeout += 1
+            retry_after = self._retry_after_locked()
+        raise Overloaded(503, f"{self.name} is overloaded; timed out waiting for capacity", retry_after)
+
+    def _abandon(self, waiter: _Waiter):
+        """A waiter went away (cancelled); pass on a slot it was already given"""
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                return
+        self._release(None)
+
+    def _release(self, elapsed: Optional[float]):
+        with self._lock:
+            if elapsed is not None:
+                self.service_time = elapsed if self.service_time is None else \
+                    self.service_time + 0.2 * (elapsed - self.service_time)
+            if self._waiters:
+                # Hand the slot straight to the oldest waiter
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self.admitted += 1
+                waiter.notify()
+            else:
+                self.in_flight -= 1
+
+    def _retry_after_locked(self) -> int:
+        """Seconds until the queue has likely drained"""
+        per_request = self.service_time if self.service_time is not None else 1.0
+        return max(1, math.ceil(per_request * (len(self._waiters) + 1) / self.max_in_flight))
+
+    def acquire(self) -> Permit:
+        """
+        Wait (blocking) for a slot
+
+        Raises:
+            Overloaded: 429 if the queue is full, 503 if no slot freed up
+                within queue_timeout
+        """
+        event = threading.Event()
+        waiter = self._enter(event.set)
+        if waiter is not None and not event.wait(self.queue_timeout):
+            self._give_up(waiter)
+        return Permit(self)
+
+    async def acquire_async(self) -> Permit:
+        """Like acquire(), but waits on the event loop instead of a thread"""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enter(lambda: loop.call_soon_threadsafe(event.set))
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(event.wait(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._give_up(waiter)
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        return Permit(self)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected_full": self.rejected_full,
+                "rejected_timeout": self.rejected_timeout,
+                "service_ms": round(self.service_time * 1000, 1) if self.service_time is not None else None,
+            }
+
+
+# (max in-flight, max queue) per endpoint; voice is kept low because TTS
+# providers cap concurrent synthesis per account, and each batch request
+# fans out into several chat calls of its own
+DEFAULT_LIMITS = {"chat": (16, 32), "batch": (2, 4), "voice": (4, 16)}
+
+
+def limiters_from_env() -> Dict[str, Limiter]:
+    """
+    Build one limiter per endpoint from the environment
+
+    EVE_API_<NAME>_MAX_IN_FLIGHT and EVE_API_<NAME>_MAX_QUEUE override
+    DEFAULT_LIMITS; EVE_API_QUEUE_TIMEOUT (seconds, default 10) applies to all.
+    """
+    queue_timeout = float(os.getenv("EVE_API_QUEUE_TIMEOUT", "10"))
+    limiters = {}
+    for name, (max_in_flight, max_queue) in DEFAULT_LIMITS.items():
+        prefix = f"EVE_API_{name.upper()}_"
+        limiters[name] = Limiter(
+            name,
+            int(os.getenv(prefix + "MAX_IN_FLIGHT", str(max_in_flight))),
+            int(os.getenv(prefix + "MAX_QUEUE", str(max_queue))),
+            queue_timeout,
+        )
+    return limiters
@@ -0,0 +1,931 @@
+"""
+EVE HTTP API - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Transport-neutral handling for EVE's chat and voice endpoints. Handlers take
+an ApiRequest and return an ApiResponse whose body is either bytes or an
+iterator of byte chunks (streamed audio, Server-Sent Events for chat). The
+Vercel functions in api/
+(via serve_http) and the self-hosted ASGI app (eve_asgi) are thin adapters
+over dispatch(), so every deployment behaves the same.
+"""
+
+import base64
+import json
+import math
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from eve_admission import Limiter, Overloaded, Permit, limiters_from_env
+from eve_compression import MIN_BYTES as COMPRESS_MIN_BYTES
+from eve_compression import STREAM_ENCODINGS, CompressedStream, compress, compressible, negotiate
+from eve_idempotency import IdempotencyConflict, fingerprint, idempotency_from_env
+from eve_ratelimit import rate_limiter_from_env
+from eve_status import StatusSnapshot
+
+try:
+    from eve_voice_agent import current_eve, eve_load_error, get_eve
+    EVE_IMPORT_ERROR: Optional[str] = None
+except ImportError as e:
+    current_eve = eve_load_error = get_eve = None
+    EVE_IMPORT_ERROR = str(e)
+
+CHAT_PATH = "/api/chat"
+BATCH_PATH = "/api/batch"
+VOICE_PATH = "/api/voice"
+
+# Seconds between SSE comment lines while the model is silent; keeps proxies
+# from timing out the connection and surfaces disconnects
+SSE_HEARTBEAT_S = float(os.getenv("EVE_SSE_HEARTBEAT", "15"))
+
+# Read size when sending cached audio from disk
+FILE_CHUNK_BYTES = 64 * 1024
+
+# Larger request bodies are refused (413) without being read
+MAX_BODY_BYTES = int(float(os.getenv("EVE_API_MAX_BODY_KB", "256")) * 1024)
+
+# Batch requests: messages per request, and answers generated at once per request
+BATCH_MAX_ITEMS = int(os.getenv("EVE_API_BATCH_MAX_ITEMS", "64"))
+BATCH_CONCURRENCY = int(os.getenv("EVE_API_BATCH_CONCURRENCY", "8"))
+
+LIMITERS: Dict[str, Limiter] = limiters_from_env()
+
+# The limiter gating each (path, method); status and preflight requests are
+# never queued
+ADMISSION: Dict[Tuple[str, str], str] = {
+    (CHAT_PATH, "POST"): "chat",
+    (BATCH_PATH, "POST"): "batch",
+    (VOICE_PATH, "GET"): "voice",
+    (VOICE_PATH, "POST"): "voice",
+}
+
+# Routes honouring Idempotency-Key: a retry joins the original request or
+# replays its stored 2xx response instead of calling the model again
+IDEMPOTENCY = idempotency_from_env()
+IDEMPOTENT_ROUTES = {(CHAT_PATH, "POST"), (BATCH_PATH, "POST")}
+# Seconds a retry waits for the original request to finish
+IDEMPOTENCY_WAIT_S = float(os.getenv("EVE_API_IDEMPOTENCY_WAIT", "30"))
+
+# Seconds between background rebuilds of the GET /api/chat status snapshot
+STATUS_INTERVAL_S = float(os.getenv("EVE_API_STATUS_INTERVAL", "5"))
+
+# Per-client token buckets (None when EVE_API_RATE_LIMIT=off)
+RATE_LIMITER = rate_limiter_from_env()
+# Header holding the real client address behind a trusted proxy; Vercel's
+# edge sets x-real-ip and overwrites any value the client sent
+CLIENT_IP_HEADER = os.getenv("EVE_API_CLIENT_IP_HEADER", "x-real-ip" if os.getenv("VERCEL") else "").lower()
+
+Headers = List[Tuple[str, str]]
+
+
+class ApiError(Exception):
+    """An error reported to the client as a JSON response"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Headers] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or []
+
+
+@dataclass
+class ApiRequest:
+    """One HTTP request, independent of the server that received it"""
+
+    method: str
+    path: str
+    headers: Dict[str, str] = field(default_factory=dict)  # Lower-case names
+    body: bytes = b""
+    client: str = ""
+    query: str = ""
+    quota: Optional[List[Tuple[str, str]]] = None  # RateLimit-* headers, once throttle() has run
+
+    def header(self, name: str, default: str = "") -> str:
+        return self.headers.get(name.lower(), default)
+
+    def param(self, name: str, default: str = "") -> str:
+        """A query-string parameter"""
+        return dict(parse_qsl(self.query)).get(name, default)
+
+    def json(self) -> Dict[str, Any]:
+        """The body parsed as a JSON object"""
+        try:
+            data = json.loads(self.body.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, ValueError):
+            raise ApiError(400, "Request body must be valid JSON") from None
+        if not isinstance(data, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return data
+
+
+@dataclass
+class ApiResponse:
+    """Status, headers and either a complete body or a chunk stream"""
+
+    status: int
+    headers: Headers = field(default_factory=list)
+    body: bytes = b""
+    stream: Optional[Iterator[bytes]] = None
+    on_close: List[Callable[[], None]] = field(default_factory=list)
+    # HEAD for a body whose length is not known without producing it
+    unsized: bool = False
+
+    def close(self):
+        """Release the stream (stops upstream generation if unfinished)"""
+        try:
+            close = getattr(self.stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            while self.on_close:
+                self.on_close.pop()()
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        return next((value for key, value in self.headers if key.lower() == name), None)
+
+
+def cors_headers(methods: str) -> Headers:
+    return [
+        ("Access-Control-Allow-Origin", "*"),
+        ("Access-Control-Allow-Methods", methods),
+        ("Access-Control-Allow-Headers", "Content-Type, Range, If-None-Match, If-Range, Idempotency-Key"),
+        ("Access-Control-Expose-Headers",
+         "Content-Length, Content-Range, Accept-Ranges, ETag, Retry-After, Idempotent-Replayed, "
+         "RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset, RateLimit-Policy"),
+    ]
+
+
+def json_response(status: int, payload: Any, headers: Optional[Headers] = None) -> ApiResponse:
+    return ApiResponse(
+        status=status,
+        headers=[("Content-Type", "application/json")] + (headers or []),
+        body=json.dumps(payload).encode(),
+    )
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> bytes:
+    """One Server-Sent Event with a JSON payload"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _unavailable_voice() -> ApiResponse:
+    return json_response(503, {
+        "success": False,
+        "error": "Voice synthesis not available. Please check ElevenLabs API configuration."
+    })
+
+
+# ── Chat ────────────────────────────────────────────────────────────────────
+
+def chat_post(request: ApiRequest) -> ApiResponse:
+    """POST /api/chat - answer one message, as JSON or (with stream) as SSE"""
+    data = request.json()
+    user_message = data.get('message', '')
+    include_history = data.get('include_history', True)
+    if not user_message:
+        return json_response(400, {"error": "No message provided"})
+
+    if data.get('stream') or "text/event-stream" in request.header("accept"):
+        return _stream_chat(user_message, include_history)
+
+    if get_eve is None:
+        response_text = "EVE is not available. Please check server configuration."
+        route = "unavailable"
+    else:
+        result = get_eve().chat_with_route(user_message, include_history=include_history)
+        response_text = result["response"]
+        route = result["route"]
+
+    return json_response(200, {
+        "success": True,
+        "message": user_message,
+        "response": response_text,
+        "route": route,
+        "timestamp": utc_timestamp()
+    })
+
+
+def _stream_chat(user_message: str, include_history: bool) -> ApiResponse:
+    """
+    Stream the answer as Server-Sent Events
+
+    Events: `delta` ({"delta": text}) as the model produces text, then one
+    `done` event with route, provider, model, usage and timing (or `error`).
+    Comment lines are sent every SSE_HEARTBEAT_S seconds while waiting.
+    The agent runs on its own thread; closing the response (client
+    disconnect) cancels the upstream generation.
+    """
+    cancel = threading.Event()
+    info: Dict[str, Any] = {}
+    events: "queue.Queue" = queue.Queue()
+
+    def produce():
+        try:
+            if get_eve is None:
+                info["route"] = "unavailable"
+                deltas = iter(["EVE is not available. Please check server configuration."])
+            else:
+                deltas = get_eve().chat_stream(user_message, include_history, cancel=cancel, info=info)
+            for delta in deltas:
+                events.put(sse_event({"delta": delta}, "delta"))
+        except Exception as e:
+            info["error"] = True
+            events.put(sse_event({"success": False, "error": str(e)}, "error"))
+        finally:
+            events.put(None)
+
+    def chunks() -> Iterator[bytes]:
+        started = time.perf_counter()
+        threading.Thread(target=produce, name="eve-sse", daemon=True).start()
+        try:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    event = events.get(timeout=SSE_HEARTBEAT_S)
+                except queue.Empty:
+                    yield b": heartbeat\n\n"
+                    continue
+                if event is None:
+                    break
+                yield event
+            yield sse_event({
+                "success": not info.get("error", False),
+                **info,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                "timestamp": utc_timestamp(),
+            }, "done")
+        finally:
+            cancel.set()
+
+    return ApiResponse(
+        status=200,
+        headers=[("Content-Type", "text/event-stream"), ("Cache-Control", "no-cache"),
+                 ("X-Accel-Buffering", "no")],
+        stream=chunks(),
+    )
+
+
+def _build_status() -> Dict[str, Any]:
+    """
+    EVE's status for the snapshot; a probe must never create the agent
+
+    Without a loaded agent nothing can be answered yet, so the status is
+    "unavailable" (with the import or load error) when loading failed, and
+    "degraded" while no request has loaded it.
+    """
+    if get_eve is None:
+        return _unloaded_status("unavailable", f"EVE could not be imported: {EVE_IMPORT_ERROR}")
+    agent = current_eve()
+    if agent is None:
+        error = eve_load_error()
+        if error is not None:
+            return _unloaded_status("unavailable", f"EVE failed to load: {error}")
+        return _unloaded_status("degraded", "EVE is not loaded yet; the next chat or voice request loads it")
+    return {**agent.get_status(), "agent_loaded": True}
+
+
+def _unloaded_status(state: str, error: str) -> Dict[str, Any]:
+    return {"status": state, "agent_loaded": False, "error": error,
+            "system_code": os.getenv('EVE_SYSTEM_CODE', 'CEC_WAM_HEI_EVE_7A2F-9C4B'),
+            "last_update": datetime.now().isoformat()}
+
+
+STATUS = StatusSnapshot(_build_status, STATUS_INTERVAL_S)
+
+
+def chat_get(request: ApiRequest) -> ApiResponse:
+    """
+    GET /api/chat - EVE status, plus API admission counters
+
+    Served from STATUS, rebuilt in the background every
+    EVE_API_STATUS_INTERVAL seconds, so health probes never wait on (or
+    trigger) agent initialization. API counters are always live. An
+    "unavailable" status is sent as 503 so uptime monitors flag it.
+    """
+    status, age = STATUS.get()
+    return json_response(503 if status.get("status") == "unavailable" else 200, {
+        **status,
+        "status_age_ms": round(age * 1000, 1),
+        "admission": {name: limiter.status() for name, limiter in LIMITERS.items()},
+        "idempotency": IDEMPOTENCY.status(),
+        "rate_limit": RATE_LIMITER.status() if RATE_LIMITER is not None else None,
+    })
+
+
+def batch_post(request: ApiRequest) -> ApiResponse:
+    """POST /api/batch - answer many independent messages concurrently"""
+    data = request.json()
+    messages = data.get('messages')
+    if not isinstance(messages, list) or not messages:
+        return json_response(400, {"error": "messages must be a non-empty list"})
+    if len(messages) > BATCH_MAX_ITEMS:
+        return json_response(400, {"error": f"At most {BATCH_MAX_ITEMS} messages per batch"})
+    if not all(isinstance(message, str) and message.strip() for message in messages):
+        return json_response(400, {"error": "Every message must be a non-empty string"})
+    if get_eve is None:
+        return json_response(503, {"success": False, "error": "EVE is not available. Please check server configuration."})
+
+    try:
+        concurrency = min(BATCH_CONCURRENCY, max(1, int(data.get('concurrency', BATCH_CONCURRENCY))))
+    except (TypeError, ValueError):
+        return json_response(400, {"error": "concurrency must be an integer"})
+
+    started = time.perf_counter()
+    results = get_eve().chat_batch(messages, concurrency=concurrency)
+    return json_response(200, {
+        "success": all(result["success"] for result in results),
+        "count": len(results),
+        "unique": sum(1 for result in results if result["duplicate_of"] is None),
+        "results": results,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "timestamp": utc_timestamp()
+    })
+
+
+# ── Voice ───────────────────────────────────────────────────────────────────
+
+def voice_post(request: ApiRequest) -> ApiResponse:
+    """POST /api/voice - synthesize speech as base64 JSON, raw MP3, or streamed MP3"""
+    data = request.json()
+    text = data.get('text', '')
+    if not text:
+        return json_response(400, {"error": "No text provided"})
+
+    if data.get('stream'):
+        return _stream_audio(text)
+    if data.get('binary') or "audio/mpeg" in request.header("accept"):
+        return _audio_response(request, text)
+
+    audio_data = get_eve().speak(text) if get_eve is not None else None
+    if not audio_data:
+        return _unavailable_voice()
+
+    # Encode audio as base64 for JSON transport
+    return json_response(200, {
+        "success": True,
+        "text": text,
+        "audio": base64.b64encode(audio_data).decode('utf-8'),
+        "format": "mp3"
+    })
+
+
+def voice_get(request: ApiRequest) -> ApiResponse:
+    """GET /api/voice?text=... - raw MP3, so an <audio> element can seek and cache it"""
+    text = request.param('text')
+    if not text:
+        return json_response(400, {"error": "No text provided"})
+    return _audio_response(request, text)
+
+
+def _audio_response(request: ApiRequest, text: str) -> ApiResponse:
+    """
+    Raw audio/mpeg with Content-Length, ETag and single-range support
+
+    The ETag is the phrase's TTS cache key (voice, model and text), so a
+    matching If-None-Match gets a 304 without synthesizing anything. Cached
+    clips are sent from disk in FILE_CHUNK_BYTES reads. HEAD never
+    synthesizes: it is answered from the cache entry when there is one,
+    otherwise with the headers alone and no Content-Length.
+    """
+    if get_eve is None:
+        return _unavailable_voice()
+    agent = get_eve()
+    etag = f'"{agent.speech_etag(text)}"'
+    headers = [("ETag", etag), ("Cache-Control", "public, no-cache"), ("Accept-Ranges", "bytes")]
+    if _etag_matches(request.header("if-none-match"), etag):
+        return ApiResponse(status=304, headers=headers)
+
+    head = request.method == "HEAD"
+    source = agent.cached_speech(text) if head else agent.speak_cached(text)
+    if source is None:
+        return _unsized_audio(headers) if head else _unavailable_voice()
+    audio_file = None
+    if isinstance(source, Path):
+        try:
+            audio_file = source.open("rb")
+            size = os.fstat(audio_file.fileno()).st_size
+        except OSError:
+            # Evicted between lookup and open
+            if head:
+                return _unsized_audio(headers)
+            source = agent.speak(text)
+            if source is None:
+                return _unavailable_voice()
+    if audio_file is None:
+        size = len(source)
+
+    if_range = request.header("if-range")
+    byte_range = None
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.header("range"), size)
+        except ApiError:
+            if audio_file is not None:
+                audio_file.close()
+            raise
+    start, end = byte_range or (0, size - 1)
+    headers = [("Content-Type", "audio/mpeg"), ("Content-Length", str(end - start + 1))] + headers
+    if byte_range is not None:
+        headers.append(("Content-Range", f"bytes {start}-{end}/{size}"))
+    status = 206 if byte_range is not None else 200
+
+    if audio_file is None:
+        return ApiResponse(status=status, headers=headers, body=source[start:end + 1])
+    return ApiResponse(status=status, headers=headers, stream=_file_chunks(audio_file, start, end + 1 - start))
+
+
+def _unsized_audio(headers: Headers) -> ApiResponse:
+    """HEAD for a clip that is not cached: its length is unknown until synthesized"""
+    return ApiResponse(status=200, headers=[("Content-Type", "audio/mpeg")] + headers, unsized=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, per RFC 9110)"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header
+
+    Returns:
+        Inclusive (start, end), or None to send the whole body (no header,
+        another unit, or several ranges)
+
+    Raises:
+        ApiError: 416 when the range lies outside the body
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the final N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise ApiError(416, "Requested range not satisfiable", [("Content-Range", f"bytes */{size}")])
+    return start, end
+
+
+def _file_chunks(audio_file, start: int, length: int) -> Iterator[bytes]:
+    with audio_file:
+        audio_file.seek(start)
+        while length > 0:
+            chunk = audio_file.read(min(FILE_CHUNK_BYTES, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _stream_audio(text: str) -> ApiResponse:
+    """
+    Stream raw MP3 chunks as ElevenLabs produces them
+
+    The first chunk is fetched before responding so a synthesis failure can
+    still be reported as a JSON 503.
+    """
+    if get_eve is None:
+        return _unavailable_voice()
+
+    audio_stream = get_eve().speak_stream(text)
+    first_chunk = next(audio_stream, None)
+    if first_chunk is None:
+        audio_stream.close()
+        return _unavailable_voice()
+
+    def chunks() -> Iterator[bytes]:
+        try:
+            yield first_chunk
+            yield from audio_stream
+        finally:
+            audio_stream.close()
+
+    return ApiResponse(
+        status=200,
+        headers=[("Content-Type", "audio/mpeg"), ("Cache-Control", "no-store")],
+        stream=chunks(),
+    )
+
+
+# ── Routing ─────────────────────────────────────────────────────────────────
+
+Handler = Callable[[ApiRequest], ApiResponse]
+
+ROUTES: Dict[str, Dict[str, Handler]] = {
+    CHAT_PATH: {"GET": chat_get, "POST": chat_post},
+    BATCH_PATH: {"POST": batch_post},
+    VOICE_PATH: {"GET": voice_get, "POST": voice_post},
+}
+
+
+def _allowed_methods(routes: Dict[str, Handler]) -> str:
+    return ", ".join(sorted(routes) + (["HEAD"] if "GET" in routes else []) + ["OPTIONS"])
+
+
+def served_inline(request: ApiRequest) -> bool:
+    """Requests answered without blocking, which the ASGI app runs on its event loop"""
+    path = request.path.rstrip("/")
+    return request.method == "OPTIONS" or (path == CHAT_PATH and request.method in ("GET", "HEAD"))
+
+
+def client_id(request: ApiRequest) -> str:
+    """The client a request is rate limited as: its IP, or the proxy's forwarded IP"""
+    if CLIENT_IP_HEADER:
+        forwarded = request.header(CLIENT_IP_HEADER).split(",")[0].strip()
+        if forwarded:
+            return forwarded
+    return request.client or "unknown"
+
+
+def _batch_cost(request: ApiRequest) -> float:
+    # One token per distinct message, as the batch makes one model call each
+    try:
+        messages = request.json().get("messages")
+    except ApiError:
+        return 1.0
+    if not isinstance(messages, list) or not messages:
+        return 1.0
+    return float(len({str(message).strip() for message in messages}))
+
+
+# The rate-limit policy for each (path, method), and the request's cost in
+# tokens (1 unless given); status and preflight requests are free
+RATE_LIMITED: Dict[Tuple[str, str], Tuple[str, Optional[Callable[[ApiRequest], float]]]] = {
+    (CHAT_PATH, "POST"): ("chat", None),
+    (BATCH_PATH, "POST"): ("chat", _batch_cost),
+    (VOICE_PATH, "GET"): ("voice", None),
+    (VOICE_PATH, "POST"): ("voice", None),
+}
+
+
+def throttle(request: ApiRequest):
+    """
+    Charge the request to its client's token bucket, once
+
+    Sets request.quota to the RateLimit-* headers for the response.
+
+    Raises:
+        ApiError: 429 with Retry-After when the bucket is empty, and 429
+            without one when the request costs more than the burst
+    """
+    if request.quota is not None:
+        return
+    request.quota = []
+    method = "GET" if request.method == "HEAD" else request.method
+    rule = RATE_LIMITED.get((request.path.rstrip("/"), method))
+    if rule is None or RATE_LIMITER is None:
+        return
+    policy, cost = rule
+    tokens = cost(request) if cost is not None else 1.0
+    quota = RATE_LIMITER.take(policy, client_id(request), tokens)
+    if math.isinf(quota.retry_after):
+        raise ApiError(429, f"Request costs {tokens:g} {policy} tokens, more than the limit of {quota.limit}; "
+                            f"send it in smaller parts")
+    request.quota = quota.headers()
+    if not quota.allowed:
+        retry_after = max(1, math.ceil(quota.retry_after))
+        raise ApiError(429, f"Rate limit exceeded for {policy}; try again in {retry_after}s",
+                       [("Retry-After", str(retry_after))])
+
+
+def throttled(request: ApiRequest) -> Optional[ApiResponse]:
+    """The 429 response for a client over its rate limit, else None (see throttle)"""
+    try:
+        throttle(request)
+    except ApiError as e:
+        return reject(request, e.status, e.message, e.headers + (request.quota or []))
+    return None
+
+
+def limiter_for(request: ApiRequest) -> Optional[Limiter]:
+    """The admission limiter for a request, or None if it is not queued"""
+    method = "GET" if request.method == "HEAD" else request.method
+    name = ADMISSION.get((request.path.rstrip("/"), method))
+    return LIMITERS.get(name) if name else None
+
+
+def reject(request: ApiRequest, status: int, message: str, headers: Optional[Headers] = None) -> ApiResponse:
+    """A JSON error (with CORS) for a request refused before dispatch"""
+    response = json_response(status, {"success": False, "error": message}, headers)
+    routes = ROUTES.get(request.path.rstrip("/"))
+    if routes is not None:
+        response.headers.extend(cors_headers(_allowed_methods(routes)))
+    return response
+
+
+def overloaded(request: ApiRequest, error: Overloaded) -> ApiResponse:
+    return reject(request, error.status, error.message, [("Retry-After", str(error.retry_after))])
+
+
+def too_large(request: ApiRequest) -> ApiResponse:
+    return reject(request, 413, f"Request body exceeds {MAX_BODY_BYTES} bytes", [("Connection", "close")])
+
+
+def dispatch(request: ApiRequest, permit: Optional[Permit] = None) -> ApiResponse:
+    """
+    Route a request to its handler; errors become JSON responses
+
+    Args:
+        request: The request
+        permit: An admission slot the caller already holds (the ASGI app
+            queues on its event loop); otherwise dispatch waits for one
+            here. The slot is released when the response is closed, or
+            right away for non-streamed responses.
+
+    POSTs to IDEMPOTENT_ROUTES with an Idempotency-Key header are run at
+    most once per key: a retry waits for the original and replays its 2xx
+    response (marked Idempotent-Replayed: true); the same key with a
+    different body is a 422.
+    """
+    try:
+        scope = _idempotency_scope(request)
+    except ApiError as e:
+        if permit is not None:
+            permit.release()
+        return reject(request, e.status, e.message)
+    try:
+        if scope is not None:
+            response = _dispatch_idempotent(request, scope, permit)
+        else:
+            response = _dispatch(request, permit)
+    except BaseException:
+        if permit is not None:
+            permit.release()
+        raise
+    return _finish(request, response)
+
+
+def _finish(request: ApiRequest, response: ApiResponse) -> ApiResponse:
+    # Applied last, so stored idempotent replays are re-encoded per client
+    response = compress_response(request, response)
+    if request.method == "HEAD":
+        # Same headers as GET, no body
+        if response.header("Content-Length") is None and response.stream is None and not response.unsized:
+            response.headers.append(("Content-Length", str(len(response.body))))
+        response.close()
+        response.body, response.stream = b"", None
+    return response
+
+
+def compress_response(request: ApiRequest, response: ApiResponse) -> ApiResponse:
+    """
+    Encode a text response (JSON, SSE) with gzip or brotli per Accept-Encoding
+
+    Bodies under EVE_API_COMPRESS_MIN_BYTES are left alone; streams are
+    always encoded, flushed chunk by chunk so SSE events are not held back.
+    """
+    if not compressible(response.header("Content-Type") or "") or response.header("Content-Encoding"):
+        return response
+    response.headers.append(("Vary", "Accept-Encoding"))
+    if response.status in (204, 206, 304) or (response.stream is None and len(response.body) < COMPRESS_MIN_BYTES):
+        return response
+    encoding = negotiate(request.header("accept-encoding"), STREAM_ENCODINGS if response.stream else None)
+    if encoding is None:
+        return response
+    if response.stream is None:
+        response.body = compress(response.body, encoding)
+    else:
+        response.stream = CompressedStream(response.stream, encoding)
+    response.headers = [(name, value) for name, value in response.headers if name.lower() != "content-length"]
+    response.headers.append(("Content-Encoding", encoding))
+    return response
+
+
+# ── Idempotency ─────────────────────────────────────────────────────────────
+
+def _idempotency_scope(request: ApiRequest) -> Optional[Tuple[str, str]]:
+    """(store key, request fingerprint) when the request carries an Idempotency-Key"""
+    key = request.header("idempotency-key").strip()
+    if not key or (request.path.rstrip("/"), request.method) not in IDEMPOTENT_ROUTES:
+        return None
+    if len(key) > 255:
+        raise ApiError(400, "Idempotency-Key must be at most 255 characters")
+    path = request.path.rstrip("/")
+    # Accept is part of the request: it selects JSON or SSE for chat
+    return f"{path} {key}", fingerprint(request.method.encode(), path.encode(), request.body,
+                                        request.header("accept").encode())
+
+
+def idempotent_replay(request: ApiRequest) -> Optional[ApiResponse]:
+    """The stored response for a completed request with this key, without waiting"""
+    try:
+        scope = _idempotency_scope(request)
+    except ApiError:
+        return None
+    snapshot = IDEMPOTENCY.lookup(*scope) if scope is not None else None
+    return _finish(request, _replay(snapshot)) if snapshot is not None else None
+
+
+def _stored_headers(headers: Headers) -> Headers:
+    """
+    A copy of the headers to store with a response
+
+    Taken before _finish() encodes the body, so Content-Encoding and Vary
+    are never stored with unencoded bytes (replays are encoded afresh for
+    each client). RateLimit-* describe the original client's quota, not
+    the replay's, so they are dropped too.
+    """
+    return [(name, value) for name, value in headers if not name.lower().startswith("ratelimit-")]
+
+
+def _replay(snapshot: Tuple[int, Headers, bytes]) -> ApiResponse:
+    status, headers, body = snapshot
+    return ApiResponse(status=status, headers=list(headers) + [("Idempotent-Replayed", "true")], body=body)
+
+
+def _dispatch_idempotent(request: ApiRequest, scope: Tuple[str, str], permit: Optional[Permit]) -> ApiResponse:
+    key, request_fingerprint = scope
+    try:
+        entry, owner = IDEMPOTENCY.begin(key, request_fingerprint)
+        if not owner:
+            # Another request with this key is running or done; no slot needed
+            if permit is not None:
+                permit.release()
+                permit = None
+            snapshot = entry.wait(IDEMPOTENCY_WAIT_S)
+            if snapshot is not None:
+                return _replay(snapshot)
+            if not entry.failed:
+                return reject(request, 409, "A request with this Idempotency-Key is still in progress",
+                              [("Retry-After", "1")])
+            # The original failed and was forgotten; compute it here instead
+            entry, owner = IDEMPOTENCY.begin(key, request_fingerprint)
+            if not owner:
+                return reject(request, 409, "A request with this Idempotency-Key is still in progress",
+                              [("Retry-After", "1")])
+    except IdempotencyConflict:
+        if permit is not None:
+            permit.release()
+        return reject(request, 422, "Idempotency-Key was already used for a different request")
+
+    try:
+        response = _dispatch(request, permit)
+    except BaseException:
+        IDEMPOTENCY.fail(key, entry)
+        raise
+    if not 200 <= response.status < 300:
+        IDEMPOTENCY.fail(key, entry)
+    elif response.stream is None:
+        IDEMPOTENCY.complete(entry, (response.status, _stored_headers(response.headers), response.body))
+    else:
+        _record_stream(response, key, entry)
+    return response
+
+
+def _record_stream(response: ApiResponse, key: str, entry) -> None:
+    """Tee a streamed response; store it once it has been sent in full"""
+    source = response.stream
+    headers = _stored_headers(response.headers)  # Now: compression rewrites them later
+    parts: List[bytes] = []
+    finished = []
+
+    def tee() -> Iterator[bytes]:
+        for chunk in source:
+            parts.append(chunk)
+            yield chunk
+        finished.append(True)
+
+    def settle():
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+        if finished:
+            IDEMPOTENCY.complete(entry, (response.status, headers, b"".join(parts)))
+        else:
+            IDEMPOTENCY.fail(key, entry)  # Cut short (e.g. client gone); a retry recomputes
+
+    response.stream = tee()
+    response.on_close.append(settle)
+
+
+def _dispatch(request: ApiRequest, permit: Optional[Permit]) -> ApiResponse:
+    routes = ROUTES.get(request.path.rstrip("/"))
+    if routes is None:
+        if permit is not None:
+            permit.release()
+        return json_response(404, {"success": False, "error": f"Not found: {request.path}"})
+
+    head = request.method == "HEAD" and "GET" in routes
+    methods = _allowed_methods(routes)
+    if request.method == "OPTIONS":
+        response = ApiResponse(status=200)
+    elif request.method not in routes and not head:
+        response = json_response(405, {"success": False, "error": f"Method {request.method} not allowed"},
+                                 [("Allow", methods)])
+    else:
+        limiter = limiter_for(request) if permit is None else None
+        try:
+            throttle(request)  # Before queueing, so a flood never takes queue places
+            if limiter is not None:
+                permit = limiter.acquire()
+            response = routes["GET" if head else request.method](request)
+        except Overloaded as e:
+            response = json_response(e.status, {"success": False, "error": e.message},
+                                     [("Retry-After", str(e.retry_after))])
+        except ApiError as e:
+            response = json_response(e.status, {"success": False, "error": e.message}, e.headers)
+        except Exception as e:
+            response = json_response(500, {"success": False, "error": str(e)})
+    if permit is not None:
+        if response.stream is not None:
+            response.on_close.append(permit.release)
+        else:
+            permit.release()
+    response.headers.extend(request.quota or [])
+    response.headers.extend(cors_headers(methods))
+    return response
+
+
+# ── http.server / Vercel adapter ────────────────────────────────────────────
+
+def serve_http(handler: BaseHTTPRequestHandler, path: str):
+    """
+    Serve the current request of a BaseHTTPRequestHandler
+
+    Args:
+        handler: The Vercel (or http.server) handler instance; it must use
+            protocol_version "HTTP/1.1" for streamed responses
+        path: The API path this function serves
+    """
+    request = ApiRequest(
+        method=handler.command,
+        path=path,
+        headers={name.lower(): value for name, value in handler.headers.items()},
+        client=handler.client_address[0] if handler.client_address else "",
+        query=urlsplit(handler.path).query,
+    )
+    try:
+        length = int(handler.headers.get('Content-Length') or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        handler.close_connection = True
+        write_http(handler, reject(request, 400, "Invalid Content-Length", [("Connection", "close")]))
+        return
+    if length > MAX_BODY_BYTES:
+        # The unread body makes the connection unusable
+        handler.close_connection = True
+        write_http(handler, too_large(request))
+        return
+    request.body = handler.rfile.read(length) if length > 0 else b""
+    write_http(handler, dispatch(request))
+
+
+def write_http(handler: BaseHTTPRequestHandler, response: ApiResponse):
+    """Write an ApiResponse, using chunked framing for streams"""
+    handler.send_response(response.status)
+    for name, value in response.headers:
+        handler.send_header(name, value)
+    sized = response.header('Content-Length') is not None
+    if response.stream is None:
+        if not sized and not response.unsized:
+            handler.send_header('Content-Length', str(len(response.body)))
+        handler.end_headers()
+        handler.wfile.write(response.body)
+        return
+
+    # Streams of known length (files) go out as-is; others are chunked
+    if not sized:
+        handler.send_header('Transfer-Encoding', 'chunked')
+    handler.end_headers()
+    try:
+        for chunk in response.stream:
+            if chunk and sized:
+                handler.wfile.write(chunk)
+            elif chunk:
+                handler.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+                handler.wfile.flush()
+        if not sized:
+            handler.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionResetError):
+        # Client went away; stop pulling from upstream
+        handler.close_connection = True
+    finally:
+        response.close()
@@ -0,0 +1,232 @@
+"""
+EVE ASGI Server - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Self-hostable ASGI app serving EVE's /api/chat and /api/voice endpoints (the
+same handlers as the Vercel functions, via eve_api) on one event loop.
+Blocking agent calls run on a bounded thread pool, streamed bodies are
+pulled chunk by chunk so the loop stays free, and a client disconnect stops
+the upstream stream. Lifespan shutdown drains the pool and flushes EVE's
+logs and store.
+
+Run with any ASGI server, or the bundled uvicorn launcher:
+    python eve_asgi.py --port 8000 --workers 4
+    uvicorn eve_asgi:app --workers 4 --timeout-keep-alive 15
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from eve_admission import Overloaded
+from eve_api import (MAX_BODY_BYTES, RATE_LIMITER, STATUS, ApiRequest, ApiResponse, dispatch, idempotent_replay, limiter_for,
+                     overloaded, served_inline, throttled, too_large)
+
+UVICORN_AVAILABLE = importlib.util.find_spec("uvicorn") is not None
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_DONE = object()
+_TOO_LARGE = object()
+
+
+class EVEApp:
+    """Raw ASGI application for the EVE API"""
+
+    def __init__(self, threads: Optional[int] = None):
+        self.threads = threads or int(os.getenv("EVE_ASGI_THREADS", "32"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="eve-api")
+        return self._executor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    # ── Lifespan ────────────────────────────────────────────────────────────
+
+    async def _lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Create the pool and the status snapshot before traffic arrives
+                await asyncio.get_running_loop().run_in_executor(self.executor, STATUS.prime)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def shutdown(self):
+        """Finish in-flight work, then flush EVE's log sink and store"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        agent_module = sys.modules.get("eve_voice_agent")
+        agent = getattr(agent_module, "_eve_instance", None)
+        if agent is not None:
+            agent.logs.flush()
+            if agent.store is not None:
+                agent.store.flush()
+
+    # ── HTTP ────────────────────────────────────────────────────────────────
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send):
+        client = scope.get("client")
+        request = ApiRequest(
+            method=scope["method"],
+            path=scope["path"],
+            headers={name.decode("latin-1").lower(): value.decode("latin-1")
+                     for name, value in scope.get("headers", [])},
+            client=client[0] if client else "",
+            query=scope.get("query_string", b"").decode("latin-1"),
+        )
+        body = await self._read_body(request, receive)
+        if body is None:
+            return  # Client disconnected
+        if body is _TOO_LARGE:
+            await self._send(too_large(request), receive, send)
+            return
+        request.body = body
+
+        # Retries of finished requests are answered without queueing
+        replay = idempotent_replay(request)
+        if replay is not None:
+            await self._send(replay, receive, send)
+            return
+
+        # Status probes and preflights never block, so they skip the thread
+        # pool and stay fast even when every worker thread is busy
+        if served_inline(request):
+            await self._send(dispatch(request), receive, send)
+            return
+
+        # Clients over their rate limit are refused before they can queue
+        loop = asyncio.get_running_loop()
+        if RATE_LIMITER is not None and RATE_LIMITER.backend.blocking:
+            # Shared backends are a network call; keep it off the event loop
+            limited = await loop.run_in_executor(None, throttled, request)
+        else:
+            limited = throttled(request)
+        if limited is not None:
+            await self._send(limited, receive, send)
+            return
+
+        # Queue on the event loop, so waiting requests hold no thread
+        permit = None
+        limiter = limiter_for(request)
+        if limiter is not None:
+            try:
+                permit = await limiter.acquire_async()
+            except Overloaded as e:
+                await self._send(overloaded(request, e), receive, send)
+                return
+
+        response = await loop.run_in_executor(self.executor, dispatch, request, permit)
+        try:
+            await self._send(response, receive, send)
+        finally:
+            if response.stream is not None:
+                await loop.run_in_executor(self.executor, response.close)
+
+    async def _read_body(self, request: ApiRequest, receive: Receive) -> Any:
+        """The request body, None on disconnect, or _TOO_LARGE past MAX_BODY_BYTES"""
+        declared = request.header("content-length")
+        if declared.isdigit() and int(declared) > MAX_BODY_BYTES:
+            return _TOO_LARGE
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body.extend(message.get("body", b""))
+            if len(body) > MAX_BODY_BYTES:
+                return _TOO_LARGE
+            if not message.get("more_body"):
+                return bytes(body)
+
+    async def _send(self, response: ApiResponse, receive: Receive, send: Send):
+        headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                   for name, value in response.headers]
+        if response.stream is None:
+            if response.header("Content-Length") is None and not response.unsized:
+                headers.append((b"content-length", str(len(response.body)).encode()))
+            await send({"type": "http.response.start", "status": response.status, "headers": headers})
+            await send({"type": "http.response.body", "body": response.body})
+            return
+
+        await send({"type": "http.response.start", "status": response.status, "headers": headers})
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        loop = asyncio.get_running_loop()
+        next_chunk = partial(next, response.stream, _DONE)
+        try:
+            while not disconnected.is_set():
+                chunk = await loop.run_in_executor(self.executor, next_chunk)
+                if chunk is _DONE:
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+                if chunk and not disconnected.is_set():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        except OSError:
+            pass  # Client went away mid-write; the caller closes the stream
+        finally:
+            watcher.cancel()
+
+
+app = EVEApp()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the EVE API over ASGI (uvicorn)")
+    parser.add_argument("--host", default=os.getenv("EVE_ASGI_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("EVE_ASGI_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("EVE_ASGI_WORKERS", "1")),
+                        help="worker processes (each with its own EVE agent)")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("EVE_ASGI_KEEP_ALIVE", "15")),
+                        help="seconds to hold idle keep-alive connections")
+    parser.add_argument("--graceful-timeout", type=int,
+                        default=int(os.getenv("EVE_ASGI_GRACEFUL_TIMEOUT", "30")),
+                        help="seconds to let in-flight requests finish on shutdown")
+    args = parser.parse_args()
+
+    if not UVICORN_AVAILABLE:
+        print("uvicorn is not installed (pip install uvicorn); "
+              "alternatively point any ASGI server at eve_asgi:app", file=sys.stderr)
+        return 1
+
+    import uvicorn
+    uvicorn.run(
+        "eve_asgi:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        lifespan="on",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
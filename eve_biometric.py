@@ -0,0 +1,364 @@
+"""
+EVE Voice Biometrics - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Local, NumPy-only speaker verification for voice commands. A clip is framed
+in one strided view, turned into log-mel energies and MFCCs with cached
+filterbank/DCT matrices, and pooled over its voiced frames into a fixed
+unit-length embedding. Verification is the cosine score against the owner's
+enrollment embedding, which is computed once from enrollment clips and
+cached in memory and on disk. A 3-second clip verifies in a few
+milliseconds with no network call.
+
+The disk cache lives in a private (0700) directory and is bound to a hash
+of the enrollment audio, so a voiceprint file that was not built from the
+owner's clips is never loaded.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400   # 25 ms
+HOP_LENGTH = 160     # 10 ms
+N_FFT = 512
+N_MELS = 40
+N_MFCC = 20
+PRE_EMPHASIS = 0.97
+VOICED_RANGE_DB = 35.0   # Frames this far below the loudest are treated as silence
+MIN_VOICED_FRAMES = 30   # ~0.3 s of speech
+DEFAULT_THRESHOLD = 0.85
+FEATURE_VERSION = 1      # Bump when features change so cached voiceprints are rebuilt
+MIN_SAMPLE_RATE = 8000   # Accepted input rates; others are rejected before decoding
+MAX_SAMPLE_RATE = 96000
+MAX_CLIP_SECONDS = 60.0  # Longest clip decoded, so one upload can't exhaust memory
+ENROLLED_PREFIX = "enrolled-"  # Clips saved by enroll(); other clips in the folder are the owner's own
+
+
+def check_audio_format(sample_rate: int, frames: int):
+    """
+    Reject sample rates and lengths the decoder won't handle
+
+    Raises:
+        ValueError: If the rate is outside MIN_SAMPLE_RATE..MAX_SAMPLE_RATE
+            or the clip is longer than MAX_CLIP_SECONDS
+    """
+    if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        raise ValueError(f"Unsupported sample rate: {sample_rate} Hz "
+                         f"(expected {MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE} Hz)")
+    if frames > MAX_CLIP_SECONDS * sample_rate:
+        raise ValueError(f"Audio clip is longer than {MAX_CLIP_SECONDS:g} seconds")
+
+
+def decode_audio(audio: bytes, sample_rate: int = SAMPLE_RATE) -> Tuple[np.ndarray, int]:
+    """
+    Decode WAV bytes, or raw 16-bit little-endian mono PCM, to float samples
+
+    The rate and length are checked (check_audio_format) from the header,
+    before any sample is read.
+
+    Args:
+        audio: WAV file contents or raw PCM
+        sample_rate: Sample rate of raw PCM (ignored for WAV)
+
+    Returns:
+        (mono float32 samples in [-1, 1], sample rate)
+    """
+    if audio[:4] == b"RIFF":
+        try:
+            with wave.open(io.BytesIO(audio)) as wav:
+                sample_rate = wav.getframerate()
+                channels = wav.getnchannels()
+                width = wav.getsampwidth()
+                check_audio_format(sample_rate, wav.getnframes())
+                frames = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError) as e:
+            raise ValueError(f"Invalid WAV data: {e}") from None
+    else:
+        channels, width, frames = 1, 2, audio
+        check_audio_format(sample_rate, len(audio) // width)
+    if channels < 1:
+        raise ValueError(f"Invalid audio format: {channels} channels")
+
+    dtypes = {1: np.uint8, 2: "<i2", 4: "<i4"}
+    if width not in dtypes:
+        raise ValueError(f"Unsupported sample width: {width * 8}-bit")
+    usable = len(frames) - len(frames) % (width * channels)
+    samples = np.frombuffer(frames[:usable], dtype=dtypes[width]).astype(np.float32)
+    if width == 1:
+        samples = (samples - 128.0) / 128.0  # 8-bit WAV is unsigned
+    else:
+        samples /= float(2 ** (8 * width - 1))
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Linear-interpolation resampling (adequate for speech features)"""
+    if sample_rate == target_rate or samples.size == 0:
+        return samples
+    duration = samples.size / sample_rate
+    positions = np.arange(int(duration * target_rate)) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def mel_filterbank(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2.0), n_mels + 2)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = mel_to_hz(mel_points)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def dct_matrix(n_mels: int = N_MELS, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """Orthonormal DCT-II basis, shape (n_mfcc, n_mels)"""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+@lru_cache(maxsize=2)
+def _window(length: int = FRAME_LENGTH) -> np.ndarray:
+    return np.hamming(length).astype(np.float32)
+
+
+def _power_spectrum(samples: np.ndarray) -> np.ndarray:
+    """Per-frame power spectrum of 16 kHz samples, shape (frames, n_fft // 2 + 1)"""
+    if samples.size == 0:
+        raise ValueError("Audio sample is too short")
+    emphasized = np.empty_like(samples)
+    emphasized[0] = samples[0]
+    emphasized[1:] = samples[1:] - PRE_EMPHASIS * samples[:-1]
+    if emphasized.size < FRAME_LENGTH:
+        emphasized = np.pad(emphasized, (0, FRAME_LENGTH - emphasized.size))
+    frames = sliding_window_view(emphasized, FRAME_LENGTH)[::HOP_LENGTH] * _window()
+    return (np.abs(np.fft.rfft(frames, n=N_FFT)) ** 2) / N_FFT
+
+
+def log_mel(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Log mel energies, shape (frames, N_MELS)"""
+    power = _power_spectrum(resample(samples, sample_rate))
+    return np.log(power @ mel_filterbank().T + 1e-10)
+
+
+def mfcc(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """MFCCs, shape (frames, N_MFCC)"""
+    return log_mel(samples, sample_rate) @ dct_matrix().T
+
+
+@lru_cache(maxsize=1)
+def _lifter(length: int = 22) -> np.ndarray:
+    """Sinusoidal lifter so higher-order coefficients weigh in comparably"""
+    n = np.arange(1, N_MFCC)
+    return (1.0 + (length / 2.0) * np.sin(np.pi * n / length)).astype(np.float32)
+
+
+def speaker_embedding(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Fixed-length, unit-norm speaker embedding for one clip
+
+    MFCCs (without c0, which only tracks loudness) are liftered and pooled
+    over voiced frames into their mean, standard deviation and delta
+    standard deviation.
+
+    Raises:
+        ValueError: If the clip holds too little speech
+    """
+    if samples.size == 0:
+        raise ValueError("Empty audio sample")
+    power = _power_spectrum(resample(samples, sample_rate))
+    energy_db = 10.0 * np.log10(power.sum(axis=1) + 1e-10)
+    voiced = energy_db > energy_db.max() - VOICED_RANGE_DB
+    if int(voiced.sum()) < MIN_VOICED_FRAMES:
+        raise ValueError("Not enough speech in the audio sample")
+
+    coefficients = np.log(power[voiced] @ mel_filterbank().T + 1e-10) @ dct_matrix().T
+    coefficients = coefficients[:, 1:] * _lifter()
+    deltas = np.diff(coefficients, axis=0)
+    embedding = np.concatenate([coefficients.mean(axis=0), coefficients.std(axis=0), deltas.std(axis=0)])
+    return embedding / (np.linalg.norm(embedding) + 1e-12)
+
+
+def embed_audio(audio: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """decode_audio + speaker_embedding"""
+    samples, rate = decode_audio(audio, sample_rate)
+    return speaker_embedding(samples, rate)
+
+
+def _private_dir(path: Path):
+    """Create a directory readable only by the current user (mode 0700)"""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(path, 0o700)
+
+
+def _write_atomic(path: Path, write):
+    """Write a file through a temp file in the same directory and os.replace"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def default_voiceprint_dir() -> Path:
+    """Private per-user directory for the voiceprint cache and enroll() clips"""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "eve" / "voiceprint"
+
+
+class VoiceprintVerifier:
+    """
+    Owner voiceprint with cosine-score verification
+
+    The enrollment embedding is the normalised mean of the embeddings of
+    the WAV clips in `enrollment_dir`. It is computed once, cached in
+    memory and saved to `cache_path` together with a hash of the clips'
+    audio; the saved copy is only used while that hash (and the feature
+    version) still matches, so it is rebuilt when the clips change and a
+    file built from other audio is ignored.
+    """
+
+    def __init__(self, enrollment_dir: Optional[str] = None, cache_path: Optional[str] = None,
+                 threshold: float = DEFAULT_THRESHOLD):
+        self.enrollment_dir = Path(enrollment_dir) if enrollment_dir else None
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.threshold = threshold
+        self._embedding: Optional[np.ndarray] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _clips(self) -> List[Path]:
+        if self.enrollment_dir is None or not self.enrollment_dir.is_dir():
+            return []
+        return sorted(self.enrollment_dir.glob("*.wav"))
+
+    @staticmethod
+    def _signature(audio: List[bytes]) -> str:
+        """Identifies the feature version and enrollment audio a cached voiceprint came from"""
+        digest = hashlib.sha256()
+        for clip in audio:
+            digest.update(hashlib.sha256(clip).digest())
+        return json.dumps({"version": FEATURE_VERSION, "audio_sha256": digest.hexdigest()})
+
+    @property
+    def embedding(self) -> Optional[np.ndarray]:
+        """The owner's enrollment embedding, or None if not enrolled"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._embedding = self._load()
+                    self._loaded = True
+        return self._embedding
+
+    @property
+    def is_enrolled(self) -> bool:
+        return self.embedding is not None
+
+    def _load(self) -> Optional[np.ndarray]:
+        audio = [clip.read_bytes() for clip in self._clips()]
+        if not audio:
+            return None
+        signature = self._signature(audio)
+        if self.cache_path is not None and self.cache_path.exists():
+            try:
+                with np.load(self.cache_path, allow_pickle=False) as cached:
+                    if str(cached["signature"]) == signature:
+                        return cached["embedding"]
+            except (OSError, KeyError, ValueError):
+                pass
+        return self._build(audio)
+
+    def _build(self, audio: List[bytes], save: bool = True) -> np.ndarray:
+        embeddings = [embed_audio(clip) for clip in audio]
+        if not embeddings:
+            raise ValueError("At least one enrollment clip is required")
+        mean = np.mean(embeddings, axis=0)
+        embedding = (mean / (np.linalg.norm(mean) + 1e-12)).astype(np.float32)
+        if save and self.cache_path is not None:
+            _private_dir(self.cache_path.parent)
+            signature = np.array(self._signature(audio))
+            _write_atomic(self.cache_path, lambda handle: np.savez(handle, embedding=embedding, signature=signature))
+        return embedding
+
+    def enroll(self, clips: Iterable[bytes]) -> np.ndarray:
+        """
+        Build and cache the owner's voiceprint from WAV/PCM clips
+
+        The clips are saved to `enrollment_dir` (replacing those of an
+        earlier enroll()), so the cached voiceprint stays bound to audio on
+        disk; the voiceprint covers every clip in the folder. Without an
+        enrollment_dir, it is kept in memory only.
+        """
+        clips = list(clips)
+        with self._lock:
+            if self.enrollment_dir is None:
+                self._embedding = self._build(clips, save=False)
+            else:
+                self._build(clips, save=False)  # Reject unusable clips before replacing any
+                _private_dir(self.enrollment_dir)
+                for old in self.enrollment_dir.glob(f"{ENROLLED_PREFIX}*.wav"):
+                    old.unlink()
+                for index, clip in enumerate(clips):
+                    _write_atomic(self.enrollment_dir / f"{ENROLLED_PREFIX}{index:02d}.wav",
+                                  lambda handle, clip=clip: handle.write(clip))
+                self._embedding = self._build([clip.read_bytes() for clip in self._clips()])
+            self._loaded = True
+        return self._embedding
+
+    def score(self, audio: bytes, sample_rate: int = SAMPLE_RATE) -> float:
+        """Cosine similarity between a clip and the enrollment embedding"""
+        enrolled = self.embedding
+        if enrolled is None:
+            raise ValueError("No voiceprint enrolled")
+        return float(np.dot(embed_audio(audio, sample_rate), enrolled))
+
+    def verify(self, audio: bytes, sample_rate: int = SAMPLE_RATE) -> Tuple[bool, float]:
+        """(score >= threshold, score)"""
+        score = self.score(audio, sample_rate)
+        return score >= self.threshold, score
+
+
+def verifier_from_env() -> VoiceprintVerifier:
+    """
+    Build from EVE_VOICEPRINT_DIR / EVE_VOICEPRINT_CACHE / EVE_VOICEPRINT_THRESHOLD
+
+    Unset paths default to default_voiceprint_dir(): enroll() clips in
+    its enrollment/ folder and the cache in voiceprint.npz.
+    """
+    home = default_voiceprint_dir()
+    return VoiceprintVerifier(
+        enrollment_dir=os.getenv("EVE_VOICEPRINT_DIR") or str(home / "enrollment"),
+        cache_path=os.getenv("EVE_VOICEPRINT_CACHE") or str(home / "voiceprint.npz"),
+        threshold=float(os.getenv("EVE_VOICEPRINT_THRESHOLD", str(DEFAULT_THRESHOLD))),
+    )
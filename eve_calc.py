@@ -0,0 +1,343 @@
+"""
+EVE Calculator Engine - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Compiles arithmetic expressions once into validated evaluation plans (a tree
+of closures) and caches them by expression string. Plans run either on
+scalars or, through evaluate_batch, vectorized over NumPy arrays such as a
+ledger column.
+
+Evaluation is resource-guarded: exponentiation and multiplication estimate
+the result size before executing, integers are capped in bit length,
+sequences and expressions are capped in size, and every evaluation runs
+against a time budget, so one hostile input ("9**9**9") cannot stall the
+shared agent process.
+"""
+
+import ast
+import importlib.util
+import math
+import operator
+import time
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+# numpy (and the finance library built on it) is imported on first vector or
+# finance call, keeping it out of EVE's cold-start path
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Finance functions exposed by name (implemented in eve_finance)
+FINANCE_FUNCTION_NAMES = ('npv', 'irr', 'pmt', 'cagr', 'compound', 'period_return', 'volatility')
+
+# Resource limits
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPRESSION_DEPTH = 500
+MAX_SEQUENCE_LENGTH = 10_000
+MAX_INT_BITS = 4096
+MAX_FLOAT_EXPONENT = 1024  # log2 of the largest finite float is just under this
+MAX_ROUND_DIGITS = 1300  # round() beyond the ~1233 decimal digits of a 4096-bit int is a no-op
+DEFAULT_TIME_BUDGET = 0.05  # seconds per evaluation
+
+
+class CalculationError(ValueError):
+    """Raised for expressions that are invalid or not allowed"""
+
+
+class CalculationLimitError(CalculationError):
+    """Raised when an expression would exceed a resource limit"""
+
+
+def _check_int(value: Any) -> Any:
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise CalculationLimitError(f"Result exceeds {MAX_INT_BITS}-bit integer limit")
+    return value
+
+
+def _check_scalar(value: Any, name: str):
+    if isinstance(value, (list, tuple)):
+        raise CalculationError(f"Sequences are not allowed in {name}")
+
+
+def _log2_magnitude(value: Any) -> float:
+    """Upper bound on log2(|value|) without materialising anything"""
+    magnitude = abs(value)
+    return math.log2(magnitude) if magnitude > 0 else 0.0
+
+
+def guarded_pow(base: Any, exponent: Any, modulus: Any = None) -> Any:
+    """pow() that estimates the result magnitude before computing it"""
+    _check_scalar(base, "pow")
+    _check_scalar(exponent, "pow")
+    if modulus is not None:
+        # Modular exponentiation stays bounded by the modulus
+        _check_int(modulus)
+        return pow(base, exponent, modulus)
+    if isinstance(exponent, (int, float)) and not isinstance(base, (list, tuple)):
+        if exponent > 0 and abs(base) > 1:
+            estimated_bits = exponent * _log2_magnitude(base)
+            limit = MAX_INT_BITS if isinstance(base, int) and isinstance(exponent, int) else MAX_FLOAT_EXPONENT
+            if estimated_bits > limit:
+                raise CalculationLimitError(
+                    f"Result of exponentiation is too large (~2**{estimated_bits:.0f})"
+                )
+    return _check_int(base ** exponent)
+
+
+def guarded_mul(left: Any, right: Any) -> Any:
+    """Multiplication that rejects sequence repetition and oversized integers"""
+    _check_scalar(left, "arithmetic")
+    _check_scalar(right, "arithmetic")
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_INT_BITS + 1:
+            raise CalculationLimitError(f"Result exceeds {MAX_INT_BITS}-bit integer limit")
+    return left * right
+
+
+def guarded_round(number: Any, ndigits: Any = None) -> Any:
+    """round() with ndigits bounded; round(5, -10**7) would build 10**10**7"""
+    _check_scalar(number, "round")
+    if ndigits is not None:
+        if not isinstance(ndigits, int) or isinstance(ndigits, bool):
+            raise CalculationError("round() digits must be an integer")
+        if abs(ndigits) > MAX_ROUND_DIGITS:
+            raise CalculationLimitError(f"round() digits are limited to +/-{MAX_ROUND_DIGITS}")
+    return round(number, ndigits)
+
+
+def _scalar_op(op: Callable) -> Callable:
+    def guarded(left: Any, right: Any) -> Any:
+        _check_scalar(left, "arithmetic")
+        _check_scalar(right, "arithmetic")
+        return _check_int(op(left, right))
+    return guarded
+
+
+# Operator and function tables are built once at import, not per call
+BINARY_OPERATORS = {
+    ast.Add: _scalar_op(operator.add),
+    ast.Sub: _scalar_op(operator.sub),
+    ast.Mult: guarded_mul,
+    ast.Div: _scalar_op(operator.truediv),
+    ast.Pow: guarded_pow,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+SCALAR_FUNCTIONS: Dict[str, Callable] = {
+    'abs': abs,
+    'round': guarded_round,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'pow': guarded_pow,
+}
+
+
+def _finance_function(name: str) -> Callable:
+    """Proxy that imports eve_finance (and numpy) on first call"""
+    def call(*args: Any) -> Any:
+        if not NUMPY_AVAILABLE:
+            raise CalculationError(f"Function {name} requires numpy")
+        from eve_finance import CALCULATOR_FUNCTIONS
+        return CALCULATOR_FUNCTIONS[name](*args)
+    call.__name__ = name
+    return call
+
+
+# Finance library (NPV, IRR, CAGR, ...) is vectorized in both modes
+SCALAR_FUNCTIONS.update({name: _finance_function(name) for name in FINANCE_FUNCTION_NAMES})
+
+
+@lru_cache(maxsize=None)
+def vector_functions() -> Dict[str, Callable]:
+    """NumPy function table, built on first vectorized evaluation"""
+    import numpy as np
+    from eve_finance import CALCULATOR_FUNCTIONS
+
+    functions: Dict[str, Callable] = {
+        'abs': np.abs,
+        'round': np.round,
+        'min': lambda *args: reduce(np.minimum, args) if len(args) > 1 else np.min(args[0]),
+        'max': lambda *args: reduce(np.maximum, args) if len(args) > 1 else np.max(args[0]),
+        'sum': np.sum,
+        'pow': np.power,
+    }
+    functions.update(CALCULATOR_FUNCTIONS)
+    return functions
+
+
+# Raw operators for vector mode. They are only safe when an operand is a
+# NumPy array or scalar (fixed width); two Python numbers, e.g. constants
+# in "value + 9**9**7", still go through the guarded scalar operators.
+VECTOR_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+
+
+class _Context:
+    """Per-evaluation state: bound variables, function table and deadline"""
+
+    __slots__ = ("env", "funcs", "vector", "deadline")
+
+    def __init__(self, env: Dict[str, Any], funcs: Dict[str, Callable], time_budget: float,
+                 vector: bool = False):
+        self.env = env
+        self.funcs = funcs
+        self.vector = vector
+        self.deadline = time.perf_counter() + time_budget
+
+    def tick(self):
+        if time.perf_counter() > self.deadline:
+            raise CalculationLimitError("Calculation exceeded its time budget")
+
+
+# Plan nodes take the evaluation context so one plan serves scalar and vector modes
+PlanNode = Callable[[_Context], Any]
+
+
+class CompiledExpression:
+    """A validated, reusable evaluation plan for one expression"""
+
+    __slots__ = ("expression", "names", "_plan")
+
+    def __init__(self, expression: str, plan: PlanNode, names: FrozenSet[str]):
+        self.expression = expression
+        self.names = names
+        self._plan = plan
+
+    def evaluate(self, variables: Optional[Dict[str, Any]] = None,
+                 time_budget: float = DEFAULT_TIME_BUDGET) -> Any:
+        """Evaluate on scalar values"""
+        return self._plan(_Context(self._bind(variables), SCALAR_FUNCTIONS, time_budget))
+
+    def evaluate_vector(self, variables: Dict[str, Any],
+                        time_budget: float = DEFAULT_TIME_BUDGET) -> Any:
+        """Evaluate element-wise over NumPy arrays"""
+        if not NUMPY_AVAILABLE:
+            raise CalculationError("Vectorized evaluation requires numpy")
+        import numpy as np
+
+        arrays = {name: np.asarray(value, dtype=float) for name, value in self._bind(variables).items()}
+        # Array operands are fixed-width floats; constant-only subexpressions
+        # are still guarded in run_binop
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            return self._plan(_Context(arrays, vector_functions(), time_budget, vector=True))
+
+    def _bind(self, variables: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        variables = variables or {}
+        missing = self.names.difference(variables)
+        if missing:
+            raise CalculationError(f"Unknown name(s): {', '.join(sorted(missing))}")
+        return variables
+
+
+def _compile_node(node: ast.AST, names: set, depth: int = 0) -> PlanNode:
+    """Validate one AST node and return its evaluation closure"""
+    if depth > MAX_EXPRESSION_DEPTH:
+        raise CalculationLimitError(f"Expression nested deeper than {MAX_EXPRESSION_DEPTH} levels")
+    depth += 1
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+            raise CalculationError(f"Constant {value!r} not allowed")
+        _check_int(value)
+        return lambda ctx: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+        return lambda ctx: ctx.env[name]
+
+    if isinstance(node, ast.BinOp):
+        op_type = type(node.op)
+        if op_type not in BINARY_OPERATORS:
+            raise CalculationError(f"Operator {op_type.__name__} not allowed")
+        scalar_op = BINARY_OPERATORS[op_type]
+        vector_op = VECTOR_OPERATORS[op_type]
+        left = _compile_node(node.left, names, depth)
+        right = _compile_node(node.right, names, depth)
+
+        def run_binop(ctx: _Context) -> Any:
+            ctx.tick()
+            a, b = left(ctx), right(ctx)
+            # NumPy values (arrays and scalars) have a shape; Python numbers don't
+            fixed_width = ctx.vector and (hasattr(a, "shape") or hasattr(b, "shape"))
+            return (vector_op if fixed_width else scalar_op)(a, b)
+        return run_binop
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise CalculationError(f"Operator {type(node.op).__name__} not allowed")
+        operand = _compile_node(node.operand, names, depth)
+        return lambda ctx: op(operand(ctx))
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        if len(node.elts) > MAX_SEQUENCE_LENGTH:
+            raise CalculationLimitError(f"Sequences are limited to {MAX_SEQUENCE_LENGTH} items")
+        items = [_compile_node(item, names, depth) for item in node.elts]
+        return lambda ctx: [item(ctx) for item in items]
+
+    if isinstance(node, ast.Call):
+        func_name = node.func.id if isinstance(node.func, ast.Name) else None
+        if func_name not in SCALAR_FUNCTIONS:
+            raise CalculationError(f"Function {func_name} not allowed")
+        if node.keywords:
+            raise CalculationError("Keyword arguments not supported")
+        args = [_compile_node(arg, names, depth) for arg in node.args]
+
+        def run_call(ctx: _Context) -> Any:
+            ctx.tick()
+            # Results are capped like operator results (sum() of big ints)
+            return _check_int(ctx.funcs[func_name](*[arg(ctx) for arg in args]))
+        return run_call
+
+    raise CalculationError(f"Node type {type(node).__name__} not supported")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Parse and validate an expression into a cached evaluation plan
+
+    Args:
+        expression: Arithmetic expression; bare names become variables
+
+    Returns:
+        CompiledExpression (shared across calls with the same string)
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculationLimitError(f"Expressions are limited to {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise CalculationError(f"Invalid expression: {e.msg}") from None
+    except (RecursionError, MemoryError):
+        raise CalculationLimitError("Expression is too complex") from None
+    names: set = set()
+    plan = _compile_node(tree.body, names)
+    return CompiledExpression(expression, plan, frozenset(names))
+
+
+def evaluate(expression: str, variables: Optional[Dict[str, Any]] = None,
+             time_budget: float = DEFAULT_TIME_BUDGET) -> Any:
+    """Evaluate an expression on scalars using the compiled-plan cache"""
+    return compile_expression(expression).evaluate(variables, time_budget)
+
+
+def evaluate_batch(expression: str, **arrays: Any) -> Any:
+    """
+    Evaluate one expression element-wise across NumPy arrays
+
+    Example:
+        evaluate_batch("value * 1.05 - fee", value=ledger["Value"], fee=2.5)
+    """
+    return compile_expression(expression).evaluate_vector(arrays)
@@ -0,0 +1,207 @@
+"""
+EVE Financial Analysis Library - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+NumPy-backed finance functions for EVE's "financial_analysis" capability.
+Every function accepts scalars, lists, ledger columns or price series and is
+vectorized, so a whole column is processed in one call instead of a Python
+loop. Rates are per period as decimals (0.05 = 5%).
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+
+
+def npv(rate: Any, cashflows: Any) -> Any:
+    """
+    Net present value of cashflows, the first at t=0
+
+    Args:
+        rate: Discount rate per period; an array of rates returns one NPV each
+        cashflows: 1-D cashflows, or 2-D (one series per row)
+
+    Returns:
+        NPV as a float or array
+    """
+    flows = np.asarray(cashflows, dtype=float)
+    rates = np.asarray(rate, dtype=float)
+    periods = np.arange(flows.shape[-1])
+    discount = (1.0 + rates[..., np.newaxis]) ** -periods
+    return (flows * discount).sum(axis=-1)
+
+
+def irr(cashflows: Any, guess: float = 0.1, tol: float = 1e-10, max_iter: int = 100) -> Any:
+    """
+    Internal rate of return by vectorized Newton iteration
+
+    All series in a 2-D input iterate together; each stops updating once
+    converged. Series without a sign change, or that fail to converge,
+    return NaN.
+
+    Args:
+        cashflows: 1-D cashflows, or 2-D (one series per row)
+        guess: Starting rate
+        tol: Convergence tolerance on the rate step
+        max_iter: Iteration cap
+
+    Returns:
+        IRR as a float or array
+    """
+    flows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    periods = np.arange(flows.shape[1])
+    rates = np.full(flows.shape[0], float(guess))
+    active = (flows.min(axis=1) < 0) & (flows.max(axis=1) > 0)
+    converged = np.zeros_like(active)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for _ in range(max_iter):
+            base = (1.0 + rates)[:, np.newaxis]
+            value = (flows * base ** -periods).sum(axis=1)
+            slope = (-periods * flows * base ** (-periods - 1)).sum(axis=1)
+            step = np.where(slope != 0, value / slope, np.nan)
+            updating = active & ~converged
+            rates = np.where(updating, rates - step, rates)
+            converged |= updating & (np.abs(step) < tol)
+            if not (active & ~converged).any():
+                break
+
+    result = np.where(active & converged & (rates > -1.0), rates, np.nan)
+    return result if np.ndim(cashflows) > 1 else float(result[0])
+
+
+# Bounds on what a calculator expression may ask of irr()
+CALCULATOR_IRR_MIN_TOL = 1e-15
+CALCULATOR_IRR_MAX_ITER = 1000
+
+
+def calculator_irr(cashflows: Any, guess: float = 0.1, tol: float = 1e-10, max_iter: int = 100) -> Any:
+    """
+    irr() for calculator input, with a bounded tolerance and iteration cap
+
+    An expression from chat cannot ask for millions of Newton steps, or a
+    tolerance no iteration can reach.
+
+    Raises:
+        ValueError: If tol is outside [CALCULATOR_IRR_MIN_TOL, 1] or max_iter
+            is not an integer in [1, CALCULATOR_IRR_MAX_ITER]
+    """
+    if not CALCULATOR_IRR_MIN_TOL <= tol <= 1.0:
+        raise ValueError(f"irr() tolerance must be between {CALCULATOR_IRR_MIN_TOL:g} and 1")
+    if int(max_iter) != max_iter or not 1 <= max_iter <= CALCULATOR_IRR_MAX_ITER:
+        raise ValueError(f"irr() iterations must be an integer from 1 to {CALCULATOR_IRR_MAX_ITER}")
+    return irr(cashflows, guess, tol, int(max_iter))
+
+
+def pmt(rate: Any, periods: Any, principal: Any) -> Any:
+    """Level payment per period that amortizes principal over periods"""
+    rate = np.asarray(rate, dtype=float)
+    periods = np.asarray(periods, dtype=float)
+    principal = np.asarray(principal, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1.0 + rate) ** periods
+        payment = np.where(rate == 0, principal / periods, principal * rate * growth / (growth - 1.0))
+    return payment[()] if payment.ndim == 0 else payment
+
+
+def amortization_schedule(principal: float, rate: float, periods: int) -> Dict[str, np.ndarray]:
+    """
+    Full amortization table, computed in closed form (no per-period loop)
+
+    Args:
+        principal: Loan amount
+        rate: Interest rate per period
+        periods: Number of payments
+
+    Returns:
+        Dictionary of arrays: period, payment, interest, principal, balance
+    """
+    payment = float(pmt(rate, periods, principal))
+    k = np.arange(1, int(periods) + 1)
+    if rate == 0:
+        balance = principal - payment * k
+    else:
+        growth = (1.0 + rate) ** k
+        balance = principal * growth - payment * (growth - 1.0) / rate
+    previous = np.concatenate(([principal], balance[:-1]))
+    interest = previous * rate
+    return {
+        "period": k,
+        "payment": np.full(k.shape, payment),
+        "interest": interest,
+        "principal": payment - interest,
+        "balance": np.maximum(balance, 0.0),
+    }
+
+
+def cagr(begin_value: Any, end_value: Any, years: Any) -> Any:
+    """Compound annual growth rate"""
+    begin_value = np.asarray(begin_value, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = (np.asarray(end_value, dtype=float) / begin_value) ** (1.0 / np.asarray(years, dtype=float)) - 1.0
+    return result[()] if result.ndim == 0 else result
+
+
+def compound(principal: Any, rate: Any, periods: Any, per_period: int = 1) -> Any:
+    """Future value of principal compounded per_period times each period"""
+    result = np.asarray(principal, dtype=float) * (
+        1.0 + np.asarray(rate, dtype=float) / per_period
+    ) ** (np.asarray(periods, dtype=float) * per_period)
+    return result[()] if result.ndim == 0 else result
+
+
+def rolling_returns(prices: Any, window: int) -> np.ndarray:
+    """
+    Simple returns over every trailing window of a price series
+
+    Args:
+        prices: Price series, oldest first
+        window: Lookback in observations (e.g. 30 for 30-day returns on
+            daily prices)
+
+    Returns:
+        Array of len(prices) - window returns
+    """
+    series = np.asarray(prices, dtype=float)
+    window = int(window)
+    if window <= 0 or window >= series.size:
+        return np.empty(0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return series[window:] / series[:-window] - 1.0
+
+
+def period_return(prices: Any, window: int) -> float:
+    """Return over the most recent window of a price series (NaN if too short)"""
+    returns = rolling_returns(prices, window)
+    return float(returns[-1]) if returns.size else float("nan")
+
+
+def volatility(prices: Any, periods_per_year: float = 1.0) -> float:
+    """
+    Standard deviation of one-period simple returns of a price series
+
+    Args:
+        prices: Price series, oldest first
+        periods_per_year: Observations per year (e.g. 252 for daily prices)
+            to annualize; 1 leaves it per period
+
+    Returns:
+        Sample standard deviation scaled by sqrt(periods_per_year), or NaN
+        with fewer than two returns
+    """
+    returns = rolling_returns(prices, 1)
+    if returns.size < 2:
+        return float("nan")
+    return float(np.std(returns, ddof=1) * np.sqrt(periods_per_year))
+
+
+# Functions exposed to the calculator (eve_calc) by name
+CALCULATOR_FUNCTIONS = {
+    'npv': npv,
+    'irr': calculator_irr,
+    'pmt': pmt,
+    'cagr': cagr,
+    'compound': compound,
+    'period_return': period_return,
+    'volatility': volatility,
+}
@@ -0,0 +1,374 @@
+"""
+EVE LLM Gateway - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+One entry point for every OpenAI-compatible chat provider EVE talks to
+(OpenAI, Groq, or a local stub server). Each provider keeps a small pool of
+clients and rolling (EWMA) latency and error statistics. Requests go to the
+fastest healthy provider; a failure puts that provider in a cooldown that
+grows with consecutive failures, and the request fails over to the next one.
+"""
+
+import importlib.util
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ValueError:
+        # Already in sys.modules without a spec (e.g. a stub injected by CI)
+        return True
+
+
+# The SDK is imported when a provider's first client is created
+OPENAI_AVAILABLE = _module_available("openai")
+
+# Defaults for providers selectable by name in EVE_LLM_PROVIDERS; any other
+# name needs <NAME>_BASE_URL and <NAME>_MODEL
+KNOWN_PROVIDERS: Dict[str, Dict[str, Optional[str]]] = {
+    "openai": {"base_url": None, "model": "gpt-4"},
+    "groq": {"base_url": "https://api.groq.com/openai/v1", "model": "llama-3.1-70b-versatile"},
+}
+
+
+class GatewayError(RuntimeError):
+    """Raised when no provider could serve a request"""
+
+    def __init__(self, message: str, attempts: Optional[List[Dict[str, str]]] = None):
+        super().__init__(message)
+        self.attempts = attempts or []
+
+
+class LLMUnavailable(GatewayError):
+    """Raised when no provider is configured or every provider failed"""
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Connection settings for one OpenAI-compatible provider"""
+
+    name: str
+    model: str
+    api_key: str
+    base_url: Optional[str] = None
+    timeout: float = 30.0
+    pool_size: int = 4
+
+
+@dataclass
+class ChatResult:
+    """A completed (non-streaming) chat response"""
+
+    content: str
+    provider: str
+    model: str
+    latency: float
+    usage: Optional[Dict[str, int]] = None
+
+
+def openai_client_factory(config: ProviderConfig) -> Any:
+    """Build an SDK client; retries are left to the gateway's failover"""
+    from openai import OpenAI
+    return OpenAI(api_key=config.api_key, base_url=config.base_url,
+                  timeout=config.timeout, max_retries=0)
+
+
+class ProviderStats:
+    """Rolling latency and error statistics for one provider"""
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.latency: Optional[float] = None      # EWMA of full completion time
+        self.first_token: Optional[float] = None  # EWMA of streaming time to first token
+        self.error_rate = 0.0                      # EWMA of failures (0..1)
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.alpha * (sample - current)
+
+    def record_success(self, latency: float, streaming: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.cooldown_until = 0.0
+            self.error_rate = self._ewma(self.error_rate, 0.0)
+            if streaming:
+                self.first_token = self._ewma(self.first_token, latency)
+            else:
+                self.latency = self._ewma(self.latency, latency)
+
+    def record_failure(self, error: Exception, base_cooldown: float, max_cooldown: float):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.error_rate = self._ewma(self.error_rate, 1.0)
+            self.last_error = f"{type(error).__name__}: {error}"[:200]
+            cooldown = min(max_cooldown, base_cooldown * 2 ** (self.consecutive_failures - 1))
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def healthy(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) >= self.cooldown_until
+
+    def score(self) -> float:
+        """Expected latency, inflated by recent errors; unmeasured providers score 0"""
+        latency = self.latency if self.latency is not None else self.first_token
+        return (latency or 0.0) * (1.0 + 4.0 * self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        cooldown = max(0.0, self.cooldown_until - time.monotonic())
+        return {
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "first_token_ms": round(self.first_token * 1000, 1) if self.first_token is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "healthy": cooldown == 0.0,
+            "cooldown_s": round(cooldown, 1),
+            "last_error": self.last_error,
+        }
+
+
+class Provider:
+    """A provider's config, statistics and lazily filled client pool"""
+
+    def __init__(self, config: ProviderConfig, factory: Callable[[ProviderConfig], Any], alpha: float):
+        self.config = config
+        self.stats = ProviderStats(alpha)
+        self._factory = factory
+        self._clients: List[Any] = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def client(self) -> Any:
+        """
+        Next client from the pool, creating clients until pool_size exist
+
+        SDK clients are thread-safe, so they are shared round-robin rather
+        than checked out; each brings its own connection pool, and the pool
+        never caps how many requests run at once.
+        """
+        with self._lock:
+            if len(self._clients) < self.config.pool_size:
+                self._clients.append(self._factory(self.config))
+                return self._clients[-1]
+            self._next = (self._next + 1) % len(self._clients)
+            return self._clients[self._next]
+
+
+class ChatStream:
+    """
+    Iterable of response text deltas from the first provider that answers
+
+    Failover happens only before the first delta; once text has been
+    yielded a failure raises GatewayError, and LLMUnavailable is raised
+    when no provider answered at all. `provider`, `model`,
+    `first_token_latency`, `latency` and `usage` are filled in as the
+    stream is consumed. Setting `cancel` ends the stream at the next chunk
+    and closes the upstream response, which stops generation.
+    """
+
+    def __init__(self, gateway: "LLMGateway", messages: List[Dict[str, str]], params: Dict[str, Any],
+                 cancel: Optional[threading.Event] = None):
+        self._gateway = gateway
+        self._messages = messages
+        self._params = params
+        self._cancel = cancel
+        self.cancelled = False
+        self.provider: Optional[str] = None
+        self.model: Optional[str] = None
+        self.first_token_latency: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.usage: Optional[Dict[str, int]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        attempts: List[Dict[str, str]] = []
+        for provider in self._gateway.ranked():
+            started = time.perf_counter()
+            emitted = False
+            chunks = None
+            try:
+                if self._cancel is not None and self._cancel.is_set():
+                    self.cancelled = True
+                    return
+                chunks = provider.client().chat.completions.create(
+                    model=provider.config.model, messages=self._messages,
+                    stream=True, **self._params)
+                for chunk in chunks:
+                    if self._cancel is not None and self._cancel.is_set():
+                        self.cancelled = True
+                        break
+                    usage = getattr(chunk, "usage", None)
+                    if usage is not None:
+                        self.usage = _usage_dict(usage)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if not emitted:
+                        emitted = True
+                        self.provider, self.model = provider.name, provider.config.model
+                        self.first_token_latency = time.perf_counter() - started
+                        provider.stats.record_success(self.first_token_latency, streaming=True)
+                    yield delta
+            except GeneratorExit:
+                raise
+            except Exception as e:
+                provider.stats.record_failure(e, self._gateway.base_cooldown, self._gateway.max_cooldown)
+                attempts.append({"provider": provider.name, "error": provider.stats.last_error})
+                if emitted:
+                    raise GatewayError(f"Stream from {provider.name} failed: {e}", attempts) from e
+                continue
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+            if not emitted and not self.cancelled:
+                # An empty reply still counts as an answer
+                self.provider, self.model = provider.name, provider.config.model
+                provider.stats.record_success(time.perf_counter() - started, streaming=True)
+            self.latency = time.perf_counter() - started
+            return
+        raise LLMUnavailable(_no_provider_message(attempts), attempts)
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+def _no_provider_message(attempts: List[Dict[str, str]]) -> str:
+    if not attempts:
+        return "No LLM provider is configured"
+    return "All LLM providers failed: " + "; ".join(f"{a['provider']} ({a['error']})" for a in attempts)
+
+
+class LLMGateway:
+    """Latency-aware router with failover across OpenAI-compatible providers"""
+
+    def __init__(self, providers: List[ProviderConfig],
+                 client_factory: Callable[[ProviderConfig], Any] = openai_client_factory,
+                 alpha: float = 0.2, base_cooldown: float = 2.0, max_cooldown: float = 60.0):
+        self.providers = [Provider(config, client_factory, alpha) for config in providers]
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+
+    def __bool__(self) -> bool:
+        return bool(self.providers)
+
+    def ranked(self) -> List[Provider]:
+        """
+        Providers in the order to try them
+
+        Healthy providers come first, fastest (error-weighted) first, with
+        configured order breaking ties; providers in cooldown follow, soonest
+        to recover first, so a request is still attempted if all are down.
+        """
+        now = time.monotonic()
+        order = {id(provider): index for index, provider in enumerate(self.providers)}
+        healthy = [p for p in self.providers if p.stats.healthy(now)]
+        cooling = [p for p in self.providers if not p.stats.healthy(now)]
+        healthy.sort(key=lambda p: (p.stats.score(), order[id(p)]))
+        cooling.sort(key=lambda p: p.stats.cooldown_until)
+        return healthy + cooling
+
+    def complete(self, messages: List[Dict[str, str]], **params: Any) -> ChatResult:
+        """
+        Run a chat completion on the best available provider
+
+        Args:
+            messages: OpenAI-format chat messages
+            **params: Extra completion parameters (temperature, max_tokens, ...)
+
+        Returns:
+            ChatResult from the first provider that succeeded
+
+        Raises:
+            LLMUnavailable: If no provider is configured or all of them failed
+        """
+        attempts: List[Dict[str, str]] = []
+        for provider in self.ranked():
+            started = time.perf_counter()
+            try:
+                response = provider.client().chat.completions.create(
+                    model=provider.config.model, messages=messages, **params)
+                content = response.choices[0].message.content or ""
+            except Exception as e:
+                provider.stats.record_failure(e, self.base_cooldown, self.max_cooldown)
+                attempts.append({"provider": provider.name, "error": provider.stats.last_error})
+                continue
+            latency = time.perf_counter() - started
+            provider.stats.record_success(latency)
+            usage = getattr(response, "usage", None)
+            return ChatResult(content, provider.name, provider.config.model, latency,
+                              _usage_dict(usage) if usage is not None else None)
+        raise LLMUnavailable(_no_provider_message(attempts), attempts)
+
+    def stream(self, messages: List[Dict[str, str]], cancel: Optional[threading.Event] = None,
+               **params: Any) -> ChatStream:
+        """Stream a chat completion from the best available provider (see ChatStream)"""
+        return ChatStream(self, messages, params, cancel)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider model and rolling statistics"""
+        return {p.name: {"model": p.config.model, **p.stats.as_dict()} for p in self.providers}
+
+
+def gateway_from_env(providers: Optional[str] = None) -> LLMGateway:
+    """
+    Build a gateway from the environment
+
+    Args:
+        providers: Comma-separated provider names in preference order;
+            defaults to EVE_LLM_PROVIDERS, then "openai,groq". Each named
+            provider is enabled when <NAME>_API_KEY is set, and reads
+            <NAME>_MODEL and <NAME>_BASE_URL (point this at a local
+            OpenAI-compatible stub for testing).
+
+    Returns:
+        LLMGateway (with no providers when none are configured or the
+        openai package is missing)
+    """
+    names = providers or os.getenv("EVE_LLM_PROVIDERS") or "openai,groq"
+    if not OPENAI_AVAILABLE:
+        return LLMGateway([])
+
+    timeout = float(os.getenv("EVE_LLM_TIMEOUT", "30"))
+    pool_size = int(os.getenv("EVE_LLM_POOL_SIZE", "4"))
+    configs = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if not name:
+            continue
+        prefix = name.upper().replace("-", "_")
+        api_key = os.getenv(f"{prefix}_API_KEY")
+        defaults = KNOWN_PROVIDERS.get(name, {})
+        model = os.getenv(f"{prefix}_MODEL") or defaults.get("model")
+        if not api_key or not model:
+            continue
+        configs.append(ProviderConfig(
+            name=name,
+            model=model,
+            api_key=api_key,
+            base_url=os.getenv(f"{prefix}_BASE_URL") or defaults.get("base_url"),
+            timeout=timeout,
+            pool_size=pool_size,
+        ))
+    return LLMGateway(configs)
@@ -0,0 +1,157 @@
+"""
+EVE Idempotency Store - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Bounded, TTL-limited record of requests sent with an Idempotency-Key. The
+first request with a key computes the response; a retry with the same key
+either waits for that in-flight computation or gets the stored result, so
+a flaky network never triggers a second model call or a duplicate turn in
+the conversation history. Reusing a key for a different request is an
+error. Failed computations are forgotten, so they can be retried.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with different content"""
+
+
+class Entry:
+    """One key's computation: pending until completed or failed"""
+
+    __slots__ = ("fingerprint", "expires", "value", "failed", "_done")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.expires = float("inf")  # Set when the computation finishes
+        self.value: Any = None
+        self.failed = False
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float) -> Optional[Any]:
+        """The stored value, or None if the computation failed or timed out"""
+        if not self._done.wait(timeout) or self.failed:
+            return None
+        return self.value
+
+
+def fingerprint(*parts: bytes) -> str:
+    """Digest identifying a request's content"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Thread-safe map of idempotency keys to in-flight or completed results
+
+    Args:
+        ttl: Seconds a completed result is replayed
+        max_entries: Oldest entries are dropped beyond this; a dropped
+            in-flight entry still completes for the requests holding it
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+        self.joins = 0
+
+    def begin(self, key: str, request_fingerprint: str) -> Tuple[Entry, bool]:
+        """
+        Claim a key, or find the computation that already claimed it
+
+        Returns:
+            (entry, owner) - owner is True when the caller must compute
+            the result and then call complete() or fail()
+
+        Raises:
+            IdempotencyConflict: The key is held by a different request
+        """
+        with self._lock:
+            self._purge(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.fingerprint != request_fingerprint:
+                    raise IdempotencyConflict(key)
+                if entry.done:
+                    self.replays += 1
+                else:
+                    self.joins += 1
+                return entry, False
+            entry = Entry(request_fingerprint)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry, True
+
+    def lookup(self, key: str, request_fingerprint: str) -> Optional[Any]:
+        """A completed result for this key and request, without waiting"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.done or entry.failed or entry.expires <= time.monotonic():
+                return None
+            if entry.fingerprint != request_fingerprint:
+                return None
+            self.replays += 1
+            return entry.value
+
+    def complete(self, entry: Entry, value: Any):
+        """Store the result and release everyone waiting on it"""
+        with self._lock:
+            entry.value = value
+            entry.expires = time.monotonic() + self.ttl
+            entry._done.set()
+
+    def fail(self, key: str, entry: Entry):
+        """Forget the key so a retry recomputes; waiters get None"""
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            entry.failed = True
+            entry._done.set()
+
+    def _purge(self, now: float):
+        # Entries expire in completion order, which is close to insertion
+        # order, so scanning from the oldest stops early
+        expired = []
+        for key, entry in self._entries.items():
+            if entry.expires > now:
+                if entry.done:
+                    break
+                continue
+            expired.append(key)
+        for key in expired:
+            del self._entries[key]
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_flight": sum(1 for entry in self._entries.values() if not entry.done),
+                "replays": self.replays,
+                "joins": self.joins,
+            }
+
+
+def idempotency_from_env() -> IdempotencyStore:
+    """Build the store from EVE_API_IDEMPOTENCY_TTL / EVE_API_IDEMPOTENCY_MAX_ENTRIES"""
+    return IdempotencyStore(
+        ttl=float(os.getenv("EVE_API_IDEMPOTENCY_TTL", "600")),
+        max_entries=int(os.getenv("EVE_API_IDEMPOTENCY_MAX_ENTRIES", "1024")),
+    )
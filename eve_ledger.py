@@ -0,0 +1,296 @@
+"""
+EVE Ledger Index - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+In-memory index over the data/ ledger files: the master ledger workbook
+(dashboard fields and physics module sheets), the unfinished-tasks CSV and
+the operational metrics/assets CSV. Each source is parsed once into dict
+and sorted-list indexes and re-parsed only when its file mtime changes, so
+typed queries are O(1) or O(log n) instead of rescanning DataFrames.
+"""
+
+import bisect
+import csv
+import importlib.util
+import os
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# openpyxl is imported when the workbook is first indexed, not at module import
+OPENPYXL_AVAILABLE = importlib.util.find_spec("openpyxl") is not None
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+LEDGER_WORKBOOK = "CEC_WAM_MASTER_LEDGER_LIVE.xlsx"
+TASKS_CSV = "EVE_UNFINISHED_TASKS.csv"
+METRICS_CSV = "CEC_Matrix_System_Operational_Metrics_and_Assets.csv"
+
+# Workbook sheets holding physics module parameters
+PHYSICS_SHEETS = ("DarkEnergy", "BlackHoles", "QuantumField", "Conscious", "Synth")
+
+_MONEY = re.compile(r"-?\$?\s*(\d[\d,]*(?:\.\d+)?)")
+
+
+def parse_amount(value: Any) -> Optional[float]:
+    """Extract the leading amount from "$21,000.00", "176,452.66", "$300.00/Day" """
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _MONEY.search(str(value or ""))
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", ""))
+    return -amount if str(value).lstrip().startswith("-") else amount
+
+
+def _row_key(name: Any) -> str:
+    return str(name).strip().lower()
+
+
+def _short_key(name: Any) -> str:
+    """'H0 (Hubble rate today)' -> 'h0'"""
+    return _row_key(str(name).split("(")[0])
+
+
+def _distinct(index: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The rows of a sheet index once each (full and short keys share a row)"""
+    return list({id(row): row for row in index.values()}.values())
+
+
+class _Source:
+    """One file on disk plus the loader that indexes it"""
+
+    __slots__ = ("path", "loader", "mtime")
+
+    def __init__(self, path: Path, loader: Callable[[Path], None]):
+        self.path = path
+        self.loader = loader
+        self.mtime: Optional[float] = None
+
+
+class LedgerIndex:
+    """Indexed, mtime-refreshed view of the CEC WAM ledger files"""
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        self._lock = threading.Lock()
+
+        self.dashboard: Dict[str, Any] = {}
+        self.physics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.tasks_by_priority: Dict[str, List[Dict[str, Any]]] = {}
+        self.tasks_by_status: Dict[str, List[Dict[str, Any]]] = {}
+        self._task_due_dates: List[str] = []
+        self._tasks_by_due: List[Dict[str, Any]] = []
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.total_asset_value = 0.0
+
+        self._sources = [
+            _Source(self.data_dir / LEDGER_WORKBOOK, self._load_workbook),
+            _Source(self.data_dir / TASKS_CSV, self._load_tasks),
+            _Source(self.data_dir / METRICS_CSV, self._load_metrics),
+        ]
+
+    # ── Refresh ─────────────────────────────────────────────────────────────
+
+    def refresh(self) -> List[str]:
+        """Re-index any source whose mtime changed; returns reloaded file names"""
+        reloaded = []
+        with self._lock:
+            for source in self._sources:
+                try:
+                    mtime = source.path.stat().st_mtime
+                except OSError:
+                    mtime = None
+                if mtime == source.mtime:
+                    continue
+                source.loader(source.path if mtime is not None else None)
+                source.mtime = mtime
+                reloaded.append(source.path.name)
+        return reloaded
+
+    def source_status(self) -> Dict[str, bool]:
+        """Which ledger files are present"""
+        return {source.path.name: source.mtime is not None for source in self._sources}
+
+    # ── Loaders ─────────────────────────────────────────────────────────────
+
+    def _load_workbook(self, path: Optional[Path]):
+        dashboard: Dict[str, Any] = {}
+        physics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if path is not None and OPENPYXL_AVAILABLE:
+            import openpyxl
+
+            workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            try:
+                if "Dashboard" in workbook.sheetnames:
+                    for row in workbook["Dashboard"].iter_rows(min_row=2, values_only=True):
+                        if row and row[0] is not None:
+                            dashboard[_row_key(row[0])] = row[1] if len(row) > 1 else None
+                for sheet_name in PHYSICS_SHEETS:
+                    if sheet_name in workbook.sheetnames:
+                        physics[sheet_name.lower()] = self._index_sheet(workbook[sheet_name])
+            finally:
+                workbook.close()
+        self.dashboard = dashboard
+        self.physics = physics
+
+    @staticmethod
+    def _index_sheet(sheet) -> Dict[str, Dict[str, Any]]:
+        """Index a parameter sheet by full and short first-column name"""
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows, ()) if h is not None and not str(h).startswith("Column ")]
+        index: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            record = {name: row[i] for i, name in enumerate(header) if i < len(row)}
+            index[_row_key(row[0])] = record
+            index.setdefault(_short_key(row[0]), record)
+        return index
+
+    def _load_tasks(self, path: Optional[Path]):
+        tasks: Dict[str, Dict[str, Any]] = {}
+        by_priority: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        by_status: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        if path is not None:
+            with open(path, newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle):
+                    task_id = (row.get("Task_ID") or "").strip()
+                    if not task_id:
+                        continue
+                    tasks[task_id.lower()] = row
+                    by_priority[_row_key(row.get("Priority", ""))].append(row)
+                    by_status[_row_key(row.get("Status", ""))].append(row)
+        by_due = sorted(tasks.values(), key=lambda task: task.get("Due_Date") or "")
+        self.tasks = tasks
+        self.tasks_by_priority = dict(by_priority)
+        self.tasks_by_status = dict(by_status)
+        self._tasks_by_due = by_due
+        self._task_due_dates = [task.get("Due_Date") or "" for task in by_due]
+
+    def _load_metrics(self, path: Optional[Path]):
+        assets: Dict[str, Dict[str, Any]] = {}
+        if path is not None:
+            with open(path, newline="", encoding="utf-8") as handle:
+                reader = csv.reader(handle)
+                header = next(reader, [])
+                # Headers look like "A (ASSET CLASS)"; keep the part in parentheses
+                names = [h[h.find("(") + 1:h.rfind(")")].strip().lower().replace(" ", "_") if "(" in h else h
+                         for h in header]
+                for row in reader:
+                    record = {name: value for name, value in zip(names, row) if name}
+                    asset_class = record.get("asset_class")
+                    if not asset_class:
+                        continue
+                    record["value_numeric"] = parse_amount(record.get("value"))
+                    assets[_row_key(asset_class)] = record
+        self.assets = assets
+        self.total_asset_value = sum(a["value_numeric"] or 0.0 for a in assets.values())
+
+    # ── Lookups ─────────────────────────────────────────────────────────────
+
+    def task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self.tasks.get(_row_key(task_id))
+
+    def tasks_with_priority(self, priority: str) -> List[Dict[str, Any]]:
+        self.refresh()
+        return list(self.tasks_by_priority.get(_row_key(priority), ()))
+
+    def tasks_with_status(self, status: str) -> List[Dict[str, Any]]:
+        self.refresh()
+        return list(self.tasks_by_status.get(_row_key(status), ()))
+
+    def tasks_due_by(self, date: str) -> List[Dict[str, Any]]:
+        """Tasks due on or before an ISO date (binary search)"""
+        self.refresh()
+        return self._tasks_by_due[:bisect.bisect_right(self._task_due_dates, date)]
+
+    def asset(self, asset_class: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self.assets.get(_row_key(asset_class))
+
+    def physics_rows(self, module: str, parameter: Optional[str] = None) -> Any:
+        """All indexed rows of a physics module, or one parameter's row"""
+        self.refresh()
+        return self._physics_rows(module, parameter)
+
+    def _physics_rows(self, module: str, parameter: Optional[str]) -> Any:
+        rows = self.physics.get(_row_key(module).replace(" ", ""))
+        if rows is None or parameter is None:
+            return rows
+        key = _row_key(parameter)
+        return rows.get(key) or rows.get(_short_key(parameter))
+
+    def dashboard_field(self, field: str) -> Any:
+        self.refresh()
+        return self.dashboard.get(_row_key(field))
+
+    # ── Typed queries ───────────────────────────────────────────────────────
+
+    def query(self, data_type: str = "all", key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Answer a typed ledger query
+
+        Args:
+            data_type: all, financial, operational, tasks, physics or dashboard
+            key: Narrows the query - asset class, task priority/ID,
+                "Module" or "Module:Parameter", dashboard field
+
+        Returns:
+            Dictionary of results (empty "results" when nothing matches)
+        """
+        # One refresh per query; the lookups below read the indexes directly
+        self.refresh()
+        data_type = (data_type or "all").lower()
+
+        if data_type == "financial":
+            if key:
+                return {"asset": self.assets.get(_row_key(key))}
+            return {
+                "assets": list(self.assets.values()),
+                "total_value": round(self.total_asset_value, 2),
+            }
+
+        if data_type == "tasks":
+            if key and _row_key(key) in self.tasks:
+                return {"task": self.tasks[_row_key(key)]}
+            if key:
+                return {"priority": key.title(), "tasks": list(self.tasks_by_priority.get(_row_key(key), ()))}
+            return {"tasks": list(self.tasks.values())}
+
+        if data_type == "operational":
+            return {
+                "open_tasks": len(self.tasks),
+                "tasks_by_status": {s.title(): len(rows) for s, rows in self.tasks_by_status.items()},
+                "tasks_by_priority": {p.title(): len(rows) for p, rows in self.tasks_by_priority.items()},
+            }
+
+        if data_type == "physics":
+            if key:
+                module, _, parameter = key.partition(":")
+                rows = self._physics_rows(module, parameter or None)
+                return {"module": module, "rows": _distinct(rows) if rows is not None and not parameter else rows}
+            return {"modules": {name: len(_distinct(rows)) for name, rows in self.physics.items()}}
+
+        if data_type == "dashboard":
+            if key:
+                return {"field": key, "value": self.dashboard.get(_row_key(key))}
+            return {"fields": len(self.dashboard)}
+
+        return {
+            "assets": len(self.assets),
+            "total_asset_value": round(self.total_asset_value, 2),
+            "open_tasks": len(self.tasks),
+            "physics_modules": sorted(self.physics),
+            "dashboard_fields": len(self.dashboard),
+            "sources": self.source_status(),
+        }
+
+
+def ledger_from_env() -> LedgerIndex:
+    """Build the index over EVE_DATA_DIR (defaults to the repo's data/ folder)"""
+    return LedgerIndex(os.getenv("EVE_DATA_DIR") or None)
@@ -0,0 +1,293 @@
+"""
+EVE Activity Log Buffer - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Fixed-capacity ring buffer for EVEAgent's activity log. Timestamps live in a
+float array and levels in a byte array of interned codes, records use
+__slots__, and the system code is attached only when records are rendered.
+Tail reads are O(k), time-range queries binary-search the chronological
+ring (falling back to a scan while it holds a record with a caller-supplied,
+out-of-order timestamp), and an optional JSONL sink flushes records in
+batches with rotation.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Level names are interned as small integer codes; unknown levels are added on demand
+_LEVEL_NAMES: List[str] = ["debug", "info", "warning", "error", "critical"]
+_LEVEL_CODES: Dict[str, int] = {name: code for code, name in enumerate(_LEVEL_NAMES)}
+_LEVEL_LOCK = threading.Lock()
+
+TimeBound = Union[None, float, datetime]
+
+
+def level_code(level: str) -> int:
+    """Intern a level name, returning its numeric code"""
+    code = _LEVEL_CODES.get(level)
+    if code is None:
+        with _LEVEL_LOCK:
+            code = _LEVEL_CODES.get(level)
+            if code is None:
+                if len(_LEVEL_NAMES) >= 256:
+                    raise ValueError("Too many distinct log levels")
+                code = len(_LEVEL_NAMES)
+                _LEVEL_NAMES.append(level)
+                _LEVEL_CODES[level] = code
+    return code
+
+
+def _epoch(bound: TimeBound) -> Optional[float]:
+    return bound.timestamp() if isinstance(bound, datetime) else bound
+
+
+class LogRecord:
+    """One log event"""
+
+    __slots__ = ("timestamp", "level", "message")
+
+    def __init__(self, timestamp: float, level: str, message: str):
+        self.timestamp = timestamp
+        self.level = level
+        self.message = message
+
+    def as_dict(self, system_code: str) -> Dict[str, Any]:
+        """Render in EVE's public log format"""
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "level": self.level,
+            "message": self.message,
+            "system_code": system_code,
+        }
+
+
+class JsonlLogSink:
+    """
+    Batched JSONL writer with size-based rotation
+
+    Records are buffered and written in one append once `batch_size`
+    records are pending or `flush_interval` seconds have passed. When the
+    file would grow past `max_bytes` it is rotated to .1, .2, ... .backups.
+    """
+
+    def __init__(self, path: str, system_code: str, max_bytes: int = 5 * 1024 * 1024,
+                 backups: int = 3, batch_size: int = 50, flush_interval: float = 2.0):
+        self.path = path
+        self.system_code = system_code
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, record: LogRecord):
+        line = json.dumps(record.as_dict(self.system_code), ensure_ascii=False)
+        with self._lock:
+            self._pending.append(line)
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write all pending records in a single append"""
+        with self._lock:
+            if not self._pending:
+                return
+            payload = ("\n".join(self._pending) + "\n").encode("utf-8")
+            self._pending = []
+            self._last_flush = time.monotonic()
+            try:
+                self._rotate_if_needed(len(payload))
+                with open(self.path, "ab") as handle:
+                    handle.write(payload)
+            except OSError:
+                pass  # Logging must never break the agent
+
+    def _rotate_if_needed(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class LogRing:
+    """Thread-safe, fixed-capacity ring of LogRecords, oldest overwritten first"""
+
+    def __init__(self, capacity: int = 1000, sink: Optional[JsonlLogSink] = None):
+        self.capacity = capacity
+        self.sink = sink
+        self._records: List[Optional[LogRecord]] = [None] * capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._levels = array("B", bytes(capacity))
+        # 1 where a record is older than the one before it; binary search
+        # is only valid while none of these are held
+        self._inverted = array("B", bytes(capacity))
+        self._inversions = 0
+        self._start = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        return iter(self.tail(self._count))
+
+    def append(self, message: str, level: str = "info", timestamp: Optional[float] = None) -> LogRecord:
+        """
+        Record an event, overwriting the oldest once full
+
+        Without a timestamp, the current time is taken under the lock and
+        never goes backwards (e.g. on a clock step), so the ring stays in
+        order. A supplied timestamp is stored as given.
+        """
+        code = level_code(level)
+        with self._lock:
+            newest = self._timestamps[self._slot(self._count - 1)] if self._count else None
+            if timestamp is None:
+                timestamp = time.time() if newest is None else max(time.time(), newest)
+            record = LogRecord(timestamp, level, message)
+            if self._count < self.capacity:
+                slot = (self._start + self._count) % self.capacity
+                self._count += 1
+            else:
+                slot = self._start
+                self._start = (self._start + 1) % self.capacity
+                # The new oldest record has no predecessor left to be out of order with
+                for stale in (slot, self._start):
+                    self._inversions -= self._inverted[stale]
+                    self._inverted[stale] = 0
+            self._records[slot] = record
+            self._timestamps[slot] = timestamp
+            self._levels[slot] = code
+            self._inverted[slot] = 1 if self._count > 1 and timestamp < newest else 0
+            self._inversions += self._inverted[slot]
+        if self.sink is not None:
+            self.sink.write(record)
+        return record
+
+    def clear(self):
+        with self._lock:
+            self._records = [None] * self.capacity
+            self._inverted = array("B", bytes(self.capacity))
+            self._inversions = 0
+            self._start = 0
+            self._count = 0
+
+    def _slot(self, position: int) -> int:
+        """Map a logical position (0 = oldest) to its array slot"""
+        return (self._start + position) % self.capacity
+
+    def tail(self, k: int) -> List[LogRecord]:
+        """The newest k records, oldest first, in O(k)"""
+        with self._lock:
+            k = max(0, min(k, self._count))
+            first = self._count - k
+            return [self._records[self._slot(p)] for p in range(first, self._count)]
+
+    def _bisect(self, bound: float, right: bool) -> int:
+        """Binary search the chronological ring for a timestamp bound"""
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            value = self._timestamps[self._slot(mid)]
+            if value < bound or (right and value == bound):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def query(self, level: Optional[str] = None, since: TimeBound = None,
+              until: TimeBound = None, limit: Optional[int] = None) -> List[LogRecord]:
+        """
+        Filter by level and/or time range
+
+        Args:
+            level: Only records at this level
+            since: Inclusive lower bound (epoch seconds or datetime)
+            until: Inclusive upper bound (epoch seconds or datetime)
+            limit: Keep only the newest `limit` matches
+
+        Returns:
+            Matching records, oldest first (in insertion order)
+        """
+        since, until = _epoch(since), _epoch(until)
+        with self._lock:
+            if self._inversions and (since is not None or until is not None):
+                return self._scan(level, since, until, limit)
+            first = self._bisect(since, right=False) if since is not None else 0
+            last = self._bisect(until, right=True) if until is not None else self._count
+            if level is None:
+                if limit is not None:
+                    first = max(first, last - limit)
+                return [self._records[self._slot(p)] for p in range(first, last)]
+
+            code = _LEVEL_CODES.get(level)
+            if code is None:
+                return []
+            matches: List[LogRecord] = []
+            # Walk newest-first so a limit stops the scan early
+            for position in range(last - 1, first - 1, -1):
+                slot = self._slot(position)
+                if self._levels[slot] == code:
+                    matches.append(self._records[slot])
+                    if limit is not None and len(matches) >= limit:
+                        break
+            matches.reverse()
+            return matches
+
+    def _scan(self, level: Optional[str], since: Optional[float], until: Optional[float],
+              limit: Optional[int]) -> List[LogRecord]:
+        """query() by linear scan, for when timestamps are out of order; caller holds the lock"""
+        code = _LEVEL_CODES.get(level) if level is not None else None
+        if level is not None and code is None:
+            return []
+        matches: List[LogRecord] = []
+        for position in range(self._count - 1, -1, -1):
+            slot = self._slot(position)
+            value = self._timestamps[slot]
+            if ((since is None or value >= since) and (until is None or value <= until)
+                    and (code is None or self._levels[slot] == code)):
+                matches.append(self._records[slot])
+                if limit is not None and len(matches) >= limit:
+                    break
+        matches.reverse()
+        return matches
+
+    def flush(self):
+        if self.sink is not None:
+            self.sink.flush()
+
+
+def jsonl_sink_from_env(system_code: str) -> Optional[JsonlLogSink]:
+    """Build a sink from EVE_LOG_FILE / EVE_LOG_MAX_MB / EVE_LOG_BACKUPS (unset disables)"""
+    path = os.getenv("EVE_LOG_FILE")
+    if not path:
+        return None
+    sink = JsonlLogSink(
+        path,
+        system_code,
+        max_bytes=int(float(os.getenv("EVE_LOG_MAX_MB", "5")) * 1024 * 1024),
+        backups=int(os.getenv("EVE_LOG_BACKUPS", "3")),
+    )
+    atexit.register(sink.flush)
+    return sink
@@ -0,0 +1,178 @@
+"""
+EVE Performance Metrics - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Per-operation latency histograms for EVEAgent (chat, llm, speak, tts,
+calculate), plus token usage, error and route counters. Latencies go into a
+streaming quantile sketch with logarithmic buckets: recording is O(1), memory
+is bounded by the value range rather than the sample count, and every
+reported quantile is within 1% of the exact value.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch over positive values
+
+    Values are counted in buckets whose bounds grow geometrically by
+    gamma = (1 + a) / (1 - a), so any quantile is returned within relative
+    accuracy `a`. Values below `min_value` share the lowest bucket.
+    """
+
+    __slots__ = ("relative_accuracy", "min_value", "_log_gamma", "_buckets",
+                 "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        index = math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None when empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+                estimate = 2 * math.exp(index * self._log_gamma) / (1 + math.exp(self._log_gamma))
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Fold another sketch with the same accuracy into this one
+
+        Raises:
+            ValueError: If the sketches' bucket bounds differ
+        """
+        if other.relative_accuracy != self.relative_accuracy or other.min_value != self.min_value:
+            raise ValueError("Can only merge sketches with the same relative_accuracy and min_value")
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class AgentMetrics:
+    """Thread-safe latency sketches and counters for one agent"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.started = time.time()
+        self._latency: Dict[str, QuantileSketch] = {}
+        self._errors: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, error: bool = False):
+        """Record one timed operation"""
+        with self._lock:
+            sketch = self._latency.get(operation)
+            if sketch is None:
+                sketch = self._latency[operation] = QuantileSketch(self.relative_accuracy)
+            sketch.add(seconds)
+            if error:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[Dict[str, bool]]:
+        """
+        Time a block; set outcome["error"] = True to count it as failed
+
+        Exceptions escaping the block are counted as errors and re-raised.
+        """
+        outcome = {"error": False}
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except BaseException:
+            outcome["error"] = True
+            raise
+        finally:
+            self.record(operation, time.perf_counter() - started, outcome["error"])
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def add_usage(self, usage: Optional[Dict[str, int]]):
+        """Accumulate token counts from an LLM usage block"""
+        if not usage:
+            return
+        with self._lock:
+            for name in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                self._counters[name] = self._counters.get(name, 0) + int(usage.get(name, 0) or 0)
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def latency_summary(self) -> Dict[str, Dict[str, Any]]:
+        """count, error rate, mean and p50/p95/p99/max in milliseconds per operation"""
+        with self._lock:
+            summary = {}
+            for operation, sketch in sorted(self._latency.items()):
+                errors = self._errors.get(operation, 0)
+                row: Dict[str, Any] = {
+                    "count": sketch.count,
+                    "errors": errors,
+                    "error_rate": round(errors / sketch.count, 4),
+                    "mean_ms": round(sketch.total / sketch.count * 1000, 2),
+                }
+                for q in QUANTILES:
+                    row[f"p{int(q * 100)}_ms"] = round(sketch.quantile(q) * 1000, 2)
+                row["max_ms"] = round(sketch.max * 1000, 2)
+                summary[operation] = row
+            return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latency histograms plus counters"""
+        summary = self.latency_summary()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "latency": summary,
+            "counters": counters,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._errors.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+
+def hit_rate(hits: int, misses: int) -> Optional[float]:
+    """hits / lookups, or None before the first lookup"""
+    lookups = hits + misses
+    return round(hits / lookups, 4) if lookups else None
@@ -0,0 +1,131 @@
+"""
+EVE Voice Pipeline - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Overlaps LLM generation with speech synthesis. Streamed reply text is cut at
+sentence boundaries and each sentence is synthesized while the model is still
+generating, so the first audio segment is ready after about one sentence
+instead of after the full completion plus the full synthesis.
+"""
+
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by
+# whitespace, or a line break. "3.14" and "e.g.x" do not split.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+# Characters a boundary can begin with before its whitespace arrives
+_BOUNDARY_LEAD = ".!?\"')]"
+
+_DONE = object()
+
+
+def split_sentences(deltas: Iterable[str], min_chars: int = 24) -> Iterator[str]:
+    """
+    Re-chunk streamed text deltas into sentences
+
+    Args:
+        deltas: Text fragments in arrival order
+        min_chars: Shorter sentences are merged with the next one so tiny
+            fragments ("Hi.", "Dr.") don't become separate synthesis calls
+
+    Yields:
+        Sentences as soon as their boundary has been seen
+    """
+    buffer = ""
+    for delta in deltas:
+        # Rescan only the new text, plus any trailing punctuation a boundary
+        # may start with, so a long reply without boundaries stays linear
+        scan_from = len(buffer)
+        while scan_from and buffer[scan_from - 1] in _BOUNDARY_LEAD:
+            scan_from -= 1
+        buffer += delta
+        start = 0
+        for match in _SENTENCE_BOUNDARY.finditer(buffer, scan_from):
+            sentence = buffer[start:match.start()].strip()
+            if not sentence or len(sentence) < min_chars:
+                continue
+            yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+def pipeline_synthesis(
+    sentences: Iterable[str],
+    synthesize: Callable[[str], Optional[bytes]],
+    max_workers: int = 2,
+    max_pending: int = 4,
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    Synthesize sentences concurrently with their generation, in order
+
+    A producer thread drains `sentences` (typically backed by a streaming
+    completion) and submits each one for synthesis immediately. Results are
+    yielded in sentence order as soon as the head of the queue is ready.
+
+    Closing the generator early cancels queued synthesis and sets `cancel`,
+    which should be the event the upstream stream watches (e.g.
+    EVEAgent.chat_stream's), so generation stops at its next chunk rather
+    than running to the end. The producer then exits and closes
+    `sentences`.
+
+    Args:
+        sentences: Sentence iterator, consumed on a background thread
+        synthesize: Text-to-audio function, e.g. EVEAgent.speak
+        max_workers: Concurrent synthesis calls
+        max_pending: Sentences allowed ahead of the consumer (backpressure)
+        cancel: Set when the consumer stops early
+
+    Yields:
+        (sentence, audio) tuples in the order the sentences were produced
+    """
+    pending: "queue.Queue" = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eve-tts")
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for sentence in sentences:
+                if stop.is_set() or not put((sentence, executor.submit(synthesize, sentence))):
+                    return
+        except Exception as exc:
+            put(exc)
+        finally:
+            close = getattr(sentences, "close", None)
+            if close is not None:
+                close()
+            put(_DONE)
+
+    producer = threading.Thread(target=produce, name="eve-sentences", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            sentence, future = item
+            yield sentence, future.result()
+    finally:
+        stop.set()
+        if cancel is not None:
+            cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
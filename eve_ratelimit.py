@@ -0,0 +1,282 @@
+"""
+EVE Rate Limiting - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Per-client token buckets for EVE's API. Each client has one bucket per
+policy (chat, voice) holding up to `burst` tokens and refilling at a steady
+rate; a request spends tokens or is refused with 429 and a Retry-After.
+Unlike admission control, which protects the server as a whole, this keeps
+any single client from draining the shared model and TTS quota.
+
+Buckets live in a backend. MemoryBackend keeps them in process (one
+instance, or per worker); RedisBackend keeps them in Redis with an atomic
+Lua script, so every worker and instance shares one bucket per client.
+Other stores plug in by subclassing RateLimitBackend. Each decision is a
+constant-time refill-and-spend on one key.
+"""
+
+import importlib.util
+import math
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+
+class Quota:
+    """A rate-limit decision and the client's remaining allowance"""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after", "window")
+
+    def __init__(self, allowed: bool, limit: int, remaining: float, reset: float, retry_after: float,
+                 window: float):
+        self.allowed = allowed
+        self.limit = limit            # Bucket size (burst)
+        self.remaining = remaining    # Tokens left after this request
+        self.reset = reset            # Seconds until the bucket is full again
+        self.retry_after = retry_after  # Seconds until this request would fit
+        self.window = window          # Seconds to refill an empty bucket
+
+    def headers(self) -> List[Tuple[str, str]]:
+        """RateLimit-* response headers (IETF httpapi draft)"""
+        return [
+            ("RateLimit-Limit", str(self.limit)),
+            ("RateLimit-Remaining", str(max(0, math.floor(self.remaining)))),
+            ("RateLimit-Reset", str(math.ceil(self.reset))),
+            ("RateLimit-Policy", f"{self.limit};w={math.ceil(self.window)}"),
+        ]
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets; take() must be atomic per key"""
+
+    name = "custom"
+    blocking = True  # take() may wait on I/O, so async servers call it off the event loop
+
+    @abstractmethod
+    def take(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        """
+        Refill the bucket at `rate` tokens/second up to `burst`, then spend
+        `cost` tokens if that many are available
+
+        Returns:
+            (allowed, tokens left in the bucket)
+        """
+
+    def status(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process buckets
+
+    Args:
+        max_keys: Buckets kept; the least recently used are dropped beyond
+            this (a dropped client simply starts again with a full bucket)
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max(1, max_keys)
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            allowed = bucket[0] >= cost
+            if allowed:
+                bucket[0] -= cost
+            return allowed, bucket[0]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"clients": len(self._buckets)}
+
+
+# Refill and spend in one round trip. Time comes from the Redis server, so
+# workers with skewed clocks agree; idle buckets expire once full again.
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker and instance through Redis
+
+    Args:
+        url: Redis URL, e.g. redis://localhost:6379/0
+        prefix: Key prefix for bucket hashes
+        client: An existing redis.Redis client (url is then ignored)
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = "", prefix: str = "eve:ratelimit:", client: Any = None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package not installed")
+            import redis
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[rate, burst, cost])
+        return bool(int(allowed)), float(tokens)
+
+
+class RateLimiter:
+    """
+    Named token-bucket policies over one backend
+
+    Args:
+        policies: Policy name -> (requests per minute, burst)
+        backend: Bucket storage (default MemoryBackend)
+    """
+
+    def __init__(self, policies: Dict[str, Tuple[float, int]], backend: Optional[RateLimitBackend] = None):
+        self.policies = {name: (max(per_minute, 0.001) / 60.0, max(1, int(burst)))
+                         for name, (per_minute, burst) in policies.items()}
+        self.backend = backend or MemoryBackend()
+        self.allowed = 0
+        self.limited = 0
+        self.backend_errors = 0
+        self.config_errors: List[str] = []  # Settings ignored by rate_limiter_from_env
+        self._lock = threading.Lock()
+
+    def take(self, policy: str, client: str, cost: float = 1.0) -> Quota:
+        """
+        Charge `cost` tokens to the client's bucket for `policy`
+
+        A request costing more than the burst can never fit; it is refused
+        without touching the bucket, with an infinite retry_after. If the
+        backend fails, the request is allowed: an outage of the limiter
+        must not take the API down with it.
+        """
+        rate, burst = self.policies[policy]
+        cost = float(cost)
+        if cost > burst:
+            with self._lock:
+                self.limited += 1
+            return Quota(False, burst, 0.0, 0.0, math.inf, burst / rate)
+        try:
+            allowed, tokens = self.backend.take(f"{policy}:{client}", cost, rate, burst)
+        except Exception:
+            with self._lock:
+                self.backend_errors += 1
+            return Quota(True, burst, burst, 0.0, 0.0, burst / rate)
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.limited += 1
+        return Quota(
+            allowed, burst, tokens,
+            reset=(burst - tokens) / rate,
+            retry_after=0.0 if allowed else (cost - tokens) / rate,
+            window=burst / rate,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {"allowed": self.allowed, "limited": self.limited, "backend_errors": self.backend_errors}
+        return {
+            "backend": self.backend.name,
+            "policies": {name: {"per_minute": round(rate * 60, 3), "burst": burst}
+                         for name, (rate, burst) in self.policies.items()},
+            **counts,
+            **({"config_errors": list(self.config_errors)} if self.config_errors else {}),
+            **self.backend.status(),
+        }
+
+
+# (requests per minute, burst) per client; voice is lower because TTS is
+# billed per character and capped per account
+DEFAULT_POLICIES = {"chat": (60, 20), "voice": (30, 10)}
+
+
+def _env_number(name: str, default: float, parse: type, errors: List[str]) -> float:
+    """A positive number from the environment, or the default (noting why) if malformed"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = parse(raw)
+    except ValueError:
+        value = None
+    if value is None or not value > 0 or math.isinf(value):
+        errors.append(f"{name}={raw!r} is not a positive number; using {default}")
+        return default
+    return value
+
+
+def rate_limiter_from_env() -> Optional[RateLimiter]:
+    """
+    Build the limiter from the environment, or None when disabled
+
+    EVE_API_RATE_LIMIT=off disables it. EVE_API_RATE_<NAME>_PER_MIN and
+    EVE_API_RATE_<NAME>_BURST override DEFAULT_POLICIES. With
+    EVE_API_RATE_LIMIT_REDIS_URL set, buckets are kept in Redis.
+
+    This runs when eve_api is imported, so it never raises: a malformed
+    value falls back to its default, and a Redis backend that can't be
+    built falls back to MemoryBackend. Each such problem is printed to
+    stderr and listed under config_errors in the limiter's status.
+    """
+    if os.getenv("EVE_API_RATE_LIMIT", "on").strip().lower() in ("off", "false", "0", "no"):
+        return None
+    errors: List[str] = []
+    policies = {}
+    for name, (per_minute, burst) in DEFAULT_POLICIES.items():
+        prefix = f"EVE_API_RATE_{name.upper()}_"
+        policies[name] = (_env_number(prefix + "PER_MIN", per_minute, float, errors),
+                          _env_number(prefix + "BURST", burst, int, errors))
+    backend: RateLimitBackend = MemoryBackend()
+    redis_url = os.getenv("EVE_API_RATE_LIMIT_REDIS_URL", "")
+    if redis_url:
+        try:
+            backend = RedisBackend(redis_url)
+        except Exception as e:
+            errors.append(f"Redis rate-limit backend unavailable ({type(e).__name__}: {e}); "
+                          f"using in-memory buckets")
+    limiter = RateLimiter(policies, backend)
+    limiter.config_errors = errors
+    for error in errors:
+        print(f"EVE rate limiter: {error}", file=sys.stderr)
+    return limiter
@@ -0,0 +1,150 @@
+"""
+EVE Local Intent Router - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Classifies chat messages before they reach the remote model. Pure arithmetic,
+known ledger lookups and status queries are answered locally by EVEAgent's
+calculator and data methods; only open-ended prompts are routed to the LLM.
+"""
+
+import re
+from dataclasses import dataclass
+
+from eve_calc import SCALAR_FUNCTIONS
+
+# Route tags reported alongside every chat response
+ROUTE_CALCULATOR = "calculator"
+ROUTE_DATA = "data"
+ROUTE_STATUS = "status"
+ROUTE_FINANCE = "finance"
+ROUTE_LLM = "llm"
+
+# Conversational lead-ins stripped before classification ("what is 2 + 2?")
+_LEAD_IN = re.compile(
+    r"^(?:hey\s+|hi\s+)?(?:eve[\s,:]+)?"
+    r"(?:please\s+)?"
+    r"(?:what\s+is|what's|whats|calculate|calc|compute|evaluate|solve|how\s+much\s+is)?\s*",
+    re.IGNORECASE,
+)
+_TRAILER = re.compile(r"[\s=?!.]+$")
+
+# Arithmetic: digits, operators, brackets and the calculator's whitelisted functions
+_FUNCTION_NAMES = "|".join(sorted(SCALAR_FUNCTIONS, key=len, reverse=True))
+_ARITHMETIC = re.compile(
+    rf"^(?:[\d\s.,+\-*/()\[\]]|\b(?:{_FUNCTION_NAMES})\b)+$",
+    re.IGNORECASE,
+)
+_FUNCTION_CALL = re.compile(rf"\b(?:{_FUNCTION_NAMES})\s*\(", re.IGNORECASE)
+_HAS_OPERATION = re.compile(rf"[+\-*/]|{_FUNCTION_CALL.pattern}", re.IGNORECASE)
+# "1,000" -> "1000"; any other comma must separate function arguments
+_THOUSANDS = re.compile(r"(?<![\d.,])\d{1,3}(?:,\d{3})+(?![\d,])")
+# Operands side by side ("12 34", "2 (3)", "(1)(2)", "2 sqrt(4)"), checked
+# with function names replaced by "f"
+_FUNCTION_NAME = re.compile(rf"\b(?:{_FUNCTION_NAMES})\b", re.IGNORECASE)
+_MISSING_OPERATOR = re.compile(r"[\d.)\]]\s*[(\[f]|[)\]]\s*[\d.]|[\d.]\s+[\d.]")
+# ISO dates ("2024-10-15") are not subtractions
+_DATE = re.compile(r"\b\d{4}-\d{1,2}-\d{1,2}\b")
+
+# Price-series returns: "what's the 30-day return on PSI", "7 day return for BTC"
+_RETURN_QUERY = re.compile(
+    r"^(?:what\s+is\s+|what's\s+|whats\s+|show\s+|get\s+)?(?:me\s+)?(?:the\s+)?"
+    r"(?P<days>\d{1,4})[\s-]*(?:day|d)\s+return\s+(?:on|for|of)\s+(?P<symbol>[A-Za-z][\w.-]{0,15})$",
+    re.IGNORECASE,
+)
+
+# Ledger lookups: "show financial data", "cec wam ledger", "list tasks",
+# "high priority tasks", "physics data"
+_DATA_LEAD = (
+    r"^(?:show|get|display|fetch|list|give)?\s*(?:me\s+)?(?:the\s+|my\s+|all\s+)?"
+    r"(?:cec[\s_-]?wam\s+)?"
+)
+_DATA_QUERY = re.compile(
+    _DATA_LEAD
+    + r"(?P<kind>all|financial|finance|operational|operations|ledger|system|tasks|physics|dashboard|assets)\s*"
+    r"(?:data|ledger|summary|report|modules)?$",
+    re.IGNORECASE,
+)
+_TASK_PRIORITY_QUERY = re.compile(
+    _DATA_LEAD + r"(?P<priority>high|medium|low)[\s-]+priority\s+tasks$",
+    re.IGNORECASE,
+)
+_DATA_ALIASES = {
+    "finance": "financial",
+    "assets": "financial",
+    "operations": "operational",
+    "ledger": "all",
+    "system": "all",
+}
+
+# Status queries: "status", "eve status", "are you online?"
+_STATUS_QUERY = re.compile(
+    r"^(?:(?:what\s+is\s+|what's\s+)?(?:your\s+|the\s+|eve\s+|eve's\s+|system\s+)*status"
+    r"|are\s+you\s+(?:online|awake|active|up|ready)"
+    r"|health\s*check)$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A routing decision: which path serves the message and its argument"""
+
+    route: str
+    argument: str = ""
+    period: int = 0
+    key: str = ""
+
+    @property
+    def is_local(self) -> bool:
+        return self.route != ROUTE_LLM
+
+
+def _normalize(message: str) -> str:
+    """Collapse whitespace and strip trailing punctuation"""
+    return _TRAILER.sub("", " ".join(message.split()))
+
+
+def route_intent(message: str) -> Intent:
+    """
+    Classify a chat message for local fast-path handling
+
+    Args:
+        message: The user's raw chat message
+
+    Returns:
+        Intent naming the route (calculator, data, status, finance or llm)
+    """
+    text = _normalize(message)
+    if not text:
+        return Intent(ROUTE_LLM)
+
+    if _STATUS_QUERY.match(text):
+        return Intent(ROUTE_STATUS)
+
+    priority_match = _TASK_PRIORITY_QUERY.match(text)
+    if priority_match:
+        return Intent(ROUTE_DATA, "tasks", key=priority_match.group("priority").title())
+
+    data_match = _DATA_QUERY.match(text)
+    if data_match:
+        kind = data_match.group("kind").lower()
+        return Intent(ROUTE_DATA, _DATA_ALIASES.get(kind, kind))
+
+    return_match = _RETURN_QUERY.match(text)
+    if return_match:
+        return Intent(ROUTE_FINANCE, return_match.group("symbol").upper(), int(return_match.group("days")))
+
+    expression = _THOUSANDS.sub(lambda m: m.group().replace(",", ""),
+                                _normalize(_LEAD_IN.sub("", text, count=1)))
+    if (
+        expression
+        and any(ch.isdigit() for ch in expression)
+        and _ARITHMETIC.match(expression)
+        and _HAS_OPERATION.search(expression)
+        and ("," not in expression or _FUNCTION_CALL.search(expression))
+        and not _MISSING_OPERATOR.search(_FUNCTION_NAME.sub("f", expression))
+        and not _DATE.search(expression)
+    ):
+        return Intent(ROUTE_CALCULATOR, expression)
+
+    return Intent(ROUTE_LLM)
@@ -0,0 +1,105 @@
+"""
+EVE Status Snapshot - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+A precomputed value that is rebuilt in the background. Health probes and
+uptime monitors poll GET /api/chat far more often than its contents
+change; serving them a snapshot makes each probe a dictionary copy instead
+of a full get_status() call. Once the snapshot is older than its refresh
+interval, the next read returns it as-is and starts a single background
+rebuild (stale-while-revalidate), so readers never wait on the build and
+a slow build never piles up threads.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class StatusSnapshot:
+    """
+    A value rebuilt at most every `interval` seconds, off the reader's path
+
+    Args:
+        build: Produces the value; called on a background thread, except
+            by prime() and by a get() that finds no value yet
+        interval: Seconds before a snapshot is considered stale
+    """
+
+    def __init__(self, build: Callable[[], Any], interval: float = 5.0):
+        self.build = build
+        self.interval = max(0.0, interval)
+        self._value: Any = None
+        self._built_at: Optional[float] = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def prime(self):
+        """Build now on the calling thread (e.g. at server startup)"""
+        self._store(self.build())
+
+    def get(self) -> Tuple[Any, float]:
+        """
+        The current value and its age in seconds
+
+        Only the first call builds synchronously; later calls return at
+        once, scheduling a refresh when the value is stale.
+        """
+        if self._built_at is None:
+            with self._lock:
+                if self._built_at is None:
+                    self._set(self.build())
+        value, built_at = self._value, self._built_at
+        now = time.monotonic()
+        if now >= self._next_refresh:
+            self._schedule()
+        return value, now - built_at
+
+    def invalidate(self):
+        """Mark the value stale, so the next get() starts a refresh"""
+        self._next_refresh = 0.0
+
+    def _schedule(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="eve-status-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            value = self.build()
+        except Exception as e:
+            # Keep serving the last good value; retry after another interval
+            with self._lock:
+                self.errors += 1
+                self.last_error = str(e)
+                self._next_refresh = time.monotonic() + self.interval
+                self._refreshing = False
+            return
+        self._store(value)
+
+    def _store(self, value: Any):
+        with self._lock:
+            self._set(value)
+            self._refreshing = False
+
+    def _set(self, value: Any):
+        # Caller holds the lock
+        self._value, self._built_at = value, time.monotonic()
+        self._next_refresh = self._built_at + self.interval
+        self.refreshes += 1
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_s": self.interval,
+                "age_ms": round((time.monotonic() - self._built_at) * 1000, 1) if self._built_at is not None else None,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
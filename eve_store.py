@@ -0,0 +1,290 @@
+"""
+EVE Durable Store - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+SQLite (WAL mode) persistence for EVE's conversation history and activity
+log, so both survive Streamlit worker and serverless function recycling.
+Callers only enqueue rows; a background writer thread drains the queue and
+commits them in batches, keeping persistence off the chat() latency path.
+Reads are indexed by session and time. Failed writes are reported through
+an on_error callback (the agent's activity log) rather than raised.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session_ts ON messages (session_id, ts);
+
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_logs_ts ON logs (ts);
+CREATE INDEX IF NOT EXISTS idx_logs_level_ts ON logs (level, ts);
+"""
+
+_STOP = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class EVEStore:
+    """
+    Batched, background-written SQLite store for messages and logs
+
+    Args:
+        path: SQLite database file
+        batch_size: Most rows committed in one transaction
+        flush_interval: Seconds the writer waits to fill a batch
+        max_queue: Most rows waiting for the writer; further rows are
+            dropped (and counted in `dropped`) rather than queued
+        on_error: Called with a message when the store can't be opened or
+            a batch fails to commit; only the first failure is reported
+            until a commit succeeds again, so an on_error that logs back
+            into the store cannot loop
+
+    A store whose database can't be opened is disabled: writes are no-ops,
+    reads return nothing and flush() returns False at once.
+    """
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 0.25,
+                 max_queue: int = 10_000, on_error: Optional[Callable[[str], None]] = None):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+        self.write_errors = 0
+        self.dropped = 0
+        self.disabled = False
+        self._reported_dropped = 0
+        self._failing = False
+        self._closed = False
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._reader = _connect(path)
+            self._reader.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self._disable(f"Store unavailable at {path}: {e}")
+            return
+        self._writer = threading.Thread(target=self._write_loop, name="eve-store-writer", daemon=True)
+        self._writer.start()
+
+    # ── Writes (non-blocking; no-ops once closed or disabled) ───────────────
+
+    def record_message(self, session_id: str, role: str, content: str, ts: Optional[float] = None):
+        """Queue one conversation message for persistence"""
+        self._put(("message", (session_id, time.time() if ts is None else ts, role, content)))
+
+    def record_log(self, ts: float, level: str, message: str):
+        """Queue one activity log entry for persistence"""
+        self._put(("log", (ts, level, message)))
+
+    def clear_session(self, session_id: str):
+        """Queue deletion of a session's conversation history"""
+        self._put(("clear", session_id))
+
+    def _put(self, item: Any):
+        if self._closed or self.disabled:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1  # Reported by the writer, off the caller's path
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is committed"""
+        if self._closed:
+            return not self.disabled  # close() already committed everything
+        if self.disabled:
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit pending rows and stop the writer (safe to call twice)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None and self._writer.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=5)
+            except queue.Full:
+                pass
+            self._writer.join(timeout=5)
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+
+    def _disable(self, message: str):
+        """Stop accepting writes and release anyone waiting on a flush"""
+        self.disabled = True
+        self._report(message)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[0] == "flush":
+                item[1].set()
+
+    def _write_loop(self):
+        try:
+            connection = _connect(self.path)
+        except Exception as e:
+            self._disable(f"Store writer could not open {self.path}: {e}")
+            return
+        try:
+            while True:
+                try:
+                    if self._commit(connection, self._next_batch()):
+                        return
+                    if self.dropped > self._reported_dropped:
+                        self._report(f"Store queue full, {self.dropped - self._reported_dropped} item(s) dropped")
+                        self._reported_dropped = self.dropped
+                except Exception as e:
+                    # The writer must outlive any one batch, or the queue fills with no one draining it
+                    self._write_failed(e, "Store writer error")
+        finally:
+            connection.close()
+
+    def _next_batch(self) -> List[Any]:
+        """Wait for one item, then gather more until the batch fills or the interval lapses"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or batch[-1][0] == "flush":
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, connection: sqlite3.Connection, batch: List[Any]) -> bool:
+        """Write one batch in a single transaction; returns True on stop"""
+        messages, logs, waiters = [], [], []
+        stop = False
+        try:
+            with connection:
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                        continue
+                    kind, payload = item
+                    if kind == "message":
+                        messages.append(payload)
+                    elif kind == "log":
+                        logs.append(payload)
+                    elif kind == "flush":
+                        waiters.append(payload)
+                    elif kind == "clear":
+                        # Keep ordering: persist earlier messages before deleting
+                        connection.executemany(
+                            "INSERT INTO messages (session_id, ts, role, content) VALUES (?, ?, ?, ?)", messages)
+                        messages = []
+                        connection.execute("DELETE FROM messages WHERE session_id = ?", (payload,))
+                if messages:
+                    connection.executemany(
+                        "INSERT INTO messages (session_id, ts, role, content) VALUES (?, ?, ?, ?)", messages)
+                if logs:
+                    connection.executemany("INSERT INTO logs (ts, level, message) VALUES (?, ?, ?)", logs)
+        except Exception as e:
+            # Persistence is best-effort; the in-memory copies remain authoritative
+            self._write_failed(e, f"Store write failed, {len(batch)} queued item(s) dropped")
+            stop = stop or any(item is _STOP for item in batch)
+            waiters = [item[1] for item in batch if item is not _STOP and item[0] == "flush"]
+        else:
+            self._failing = False
+        for waiter in waiters:
+            waiter.set()
+        return stop
+
+    def _write_failed(self, error: Exception, message: str):
+        self.write_errors += 1
+        if not self._failing:
+            self._failing = True
+            self._report(f"{message}: {type(error).__name__}: {error}")
+
+    def _report(self, message: str):
+        if self.on_error is None:
+            return
+        try:
+            self.on_error(message)
+        except Exception:
+            pass  # A failing reporter must not stop the writer
+
+    # ── Reads (indexed) ─────────────────────────────────────────────────────
+
+    def recent_messages(self, session_id: str, limit: int = 100) -> List[Dict[str, str]]:
+        """A session's newest messages, oldest first"""
+        if self._reader is None:
+            return []
+        with self._reader_lock:
+            rows = self._reader.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY ts DESC, id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def logs_between(self, since: Optional[float] = None, until: Optional[float] = None,
+                     level: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Persisted log entries in a time range, oldest first"""
+        clauses, params = [], []
+        if level is not None:
+            clauses.append("level = ?")
+            params.append(level)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        if self._reader is None:
+            return []
+        with self._reader_lock:
+            rows = self._reader.execute(
+                f"SELECT ts, level, message FROM logs {where} ORDER BY ts DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [{"ts": ts, "level": lvl, "message": message} for ts, lvl, message in reversed(rows)]
+
+
+def store_from_env(on_error: Optional[Callable[[str], None]] = None) -> Optional[EVEStore]:
+    """Open the store at EVE_STORE_PATH (unset disables persistence)"""
+    path = os.getenv("EVE_STORE_PATH")
+    if not path:
+        return None
+    store = EVEStore(path, on_error=on_error)
+    atexit.register(store.close)
+    return store
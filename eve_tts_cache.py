@@ -0,0 +1,165 @@
+"""
+EVE TTS Audio Cache - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Content-addressed, size-capped disk cache for synthesized speech. Entries are
+keyed on voice_id, model_id and a hash of the text, written atomically and
+evicted least-recently-used first once the cache exceeds its byte budget.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+AUDIO_SUFFIX = ".mp3"
+
+
+def audio_cache_key(voice_id: str, model_id: str, text: str) -> str:
+    """Build the content address for a synthesized phrase"""
+    digest = hashlib.sha256()
+    for part in (voice_id, model_id, text.strip()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """
+    Disk-backed LRU cache for TTS audio
+
+    Recency is tracked in memory and mirrored to file mtimes, so the LRU
+    order survives process restarts. All operations are thread-safe.
+    """
+
+    # Longer clips are streamed through uncached to keep memory bounded
+    max_entry_bytes = 4 * 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> size in bytes, ordered from least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{AUDIO_SUFFIX}"
+
+    def _load_index(self):
+        """Scan the cache directory once, ordering entries by mtime"""
+        if self._loaded:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        found = []
+        for path in self.cache_dir.glob(f"*{AUDIO_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._loaded = True
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio and mark it most recently used, or None"""
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                audio = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def locate(self, key: str, count: bool = True) -> Optional[Path]:
+        """
+        Path of a cached entry, marked most recently used, or None
+
+        Lets callers stream (or serve byte ranges of) audio from disk
+        without reading it into memory. An evicted file stays readable
+        through handles opened before the eviction.
+        """
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            if key in self._entries:
+                try:
+                    os.utime(path)
+                except OSError:
+                    self._total_bytes -= self._entries.pop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return path
+            if count:
+                self.misses += 1
+            return None
+
+    def put(self, key: str, audio: bytes):
+        """Store audio atomically, then evict down to the byte budget"""
+        if not audio or len(audio) > min(self.max_bytes, self.max_entry_bytes):
+            return
+        with self._lock:
+            self._load_index()
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(audio)
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._total_bytes += len(audio) - self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Cache occupancy and hit counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def audio_cache_from_env() -> Optional[AudioCache]:
+    """Build the cache from EVE_TTS_CACHE_DIR / EVE_TTS_CACHE_MAX_MB (0 disables)"""
+    max_mb = float(os.getenv("EVE_TTS_CACHE_MAX_MB", "100"))
+    if max_mb <= 0:
+        return None
+    cache_dir = os.getenv("EVE_TTS_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "eve_tts_cache")
+    return AudioCache(cache_dir, int(max_mb * 1024 * 1024))
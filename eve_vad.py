@@ -0,0 +1,261 @@
+"""
+EVE Voice Activity Detection - CEC-WAM-HOT-CORE
+System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
+
+Streaming voice-activity detection and endpointing for EVE's voice input.
+16-bit PCM arrives in chunks of any size; each chunk's complete frames are
+classified together (frame energy against an adaptive noise floor, plus
+zero-crossing rate) and a small state machine cuts an utterance as soon as
+the speaker has been silent for `end_silence_ms`. Utterances go straight to
+speech recognition instead of waiting out a fixed-length recording.
+"""
+
+import importlib.util
+import io
+import time
+import wave
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# SpeechRecognition (and PyAudio for the microphone) are imported on use
+SPEECH_RECOGNITION_AVAILABLE = importlib.util.find_spec("speech_recognition") is not None
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit PCM
+MIN_SAMPLE_RATE = 8000   # WAV rates read_wav accepts
+MAX_SAMPLE_RATE = 96000
+MAX_CLIP_SECONDS = 120.0  # Longest recorded clip read_wav will load
+
+
+@dataclass
+class Utterance:
+    """One endpointed stretch of speech"""
+
+    pcm: bytes          # 16-bit little-endian mono PCM
+    sample_rate: int
+    start: float        # Seconds from the start of the stream
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def wav_bytes(self) -> bytes:
+        """The utterance as a WAV file"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(SAMPLE_WIDTH)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(self.pcm)
+        return buffer.getvalue()
+
+
+class Endpointer:
+    """
+    Incremental VAD + endpointing over a PCM stream
+
+    Args:
+        sample_rate: Input sample rate
+        frame_ms: Analysis frame length
+        threshold_db: How far above the noise floor a frame must be to count as speech
+        min_speech_ms: Speech needed to open an utterance (rejects clicks)
+        end_silence_ms: Trailing silence that closes an utterance
+        pre_roll_ms: Audio kept from before speech onset so first syllables survive
+        max_utterance_s: Hard cap; longer speech is cut into pieces
+        max_zcr: Quiet frames crossing zero more often than this are treated as hiss
+        floor_rise_db: How fast (dB per second) the noise floor may rise
+        min_floor_db: Lowest noise floor (dBFS), so near-silent hum isn't speech
+
+    Raises:
+        ValueError: If a frame would hold no samples (rate or frame_ms too low)
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = 20, threshold_db: float = 12.0,
+                 min_speech_ms: int = 100, end_silence_ms: int = 400, pre_roll_ms: int = 200,
+                 max_utterance_s: float = 15.0, max_zcr: float = 0.35, floor_rise_db: float = 3.0,
+                 min_floor_db: float = -60.0):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        if self.frame_samples < 1:
+            raise ValueError(f"A {frame_ms} ms frame at {sample_rate} Hz holds no samples")
+        self.threshold_db = threshold_db
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.max_frames = int(max_utterance_s * 1000 // frame_ms)
+        self.max_zcr = max_zcr
+        self.floor_rise_db = floor_rise_db
+        self.min_floor_db = min_floor_db
+
+        self.noise_floor_db: Optional[float] = None
+        self._remainder = b""
+        self._frame_index = 0
+        self._pre_roll: deque = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._speech_run = 0
+        self._silence_run = 0
+        self._frames: Optional[List[np.ndarray]] = None  # Frames of the open utterance
+        self._start_frame = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._frames is not None
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Vectorized speech/non-speech decision for a (n, frame_samples) int16 block
+
+        Also updates the noise floor: it drops immediately to quieter
+        frames and rises by at most floor_rise_db per second of audio.
+        """
+        samples = frames.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(samples * samples, axis=1) + 1e-10)
+        signs = np.signbit(samples)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        quiet = max(float(np.percentile(energy_db, 10)), self.min_floor_db)
+        if self.noise_floor_db is None:
+            self.noise_floor_db = quiet
+        else:
+            rise = self.floor_rise_db * len(frames) * self.frame_ms / 1000.0
+            self.noise_floor_db = min(quiet, self.noise_floor_db + rise)
+
+        above = energy_db - self.noise_floor_db
+        # Loud frames are speech; moderately loud ones only if they aren't hiss
+        return (above > 2 * self.threshold_db) | ((above > self.threshold_db) & (zcr < self.max_zcr))
+
+    def feed(self, pcm: bytes) -> List[Utterance]:
+        """Consume a chunk of 16-bit mono PCM; returns utterances completed by it"""
+        data = self._remainder + pcm
+        frame_bytes = self.frame_samples * SAMPLE_WIDTH
+        usable = len(data) - len(data) % frame_bytes
+        self._remainder = data[usable:]
+        if not usable:
+            return []
+
+        frames = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, self.frame_samples)
+        completed = []
+        for frame, is_speech in zip(frames, self.classify(frames)):
+            utterance = self._step(frame, bool(is_speech))
+            if utterance is not None:
+                completed.append(utterance)
+        return completed
+
+    def _step(self, frame: np.ndarray, is_speech: bool) -> Optional[Utterance]:
+        index = self._frame_index
+        self._frame_index += 1
+
+        if self._frames is None:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if is_speech else 0
+            if self._speech_run >= self.min_speech_frames:
+                self._frames = list(self._pre_roll)
+                self._start_frame = index + 1 - len(self._frames)
+                self._pre_roll.clear()
+                self._silence_run = 0
+            return None
+
+        self._frames.append(frame)
+        self._silence_run = 0 if is_speech else self._silence_run + 1
+        if self._silence_run >= self.end_silence_frames or len(self._frames) >= self.max_frames:
+            return self._close()
+        return None
+
+    def _close(self) -> Utterance:
+        # Keep a short tail of the closing silence; drop the rest
+        tail = max(0, self._silence_run - self.end_silence_frames // 2)
+        frames = self._frames[:len(self._frames) - tail] if tail else self._frames
+        start = self._start_frame * self.frame_ms / 1000.0
+        utterance = Utterance(
+            pcm=np.concatenate(frames).astype("<i2").tobytes(),
+            sample_rate=self.sample_rate,
+            start=start,
+            end=start + len(frames) * self.frame_ms / 1000.0,
+        )
+        self._frames = None
+        self._speech_run = 0
+        self._silence_run = 0
+        return utterance
+
+    def flush(self) -> Optional[Utterance]:
+        """End of stream: close any open utterance"""
+        self._remainder = b""
+        if self._frames is None:
+            return None
+        return self._close()
+
+
+def read_wav(audio: bytes) -> Tuple[bytes, int]:
+    """
+    (16-bit mono PCM, sample rate) from WAV bytes, downmixing if needed
+
+    Raises:
+        ValueError: For invalid or non-16-bit WAV data, rates outside
+            MIN_SAMPLE_RATE..MAX_SAMPLE_RATE, or clips longer than
+            MAX_CLIP_SECONDS (checked from the header, before reading)
+    """
+    try:
+        with wave.open(io.BytesIO(audio)) as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError("Only 16-bit WAV audio is supported")
+            channels = wav.getnchannels()
+            sample_rate = wav.getframerate()
+            if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+                raise ValueError(f"Unsupported sample rate: {sample_rate} Hz "
+                                 f"(expected {MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE} Hz)")
+            if wav.getnframes() > MAX_CLIP_SECONDS * sample_rate:
+                raise ValueError(f"Audio clip is longer than {MAX_CLIP_SECONDS:g} seconds")
+            pcm = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Invalid WAV data: {e}") from None
+    if channels > 1:
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % (2 * channels)], dtype="<i2")
+        pcm = samples.reshape(-1, channels).mean(axis=1).astype("<i2").tobytes()
+    return pcm, sample_rate
+
+
+def endpoint_stream(chunks: Iterable[bytes], **options) -> Iterator[Utterance]:
+    """Yield utterances from a stream of PCM chunks as soon as each one ends"""
+    endpointer = Endpointer(**options)
+    for chunk in chunks:
+        yield from endpointer.feed(chunk)
+    final = endpointer.flush()
+    if final is not None:
+        yield final
+
+
+def microphone_chunks(sample_rate: int = SAMPLE_RATE, chunk_ms: int = 20,
+                      device_index: Optional[int] = None, max_seconds: float = 60.0) -> Iterator[bytes]:
+    """
+    Stream 16-bit mono PCM from the local microphone (SpeechRecognition + PyAudio)
+
+    Stops after max_seconds, or when the consumer closes the generator,
+    e.g. after the first utterance.
+    """
+    import speech_recognition as sr
+
+    chunk_size = sample_rate * chunk_ms // 1000
+    deadline = time.monotonic() + max_seconds
+    with sr.Microphone(device_index=device_index, sample_rate=sample_rate, chunk_size=chunk_size) as source:
+        while time.monotonic() < deadline:
+            yield source.stream.read(chunk_size)
+
+
+def recognize(utterance: Utterance, recognizer=None, language: str = "en-US") -> Optional[str]:
+    """
+    Transcribe one utterance with SpeechRecognition's Google Web Speech backend
+
+    Returns:
+        The transcript, or None if nothing intelligible was heard
+    """
+    import speech_recognition as sr
+
+    recognizer = recognizer or sr.Recognizer()
+    audio = sr.AudioData(utterance.pcm, utterance.sample_rate, SAMPLE_WIDTH)
+    try:
+        return recognizer.recognize_google(audio, language=language)
+    except sr.UnknownValueError:
+        return None
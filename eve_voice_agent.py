@@ -2,16 +2,31 @@
 EVE Voice AI Assistant - CEC-WAM-HOT-CORE
 System Code: CEC_WAM_HEI_EVE_7A2F-9C4B
 
-AI assistant with voice capabilities powered by ElevenLabs and OpenAI.
+AI assistant with voice capabilities powered by ElevenLabs and OpenAI-compatible
+LLM providers (via eve_gateway).
 Designed for always-on operation, voice recognition, and learning capabilities.
 """
 
 import os
 import json
+import time
+import threading
+import importlib.util
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from collections import deque
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from eve_router import route_intent, ROUTE_CALCULATOR, ROUTE_DATA, ROUTE_FINANCE, ROUTE_LLM
+from eve_tts_cache import audio_cache_from_env, audio_cache_key
+from eve_pipeline import split_sentences, pipeline_synthesis
+from eve_calc import compile_expression, evaluate, evaluate_batch, NUMPY_AVAILABLE
+from eve_ledger import ledger_from_env
+from eve_logs import LogRing, jsonl_sink_from_env
+from eve_store import store_from_env
+from eve_gateway import GatewayError, gateway_from_env
+from eve_metrics import AgentMetrics, hit_rate
 
 # Load environment variables from .env file
 try:
@@ -27,18 +42,20 @@ try:
 except ImportError:
     pass  # dotenv not available, will use system environment variables
 
-# Try to import optional dependencies
-try:
-    from elevenlabs import ElevenLabs
-    ELEVENLABS_AVAILABLE = True
-except ImportError:
-    ELEVENLABS_AVAILABLE = False
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+def _module_available(name: str) -> bool:
+    """Check an optional dependency is installed without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ValueError:
+        # Already in sys.modules without a spec (e.g. a stub injected by CI)
+        return True
+
+
+# Optional SDKs are only imported when their client is first needed, so
+# serverless cold starts and status requests don't pay their import cost
+ELEVENLABS_AVAILABLE = _module_available("elevenlabs")
+SPEECH_RECOGNITION_AVAILABLE = _module_available("speech_recognition")
 
 
 class EVEAgent:
@@ -47,7 +64,7 @@ class EVEAgent:
     
     Features:
     - Voice synthesis via ElevenLabs
-    - AI conversation via OpenAI
+    - AI conversation via OpenAI/Groq with latency-aware failover
     - Learning from interactions
     - CEC WAM system integration
     - Math and financial calculations
@@ -67,20 +84,44 @@ class EVEAgent:
         # ElevenLabs configuration
         self.elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
         self.voice_id = os.getenv('ELEVENLABS_VOICE_ID', '21m00Tcm4TlvDq8ikWAM')
+        self.voice_model_id = os.getenv('ELEVENLABS_MODEL_ID', 'eleven_monolingual_v1')
+        # Override to point at a local stub server (benchmarks/stub_servers.py)
+        self.elevenlabs_base_url = os.getenv('ELEVENLABS_BASE_URL') or None
+        
+        # Disk cache for synthesized phrases (greetings, status announcements)
+        self.audio_cache = audio_cache_from_env()
         
-        # OpenAI configuration
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-4')
+        # Indexed view of the data/ ledger files, refreshed when they change
+        self.ledger = ledger_from_env()
+        
+        # Price series (oldest first) by symbol, for local return calculations
+        self.price_series: Dict[str, Any] = {}
         
         # Use bounded deques to prevent unbounded memory growth
         # Each exchange is 2 messages (user + assistant), so maxlen=100 stores 50 exchanges
         self.conversation_history: deque = deque(maxlen=100)
-        # Keep last 1000 log entries with bounded deque
-        self.logs: deque = deque(maxlen=1000)
+        # Owner voiceprint (eve_biometric), loaded on first verification
+        self._voiceprint = None
+        
+        # Latency histograms, token usage and error counts (see get_performance)
+        self.metrics = AgentMetrics()
+        # Keep last 1000 log entries in a ring buffer (optionally mirrored to EVE_LOG_FILE)
+        self.logs = LogRing(capacity=1000, sink=jsonl_sink_from_env(self.system_code))
+        
+        # Optional SQLite persistence (EVE_STORE_PATH); history is rehydrated lazily
+        self.session_id = os.getenv('EVE_SESSION_ID', 'default')
+        try:
+            self.store = store_from_env(on_error=lambda message: self._log(message, level="error"))
+        except Exception as e:
+            self.store = None
+            self._log(f"Persistent store unavailable: {e}", level="error")
+        if self.store is not None and self.store.disabled:
+            self.store = None  # Could not be opened (already logged through on_error)
+        self._history_loaded = self.store is None
         
         # Initialize APIs
         self._init_elevenlabs()
-        self._init_openai()
+        self._init_llm()
         
         # Cache the system prompt to avoid rebuilding on every chat call
         self._cached_system_prompt = None
@@ -107,45 +148,69 @@ class EVEAgent:
         ]
         
     def _init_elevenlabs(self):
-        """Initialize ElevenLabs API"""
+        """Resolve ElevenLabs readiness; the client itself is built on first use"""
+        self._elevenlabs_client = None
         if ELEVENLABS_AVAILABLE and self.elevenlabs_api_key:
-            try:
-                self._elevenlabs_client = ElevenLabs(api_key=self.elevenlabs_api_key)
-                self.elevenlabs_ready = True
-                self._log("ElevenLabs initialized successfully")
-            except Exception as e:
-                self._elevenlabs_client = None
-                self.elevenlabs_ready = False
-                self._log(f"ElevenLabs initialization failed: {e}", level="error")
+            self.elevenlabs_ready = True
+            self._log("ElevenLabs configured (client created on first use)")
         else:
-            self._elevenlabs_client = None
             self.elevenlabs_ready = False
             self._log("ElevenLabs not available (missing API key or library)", level="warning")
     
-    def _init_openai(self):
-        """Initialize OpenAI API"""
-        if OPENAI_AVAILABLE and self.openai_api_key:
+    def _init_llm(self):
+        """Set up the provider gateway (OpenAI, Groq, ... per EVE_LLM_PROVIDERS)"""
+        self.llm = gateway_from_env()
+        self.openai_ready = bool(self.llm)
+        if self.openai_ready:
+            names = ", ".join(p.name for p in self.llm.providers)
+            self._log(f"LLM gateway configured: {names} (clients created on first use)")
+        else:
+            self._log("No LLM provider available (missing API key or library)", level="warning")
+    
+    @property
+    def elevenlabs_client(self):
+        """ElevenLabs client, imported and constructed on first access"""
+        if self._elevenlabs_client is None and self.elevenlabs_ready:
             try:
-                self.openai_client = OpenAI(api_key=self.openai_api_key)
-                self.openai_ready = True
-                self._log("OpenAI initialized successfully")
+                from elevenlabs import ElevenLabs
+                self._elevenlabs_client = ElevenLabs(api_key=self.elevenlabs_api_key, base_url=self.elevenlabs_base_url)
+                self._log("ElevenLabs initialized successfully")
             except Exception as e:
-                self.openai_ready = False
-                self._log(f"OpenAI initialization failed: {e}", level="error")
-        else:
-            self.openai_ready = False
-            self._log("OpenAI not available (missing API key or library)", level="warning")
+                self.elevenlabs_ready = False
+                self._log(f"ElevenLabs initialization failed: {e}", level="error")
+        return self._elevenlabs_client
+    
+    @elevenlabs_client.setter
+    def elevenlabs_client(self, client):
+        self._elevenlabs_client = client
     
     def _log(self, message: str, level: str = "info"):
-        """Log EVE activity with bounded deque (auto-trims old entries)"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "level": level,
-            "message": message,
-            "system_code": self.system_code
-        }
-        self.logs.append(log_entry)
-        # No manual trimming needed - deque handles it automatically
+        """Log EVE activity to the ring buffer (auto-overwrites old entries)"""
+        record = self.logs.append(message, level)
+        if getattr(self, "store", None) is not None:
+            self.store.record_log(record.timestamp, record.level, record.message)
+    
+    def _ensure_history(self):
+        """Rehydrate this session's recent history from the store on first use"""
+        if self._history_loaded:
+            return
+        self._history_loaded = True
+        try:
+            restored = self.store.recent_messages(self.session_id, limit=self.conversation_history.maxlen)
+        except Exception as e:
+            self._log(f"History rehydration failed: {e}", level="error")
+            return
+        # Older turns first, so anything said since startup stays newest
+        current = list(self.conversation_history)
+        self.conversation_history.clear()
+        self.conversation_history.extend(restored + current)
+        self._log(f"Restored {len(restored)} messages for session {self.session_id}")
+    
+    def _remember(self, role: str, content: str):
+        """Append a message to history and queue it for persistence"""
+        self.conversation_history.append({"role": role, "content": content})
+        if self.store is not None:
+            self.store.record_message(self.session_id, role, content)
     
     def get_system_prompt(self) -> str:
         """Generate EVE's system prompt with personality and capabilities (cached)"""
@@ -197,48 +262,261 @@ Respond naturally and conversationally while being precise and helpful."""
         Returns:
             EVE's response text
         """
-        if not self.openai_ready:
-            return "I apologize, but my AI capabilities are not currently available. Please configure the OpenAI API key."
+        return self.chat_with_route(user_message, include_history=include_history)["response"]
+    
+    def chat_with_route(self, user_message: str, include_history: bool = True,
+                        record: bool = True) -> Dict[str, Any]:
+        """
+        Process user message and report which path served it
         
-        try:
-            # Build messages for OpenAI
-            messages = [
-                {"role": "system", "content": self.get_system_prompt()}
-            ]
+        Arithmetic, ledger lookups and status queries are answered locally
+        through calculate() and get_cec_wam_data(); everything else goes to
+        the remote model.
+        
+        Args:
+            user_message: The user's input message
+            include_history: Whether to include conversation history
+            record: Whether to add the exchange to conversation history and
+                the store (False for one-off prompts such as batch items)
             
-            # Add conversation history if requested (last 10 exchanges = 20 messages)
-            if include_history and self.conversation_history:
-                # Convert deque to list and slice - more efficient than multiple conversions
-                history_list = list(self.conversation_history)
-                messages.extend(history_list[-20:])  # Last 10 exchanges
+        Returns:
+            Dictionary with "response" text, "route" tag
+            (calculator, data, status or llm) and "failed" flag
+        """
+        with self.metrics.timer("chat") as outcome:
+            if include_history or record:
+                self._ensure_history()
+            local_response = self._answer_locally(user_message, record)
+            if local_response is not None:
+                return {**local_response, "failed": False}
             
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            self.metrics.increment("route.llm")
+            response_text, outcome["error"] = self._chat_llm(user_message, include_history, record)
+            return {"response": response_text, "route": ROUTE_LLM, "failed": outcome["error"]}
+    
+    def chat_batch(self, messages: List[str], concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Answer many independent messages concurrently
+        
+        Identical prompts (ignoring surrounding whitespace) are answered once
+        and shared. At most `concurrency` answers are generated at a time.
+        Items are independent of the conversation: their prompts carry no
+        history, and they are not added to the history or the store.
+        
+        Args:
+            messages: The user messages, e.g. one per task to summarize
+            concurrency: Maximum simultaneous chat calls
             
-            # Get response from OpenAI
-            response = self.openai_client.chat.completions.create(
-                model=self.openai_model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000
+        Returns:
+            One result per message, in input order: index, message,
+            response, route, success, error (when failed), latency_ms and
+            duplicate_of (index of the first identical prompt, or None)
+        """
+        first_index: Dict[str, int] = {}
+        for index, message in enumerate(messages):
+            first_index.setdefault(message.strip(), index)
+        
+        def answer(message: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                result = self.chat_with_route(message, include_history=False, record=False)
+                outcome = {"response": result["response"], "route": result["route"],
+                           "success": not result["failed"]}
+                if result["failed"]:
+                    outcome["error"] = result["response"]
+            except Exception as e:
+                outcome = {"response": None, "route": None, "success": False, "error": str(e)}
+            outcome["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return outcome
+        
+        workers = max(1, min(concurrency, len(first_index)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eve-batch") as pool:
+            futures = {key: pool.submit(answer, messages[index]) for key, index in first_index.items()}
+        
+        results = []
+        for index, message in enumerate(messages):
+            first = first_index[message.strip()]
+            results.append({"index": index, "message": message, **futures[message.strip()].result(),
+                            "duplicate_of": first if first != index else None})
+        self.metrics.increment("chat.batch")
+        self._log(f"Chat batch: {len(messages)} messages, {len(first_index)} unique")
+        return results
+    
+    def _answer_locally(self, user_message: str, record: bool = True) -> Optional[Dict[str, str]]:
+        """Serve the message through the local fast path, or None for the LLM"""
+        intent = route_intent(user_message)
+        if not intent.is_local:
+            return None
+        
+        if intent.route == ROUTE_CALCULATOR:
+            result = self.calculate(intent.argument)
+            if result.startswith("Error calculating"):
+                return None  # Let the model interpret expressions we cannot evaluate
+            response_text = f"{intent.argument} = {result}"
+        elif intent.route == ROUTE_FINANCE:
+            prices = self.price_series.get(intent.argument)
+            if prices is None or len(prices) <= intent.period:
+                return None  # No local series long enough; let the model answer
+            from eve_finance import period_return
+            change = period_return(prices, intent.period)
+            response_text = f"{intent.period}-day return on {intent.argument}: {change:+.2%}"
+        elif intent.route == ROUTE_DATA:
+            data = self.get_cec_wam_data(intent.argument, intent.key or None)
+            response_text = "\n".join(f"{key}: {value}" for key, value in data.items())
+        else:
+            status = self.get_status()
+            response_text = (
+                f"EVE is {status['status']} for {status['owner']}. "
+                f"Voice: {'ready' if status['elevenlabs_ready'] else 'unavailable'}, "
+                f"AI chat: {'ready' if status['openai_ready'] else 'unavailable'}, "
+                f"conversations: {status['conversation_count']}."
             )
+        
+        if record:
+            self._remember("user", user_message)
+            self._remember("assistant", response_text)
+        self._log(f"Chat ({intent.route} fast path) - User: {user_message[:50]}")
+        self.metrics.increment(f"route.{intent.route}")
+        return {"response": response_text, "route": intent.route}
+    
+    def _chat_llm(self, user_message: str, include_history: bool, record: bool = True) -> Tuple[str, bool]:
+        """Send the message to the remote model; returns (response, failed)"""
+        if not self.openai_ready:
+            return "I apologize, but my AI capabilities are not currently available. Please configure an LLM provider API key (OPENAI_API_KEY or GROQ_API_KEY).", True
+        
+        messages = self._build_messages(user_message, include_history)
+        try:
+            # The gateway picks the fastest healthy provider and fails over
+            with self.metrics.timer("llm"):
+                result = self.llm.complete(messages, temperature=0.7, max_tokens=1000)
+        except GatewayError as e:
+            self._log(f"Chat error: {e}", level="error")
+            return f"I encountered an error processing your request: {str(e)}", True
+        
+        self.metrics.add_usage(result.usage)
+        if record:
+            self._record_exchange(user_message, result.content)
+        return result.content, False
+    
+    def chat_stream(self, user_message: str, include_history: bool = True,
+                    cancel: Optional[threading.Event] = None,
+                    info: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Process user message, yielding response text as the model produces it
+        
+        Local fast-path answers are yielded in one piece. The exchange is
+        added to conversation history once the stream completes.
+        
+        Args:
+            user_message: The user's input message
+            include_history: Whether to include conversation history
+            cancel: Set it (from any thread) to stop the model mid-answer;
+                a cancelled exchange is not added to history
+            info: Filled in with route, provider, model, usage,
+                first_token_ms, latency_ms, error and cancelled
             
-            assistant_message = response.choices[0].message.content
-            
-            # Update conversation history (deque auto-trims when exceeding maxlen)
-            self.conversation_history.append({"role": "user", "content": user_message})
-            self.conversation_history.append({"role": "assistant", "content": assistant_message})
-            
-            # Log the interaction with truncation only for logging
-            user_preview = user_message[:50] + "..." if len(user_message) > 50 else user_message
-            eve_preview = assistant_message[:50] + "..." if len(assistant_message) > 50 else assistant_message
-            self._log(f"Chat - User: {user_preview} | EVE: {eve_preview}")
-            
-            return assistant_message
+        Yields:
+            Response text deltas
+        """
+        info = info if info is not None else {}
+        info.update(route=ROUTE_LLM, provider=None, model=None, usage=None,
+                    first_token_ms=None, latency_ms=None, error=False, cancelled=False)
+        self._ensure_history()
+        local_response = self._answer_locally(user_message)
+        if local_response is not None:
+            info["route"] = local_response["route"]
+            yield local_response["response"]
+            return
+        
+        self.metrics.increment("route.llm")
+        if not self.openai_ready:
+            info["error"] = True
+            yield "I apologize, but my AI capabilities are not currently available. Please configure an LLM provider API key (OPENAI_API_KEY or GROQ_API_KEY)."
+            return
+        
+        parts = []
+        started = time.perf_counter()
+        stream = self.llm.stream(
+            self._build_messages(user_message, include_history),
+            cancel=cancel,
+            temperature=0.7,
+            max_tokens=1000,
+            stream_options={"include_usage": True}
+        )
+        try:
+            for delta in stream:
+                if not parts:
+                    info["first_token_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    self.metrics.record("llm_first_token", time.perf_counter() - started)
+                parts.append(delta)
+                yield delta
+        except GatewayError as e:
+            if not parts:
+                self.metrics.record("llm_first_token", time.perf_counter() - started, error=True)
+            self._log(f"Chat stream error: {e}", level="error")
+            info["error"] = True
+            yield f"I encountered an error processing your request: {str(e)}"
+            return
+        finally:
+            info.update(provider=stream.provider, model=stream.model, usage=stream.usage,
+                        latency_ms=round((time.perf_counter() - started) * 1000, 1))
+        
+        self.metrics.add_usage(stream.usage)
+        if stream.cancelled:
+            info["cancelled"] = True
+            self.metrics.increment("chat.cancelled")
+            self._log(f"Chat stream cancelled after {len(parts)} deltas - User: {user_message[:50]}")
+            return
+        self._record_exchange(user_message, "".join(parts))
+    
+    def _build_messages(self, user_message: str, include_history: bool) -> List[Dict[str, str]]:
+        """Assemble system prompt, recent history and the new user message"""
+        messages = [
+            {"role": "system", "content": self.get_system_prompt()}
+        ]
+        
+        # Add conversation history if requested (last 10 exchanges = 20 messages)
+        if include_history and self.conversation_history:
+            # Convert deque to list and slice - more efficient than multiple conversions
+            history_list = list(self.conversation_history)
+            messages.extend(history_list[-20:])  # Last 10 exchanges
+        
+        # Add current user message
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _record_exchange(self, user_message: str, assistant_message: str):
+        """Append a completed exchange to history and the activity log"""
+        # Update conversation history (deque auto-trims when exceeding maxlen)
+        self._remember("user", user_message)
+        self._remember("assistant", assistant_message)
+        
+        # Log the interaction with truncation only for logging
+        user_preview = user_message[:50] + "..." if len(user_message) > 50 else user_message
+        eve_preview = assistant_message[:50] + "..." if len(assistant_message) > 50 else assistant_message
+        self._log(f"Chat - User: {user_preview} | EVE: {eve_preview}")
+    
+    def speak_reply(self, user_message: str, include_history: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a message with voice, overlapping generation and synthesis
+        
+        The streamed reply is split at sentence boundaries and each sentence
+        is queued for synthesis while the model is still generating, so the
+        first audio segment is ready after roughly one sentence.
+        
+        Args:
+            user_message: The user's input message
+            include_history: Whether to include conversation history
             
-        except Exception as e:
-            self._log(f"Chat error: {e}", level="error")
-            return f"I encountered an error processing your request: {str(e)}"
+        Yields:
+            Segments in reply order: {"index", "text", "audio"} where audio
+            is MP3 bytes or None if synthesis failed
+        """
+        # Closing this generator early cancels the model stream as well
+        cancel = threading.Event()
+        sentences = split_sentences(self.chat_stream(user_message, include_history=include_history, cancel=cancel))
+        for index, (sentence, audio) in enumerate(pipeline_synthesis(sentences, self.speak, cancel=cancel)):
+            yield {"index": index, "text": sentence, "audio": audio}
     
     def speak(self, text: str) -> Optional[bytes]:
         """
@@ -250,19 +528,74 @@ Respond naturally and conversationally while being precise and helpful."""
         Returns:
             Audio bytes if successful, None otherwise
         """
-        if not self.elevenlabs_ready:
+        with self.metrics.timer("speak") as outcome:
+            cached_audio = self._cached_audio(text)
+            if cached_audio is not None:
+                return cached_audio
+            
+            audio = self._synthesize(text)
+            outcome["error"] = audio is None
+            return audio
+    
+    def speak_cached(self, text: str) -> Union[Path, bytes, None]:
+        """
+        Convert text to speech, preferring a file in the TTS audio cache
+        
+        Lets the voice API send audio, or byte ranges of it, straight from
+        disk. Clips that cannot be cached (cache disabled, or longer than
+        its per-entry limit) are returned as bytes.
+        
+        Args:
+            text: The text to convert to speech
+            
+        Returns:
+            Path of the cached MP3, audio bytes, or None if synthesis failed
+        """
+        if self.audio_cache is None:
+            return self.speak(text)
+        
+        cache_key = self.speech_etag(text)
+        with self.metrics.timer("speak") as outcome:
+            path = self.audio_cache.locate(cache_key)
+            if path is not None:
+                self._log(f"Speech served from cache: {text[:50]}...")
+                return path
+            
+            audio = self._synthesize(text)
+            outcome["error"] = audio is None
+            if audio is None:
+                return None
+            return self.audio_cache.locate(cache_key, count=False) or audio
+    
+    def cached_speech(self, text: str) -> Optional[Path]:
+        """
+        Path of the cached MP3 for text, without synthesizing on a miss
+        
+        Used to answer HEAD requests; lookups are not counted as cache hits
+        or misses.
+        
+        Args:
+            text: The text whose speech to look up
+            
+        Returns:
+            Path of the cached MP3, or None if it is not cached
+        """
+        if self.audio_cache is None:
+            return None
+        return self.audio_cache.locate(self.speech_etag(text), count=False)
+    
+    def speech_etag(self, text: str) -> str:
+        """Content address of the speech for text in the current voice (the TTS cache key)"""
+        return audio_cache_key(self.voice_id, self.voice_model_id, text)
+    
+    def _synthesize(self, text: str) -> Optional[bytes]:
+        """Synthesize a whole clip with ElevenLabs (and cache it); None on failure"""
+        if not self.elevenlabs_ready or self.elevenlabs_client is None:
             self._log("Speech synthesis not available", level="warning")
             return None
         
         try:
-            # Generate speech using ElevenLabs v2.x SDK
-            audio_stream = self._elevenlabs_client.text_to_speech.convert(
-                voice_id=self.voice_id,
-                text=text,
-                model_id="eleven_monolingual_v1"
-            )
-            audio = b"".join(audio_stream)
-            
+            audio = b"".join(self._synthesize_chunks(text))
             self._log(f"Speech generated: {text[:50]}...")
             return audio
             
@@ -270,9 +603,95 @@ Respond naturally and conversationally while being precise and helpful."""
             self._log(f"Speech generation error: {e}", level="error")
             return None
     
+    def speak_stream(self, text: str) -> Iterator[bytes]:
+        """
+        Convert text to speech, yielding audio chunks as they arrive
+        
+        Playback can start on the first chunk and memory stays constant
+        regardless of text length. Cached phrases are yielded in one chunk.
+        Errors are logged and end the stream early.
+        
+        Args:
+            text: The text to convert to speech
+            
+        Yields:
+            MP3 audio chunks
+        """
+        cached_audio = self._cached_audio(text)
+        if cached_audio is not None:
+            yield cached_audio
+            return
+        
+        if not self.elevenlabs_ready or self.elevenlabs_client is None:
+            self._log("Speech synthesis not available", level="warning")
+            return
+        
+        try:
+            yield from self._synthesize_chunks(text)
+            self._log(f"Speech streamed: {text[:50]}...")
+        except Exception as e:
+            self._log(f"Speech streaming error: {e}", level="error")
+    
+    def _cached_audio(self, text: str) -> Optional[bytes]:
+        """Look up previously synthesized audio for this voice and text"""
+        if self.audio_cache is None:
+            return None
+        cache_key = audio_cache_key(self.voice_id, self.voice_model_id, text)
+        try:
+            cached_audio = self.audio_cache.get(cache_key)
+        except OSError as e:
+            self._log(f"Speech cache read error: {e}", level="warning")
+            return None
+        if cached_audio is not None:
+            self._log(f"Speech served from cache: {text[:50]}...")
+        return cached_audio
+    
+    def _synthesize_chunks(self, text: str) -> Iterator[bytes]:
+        """Stream audio from ElevenLabs, caching it once the stream completes"""
+        tts = self.elevenlabs_client.text_to_speech
+        # The v2.x SDK's stream() hits the low-latency streaming endpoint
+        synthesize = getattr(tts, "stream", None) or tts.convert
+        started = time.perf_counter()
+        first_chunk = True
+        audio_stream = synthesize(
+            voice_id=self.voice_id,
+            text=text,
+            model_id=self.voice_model_id
+        )
+        
+        # Buffer a copy for the cache only while the clip is small enough to keep
+        chunks = [] if self.audio_cache is not None else None
+        buffered = 0
+        for chunk in audio_stream:
+            if not chunk:
+                continue
+            if first_chunk:
+                first_chunk = False
+                self.metrics.record("tts_first_chunk", time.perf_counter() - started)
+            if chunks is not None:
+                buffered += len(chunk)
+                if buffered > self.audio_cache.max_entry_bytes:
+                    chunks = None
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        
+        if chunks:
+            self._store_audio(audio_cache_key(self.voice_id, self.voice_model_id, text), b"".join(chunks))
+    
+    def _store_audio(self, cache_key: str, audio: bytes):
+        """Write synthesized audio to the disk cache; failures only log"""
+        if self.audio_cache is None:
+            return
+        try:
+            self.audio_cache.put(cache_key, audio)
+        except OSError as e:
+            self._log(f"Speech cache write error: {e}", level="warning")
+    
     def calculate(self, expression: str) -> str:
         """
-        Perform mathematical calculations using safer ast-based evaluation
+        Perform mathematical calculations using the compiled, cached
+        expression engine (see eve_calc)
         
         Args:
             expression: Math expression to evaluate
@@ -280,111 +699,213 @@ Respond naturally and conversationally while being precise and helpful."""
         Returns:
             Calculation result as string
         """
-        try:
-            import ast
-            import operator
-            
-            # Safer evaluation using AST with allowed operations
-            allowed_operators = {
-                ast.Add: operator.add,
-                ast.Sub: operator.sub,
-                ast.Mult: operator.mul,
-                ast.Div: operator.truediv,
-                ast.Pow: operator.pow,
-                ast.USub: operator.neg,
-                ast.UAdd: operator.pos,
-            }
-            
-            allowed_functions = {
-                'abs': abs,
-                'round': round,
-                'min': min,
-                'max': max,
-                'sum': sum,
-                'pow': pow,
-            }
-            
-            def eval_node(node):
-                """Recursively evaluate AST nodes"""
-                if isinstance(node, ast.Constant):  # Python 3.8+
-                    return node.value
-                elif isinstance(node, ast.Num):  # Python 3.7 compatibility
-                    return node.n
-                elif isinstance(node, ast.BinOp):
-                    left = eval_node(node.left)
-                    right = eval_node(node.right)
-                    op_type = type(node.op)
-                    if op_type not in allowed_operators:
-                        raise ValueError(f"Operator {op_type.__name__} not allowed")
-                    return allowed_operators[op_type](left, right)
-                elif isinstance(node, ast.UnaryOp):
-                    operand = eval_node(node.operand)
-                    op_type = type(node.op)
-                    if op_type not in allowed_operators:
-                        raise ValueError(f"Operator {op_type.__name__} not allowed")
-                    return allowed_operators[op_type](operand)
-                elif isinstance(node, ast.Call):
-                    func_name = node.func.id if isinstance(node.func, ast.Name) else None
-                    if func_name not in allowed_functions:
-                        raise ValueError(f"Function {func_name} not allowed")
-                    args = [eval_node(arg) for arg in node.args]
-                    return allowed_functions[func_name](*args)
-                else:
-                    raise ValueError(f"Node type {type(node).__name__} not supported")
-            
-            # Parse and evaluate expression
-            tree = ast.parse(expression, mode='eval')
-            result = eval_node(tree.body)
+        with self.metrics.timer("calculate") as outcome:
+            try:
+                result = evaluate(expression)
+                
+                self._log(f"Calculation: {expression} = {result}")
+                return str(result)
+                
+            except Exception as e:
+                self._log(f"Calculation error: {e}", level="error")
+                outcome["error"] = True
+                return f"Error calculating: {str(e)}"
+    
+    def calculate_batch(self, expression: str, **columns: Any) -> Any:
+        """
+        Apply one expression element-wise across whole columns (vectorized)
+        
+        Args:
+            expression: Math expression whose names refer to columns,
+                e.g. "value * 1.05"
+            **columns: Arrays, Series or scalars bound to those names
             
-            self._log(f"Calculation: {expression} = {result}")
-            return str(result)
+        Returns:
+            NumPy array of results
             
-        except Exception as e:
-            self._log(f"Calculation error: {e}", level="error")
-            return f"Error calculating: {str(e)}"
+        Raises:
+            CalculationError: If the expression is invalid or numpy is missing
+        """
+        result = evaluate_batch(expression, **columns)
+        self._log(f"Batch calculation: {expression} over {', '.join(sorted(columns))}")
+        return result
     
-    def get_cec_wam_data(self, data_type: str = "all") -> Dict[str, Any]:
+    def register_price_series(self, symbol: str, prices: Any):
         """
-        Retrieve CEC WAM system data
+        Make a price series available to the finance fast path
         
         Args:
-            data_type: Type of data to retrieve (all, financial, operational, etc.)
+            symbol: Ticker, e.g. "PSI" (case-insensitive)
+            prices: Daily prices, oldest first (list, array or Series)
+        """
+        if not NUMPY_AVAILABLE:
+            self._log("Price series require numpy", level="warning")
+            return
+        import numpy as np
+        symbol = symbol.upper()
+        self.price_series[symbol] = np.asarray(prices, dtype=float)
+        self._log(f"Price series registered: {symbol} ({len(self.price_series[symbol])} points)")
+    
+    def get_cec_wam_data(self, data_type: str = "all", key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Retrieve CEC WAM system data from the indexed data/ ledger files
+        
+        Args:
+            data_type: Type of data to retrieve (all, financial, operational,
+                tasks, physics, dashboard)
+            key: Optional lookup key - asset class, task priority or ID,
+                "Module" / "Module:Parameter", or dashboard field
             
         Returns:
             Dictionary containing requested data
         """
-        # Placeholder for actual CEC WAM data integration
-        # In production, this would connect to your actual data sources
-        
         cec_data = {
             "system_status": "operational",
             "owner": self.owner_name,
             "access_level": "full",
-            "data_sources": ["google_sheets", "coingecko", "internal_db"],
-            "last_update": datetime.now().isoformat(),
-            "capabilities": self.capabilities
+            "data_type": data_type,
         }
+        try:
+            cec_data.update(self.ledger.query(data_type, key))
+        except Exception as e:
+            cec_data["error"] = f"Ledger unavailable: {e}"
+            self._log(f"CEC WAM data error: {e}", level="error")
+        cec_data["last_update"] = datetime.now().isoformat()
+        if data_type == "all":
+            cec_data["capabilities"] = self.capabilities
         
-        self._log(f"CEC WAM data retrieved: {data_type}")
+        self._log(f"CEC WAM data retrieved: {data_type}" + (f" ({key})" if key else ""))
         return cec_data
     
-    def verify_voice_biometric(self, audio_sample: bytes) -> bool:
+    def listen(self, chunks: Iterable[bytes], sample_rate: int = 16000,
+               max_utterances: Optional[int] = 1) -> Iterator[str]:
+        """
+        Transcribe live voice input, one utterance at a time
+        
+        The PCM stream is endpointed as it arrives (see eve_vad), so each
+        utterance is sent to recognition as soon as the speaker stops
+        rather than after a fixed-length recording.
+        
+        Args:
+            chunks: 16-bit mono PCM chunks, e.g. eve_vad.microphone_chunks()
+            sample_rate: Sample rate of the PCM stream
+            max_utterances: Stop after this many utterances (None = whole stream)
+            
+        Yields:
+            Transcripts of utterances that contained recognizable speech
+        """
+        if not NUMPY_AVAILABLE or not SPEECH_RECOGNITION_AVAILABLE:
+            self._log("Voice input requires numpy and SpeechRecognition", level="warning")
+            return
+        from eve_vad import endpoint_stream
+        
+        heard = 0
+        for utterance in endpoint_stream(chunks, sample_rate=sample_rate):
+            transcript = self._recognize(utterance)
+            if transcript:
+                yield transcript
+            heard += 1
+            if max_utterances is not None and heard >= max_utterances:
+                return
+    
+    def transcribe(self, audio: bytes) -> str:
+        """
+        Transcribe a recorded WAV clip, trimmed to its spoken parts
+        
+        Args:
+            audio: 16-bit WAV bytes (e.g. from a browser recorder)
+            
+        Returns:
+            Transcript of all utterances in the clip ("" if none)
+        """
+        if not NUMPY_AVAILABLE or not SPEECH_RECOGNITION_AVAILABLE:
+            self._log("Voice input requires numpy and SpeechRecognition", level="warning")
+            return ""
+        from eve_vad import read_wav
+        
+        try:
+            pcm, sample_rate = read_wav(audio)
+        except ValueError as e:
+            self._log(f"Voice input error: {e}", level="error")
+            return ""
+        return " ".join(self.listen([pcm], sample_rate=sample_rate, max_utterances=None))
+    
+    def _recognize(self, utterance) -> Optional[str]:
+        """Speech-to-text for one endpointed utterance; failures only log"""
+        from eve_vad import recognize
+        
+        with self.metrics.timer("recognize") as outcome:
+            try:
+                transcript = recognize(utterance)
+            except Exception as e:
+                outcome["error"] = True
+                self._log(f"Speech recognition error: {e}", level="error")
+                return None
+        self._log(f"Heard ({utterance.duration:.1f}s): {(transcript or '')[:50]}")
+        return transcript
+    
+    def _get_voiceprint(self):
+        """The owner's voiceprint verifier, created on first use (needs numpy)"""
+        if self._voiceprint is None and NUMPY_AVAILABLE:
+            from eve_biometric import verifier_from_env
+            self._voiceprint = verifier_from_env()
+        return self._voiceprint
+    
+    def enroll_voice(self, audio_samples: List[bytes]) -> bool:
+        """
+        Enroll the owner's voiceprint from a few clips of their speech
+        
+        Args:
+            audio_samples: WAV (or 16 kHz 16-bit mono PCM) clips, a few
+                seconds each
+            
+        Returns:
+            True if the voiceprint was built and cached
+        """
+        verifier = self._get_voiceprint()
+        if verifier is None:
+            self._log("Voice enrollment requires numpy", level="warning")
+            return False
+        try:
+            verifier.enroll(audio_samples)
+        except (ValueError, OSError) as e:
+            self._log(f"Voice enrollment failed: {e}", level="error")
+            return False
+        self._log(f"Voiceprint enrolled from {len(audio_samples)} clip(s)")
+        return True
+    
+    def verify_voice_biometric(self, audio_sample: bytes, sample_rate: int = 16000) -> bool:
         """
         Verify voice biometric for authorization
         
+        The sample is scored locally against the enrolled voiceprint (see
+        eve_biometric). Until a voiceprint is enrolled, verification is not
+        enforced and every sample is accepted.
+        
         Args:
-            audio_sample: Audio sample to verify
+            audio_sample: WAV bytes, or raw 16-bit mono PCM
+            sample_rate: Sample rate of raw PCM input
             
         Returns:
             True if voice matches owner, False otherwise
         """
-        # Placeholder for actual voice biometric verification
-        # In production, this would use voice recognition AI
+        verifier = self._get_voiceprint()
+        if verifier is None or not verifier.is_enrolled:
+            self._log("Voice biometric verification requested (no voiceprint enrolled, not enforced)",
+                      level="warning")
+            return True
         
-        # For now, return True as we trust the input
-        # In production, implement actual voice verification
-        self._log("Voice biometric verification requested")
-        return True
+        with self.metrics.timer("voice_verify") as outcome:
+            try:
+                verified, score = verifier.verify(audio_sample, sample_rate)
+            except ValueError as e:
+                outcome["error"] = True
+                self._log(f"Voice biometric verification failed: {e}", level="warning")
+                return False
+        
+        self._log(f"Voice biometric {'verified' if verified else 'rejected'} (score {score:.3f})",
+                  level="info" if verified else "warning")
+        return verified
     
     def get_status(self) -> Dict[str, Any]:
         """Get EVE's current status"""
@@ -396,34 +917,89 @@ Respond naturally and conversationally while being precise and helpful."""
             "uptime": "24/7",
             "elevenlabs_ready": self.elevenlabs_ready,
             "openai_ready": self.openai_ready,
+            "llm_providers": self.llm.status(),
             "conversation_count": len(self.conversation_history) // 2,
             "log_count": len(self.logs),
             "capabilities": self.capabilities,
+            "performance": self.get_performance(),
             "last_update": datetime.now().isoformat()
         }
     
+    def get_performance(self) -> Dict[str, Any]:
+        """
+        Latency percentiles, token usage, error rates and cache hit rates
+        
+        Returns:
+            Dictionary with "latency" (per operation: count, error_rate,
+            mean and p50/p95/p99/max in ms), "counters" (tokens, routes)
+            and "cache_hit_rates"
+        """
+        performance = self.metrics.snapshot()
+        counters = performance["counters"]
+        plan_cache = compile_expression.cache_info()
+        local_routes = sum(count for name, count in counters.items()
+                           if name.startswith("route.") and name != "route.llm")
+        audio_stats = self.audio_cache.stats() if self.audio_cache is not None else None
+        performance["cache_hit_rates"] = {
+            "tts_audio": hit_rate(audio_stats["hits"], audio_stats["misses"]) if audio_stats else None,
+            "calculator_plans": hit_rate(plan_cache.hits, plan_cache.misses),
+            "local_fast_path": hit_rate(local_routes, counters.get("route.llm", 0)),
+        }
+        return performance
+    
     def clear_history(self):
         """Clear conversation history"""
         self.conversation_history.clear()
+        self._history_loaded = True
+        if self.store is not None:
+            self.store.clear_session(self.session_id)
         self._log("Conversation history cleared")
     
-    def get_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent logs (converts deque to list for return)"""
-        if limit >= len(self.logs):
-            return list(self.logs)
+    def get_logs(self, limit: int = 100, level: Optional[str] = None,
+                 since: Optional[Any] = None, until: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent logs, newest last
+        
+        Args:
+            limit: Maximum number of entries
+            level: Only entries at this level (info, warning, error, ...)
+            since: Inclusive start time (datetime or epoch seconds)
+            until: Inclusive end time (datetime or epoch seconds)
+        """
+        if level is None and since is None and until is None:
+            records = self.logs.tail(limit)
         else:
-            # Get last N items from deque efficiently
-            return list(self.logs)[-limit:]
+            records = self.logs.query(level=level, since=since, until=until, limit=limit)
+        return [record.as_dict(self.system_code) for record in records]
 
 
 # Global EVE instance
 _eve_instance = None
+_eve_load_error: Optional[str] = None
+_eve_lock = threading.Lock()
 
 def get_eve() -> EVEAgent:
-    """Get or create global EVE instance"""
-    global _eve_instance
+    """Get or create global EVE instance (safe to call from worker threads)"""
+    global _eve_instance, _eve_load_error
     if _eve_instance is None:
-        _eve_instance = EVEAgent()
+        with _eve_lock:
+            if _eve_instance is None:
+                try:
+                    _eve_instance = EVEAgent()
+                except Exception as e:
+                    _eve_load_error = f"{type(e).__name__}: {e}"
+                    raise
+                _eve_load_error = None
+    return _eve_instance
+
+
+def eve_load_error() -> Optional[str]:
+    """Why the last attempt to create the global EVE instance failed, or None"""
+    return _eve_load_error
+
+
+def current_eve() -> Optional[EVEAgent]:
+    """The global EVE instance if one has been created; never creates it"""
     return _eve_instance
 
 
@@ -2141,7 +2141,7 @@ with tabs[9]:
     
     with action_col1:
         if st.button("🎤 Voice Input", use_container_width=True, help="Requires microphone access"):
-            st.info("🎤 Voice input requires SpeechRecognition API and microphone permissions. Feature coming soon!")
+            st.session_state.voice_input_open = not st.session_state.get("voice_input_open", False)
     
     with action_col2:
         if st.button("🔊 Voice Output", use_container_width=True, help="Requires ElevenLabs API"):
@@ -2156,17 +2156,61 @@ with tabs[9]:
                 {"role": "assistant", "content": "Chat history cleared. How can I assist you? 🧠"}
             ]
             if st.session_state.eve_agent:
-                st.session_state.eve_agent.conversation_history = []
+                st.session_state.eve_agent.clear_history()
             st.rerun()
     
     with action_col4:
         if st.button("📊 EVE Status", use_container_width=True, help="View detailed EVE status"):
             if st.session_state.eve_agent:
                 status = st.session_state.eve_agent.get_status()
+                performance = status.pop("performance", {})
                 st.json(status)
+
+                st.markdown("**⏱️ Latency (ms)**")
+                latency = performance.get("latency", {})
+                if latency:
+                    st.dataframe(pd.DataFrame.from_dict(latency, orient="index"), use_container_width=True)
+                else:
+                    st.caption("No operations timed yet.")
+
+                counters = performance.get("counters", {})
+                hit_rates = performance.get("cache_hit_rates", {})
+                perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
+                perf_col1.metric("Tokens used", f"{counters.get('total_tokens', 0):,}")
+                for column, (label, key) in zip(
+                    (perf_col2, perf_col3, perf_col4),
+                    (("TTS cache hits", "tts_audio"), ("Calc plan hits", "calculator_plans"),
+                     ("Local fast path", "local_fast_path")),
+                ):
+                    rate = hit_rates.get(key)
+                    column.metric(label, f"{rate:.0%}" if rate is not None else "—")
             else:
                 st.error("EVE agent not initialized")
 
+    # Voice input: the recording is endpointed (eve_vad) so only the spoken
+    # part is sent to recognition, then the transcript goes to EVE's chat
+    if st.session_state.get("voice_input_open"):
+        if not hasattr(st, "audio_input"):
+            st.info("🎤 Voice input needs Streamlit 1.40+ (st.audio_input) and microphone permissions.")
+        elif not st.session_state.eve_agent:
+            st.error("EVE agent not initialized")
+        else:
+            recording = st.audio_input("🎤 Speak to EVE")
+            if recording is not None:
+                audio_bytes = recording.getvalue()
+                recording_id = hash(audio_bytes)
+                if st.session_state.get("voice_input_last") != recording_id:
+                    st.session_state.voice_input_last = recording_id
+                    with st.spinner("Transcribing..."):
+                        transcript = st.session_state.eve_agent.transcribe(audio_bytes)
+                    if transcript:
+                        st.session_state.messages.append({"role": "user", "content": transcript})
+                        response = st.session_state.eve_agent.chat(transcript, include_history=False)
+                        st.session_state.messages.append({"role": "assistant", "content": response})
+                        st.rerun()
+                    else:
+                        st.warning("🎤 No speech recognized. Check SpeechRecognition is installed and try again.")
+
 # TAB 11: Analytics
 with tabs[10]:
     st.header("📉 Analytics Dashboard")
@@ -0,0 +1,125 @@
+"""
+Tests for EVEAgent.chat_batch: items stay out of the conversation, identical
+prompts are answered once, results keep input order and one failing item
+does not fail the batch
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from eve_gateway import GatewayError
+from eve_voice_agent import EVEAgent
+
+
+class FakeLLM:
+    """
+    Stands in for the LLM gateway; keeps the prompts it was sent
+
+    Prompts listed in `delays` are answered after that many seconds, and
+    those in `errors` raise the given exception.
+    """
+
+    def __init__(self, delays=None, errors=None):
+        self.prompts = []
+        self.delays = delays or {}
+        self.errors = errors or {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, **kwargs):
+        prompt = messages[-1]['content']
+        with self._lock:
+            self.prompts.append(messages)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(prompt, 0.0))
+            if prompt in self.errors:
+                raise self.errors[prompt]
+            return SimpleNamespace(content=f"answer to {prompt}", usage=None)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def asked(self, prompt):
+        return sum(1 for messages in self.prompts if messages[-1]['content'] == prompt)
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    monkeypatch.setenv("EVE_STORE_PATH", str(tmp_path / "eve.db"))
+    monkeypatch.setenv("EVE_LOG_FILE", "")
+    eve = EVEAgent()
+    eve.llm, eve.openai_ready = FakeLLM(), True
+    yield eve
+    eve.store.close()
+
+
+def test_batch_items_are_not_recorded(agent):
+    agent.chat("Remember that my name is Sam")
+    results = agent.chat_batch(["Summarize: renew domain", "2 + 3", "Summarize: renew domain"])
+
+    assert [r["success"] for r in results] == [True, True, True]
+    assert results[1]["route"] == "calculator"
+    assert len(agent.conversation_history) == 2
+    assert agent.store.flush()
+    assert len(agent.store.recent_messages(agent.session_id)) == 2
+
+
+def test_batch_prompts_carry_no_history(agent):
+    agent.chat("Remember that my name is Sam")
+    agent.chat_batch(["Summarize: file Q3 report"])
+    batch_prompt = agent.llm.prompts[-1]
+    assert [m["role"] for m in batch_prompt] == ["system", "user"]
+
+
+def test_identical_prompts_are_answered_once(agent):
+    messages = ["Summarize: renew domain", "Summarize: pay invoice", "  Summarize: renew domain\n",
+                "Summarize: pay invoice", "Summarize: renew domain"]
+    results = agent.chat_batch(messages)
+
+    assert agent.llm.asked("Summarize: renew domain") == 1
+    assert agent.llm.asked("Summarize: pay invoice") == 1
+    assert [r["duplicate_of"] for r in results] == [None, None, 0, 1, 0]
+    assert [r["response"] for r in results] == ["answer to Summarize: renew domain",
+                                                "answer to Summarize: pay invoice"] * 2 + \
+        ["answer to Summarize: renew domain"]
+
+
+def test_results_keep_input_order(agent):
+    # Earlier prompts finish last, so completion order is the reverse of input order
+    prompts = [f"Summarize: task {n}" for n in range(6)]
+    agent.llm = FakeLLM(delays={prompt: 0.01 * (6 - n) for n, prompt in enumerate(prompts)})
+    messages = prompts + [prompts[4], prompts[0], prompts[5]]
+    results = agent.chat_batch(messages, concurrency=6)
+
+    assert [r["index"] for r in results] == list(range(len(messages)))
+    assert [r["message"] for r in results] == messages
+    assert [r["response"] for r in results] == [f"answer to {message}" for message in messages]
+    assert [r["duplicate_of"] for r in results] == [None] * 6 + [4, 0, 5]
+
+
+def test_one_failing_item_does_not_fail_the_batch(agent):
+    agent.llm = FakeLLM(errors={"Summarize: broken": RuntimeError("connection reset"),
+                                "Summarize: refused": GatewayError("all providers failed")})
+    messages = ["Summarize: fine", "Summarize: broken", "Summarize: refused", "Summarize: broken",
+                "Summarize: also fine"]
+    results = agent.chat_batch(messages)
+
+    assert [r["success"] for r in results] == [True, False, False, False, True]
+    assert results[1]["error"] == "connection reset" and results[1]["response"] is None
+    assert "all providers failed" in results[2]["error"]
+    assert results[3]["duplicate_of"] == 1 and results[3]["error"] == "connection reset"
+    assert results[4]["response"] == "answer to Summarize: also fine"
+    assert agent.llm.asked("Summarize: broken") == 1
+
+
+def test_concurrency_is_bounded(agent):
+    agent.llm = FakeLLM(delays={f"Summarize: task {n}": 0.02 for n in range(12)})
+    results = agent.chat_batch([f"Summarize: task {n}" for n in range(12)], concurrency=3)
+    assert all(r["success"] for r in results)
+    assert 1 < agent.llm.max_active <= 3
@@ -0,0 +1,295 @@
+"""
+Tests for eve_api: idempotent replay combined with response compression,
+and the raw voice endpoint (HEAD, Range, ETag)
+"""
+
+import gzip
+import io
+import json
+import uuid
+
+import pytest
+
+import eve_api
+from eve_api import ApiRequest, dispatch
+from eve_status import StatusSnapshot
+from eve_tts_cache import AudioCache, audio_cache_key
+
+ANSWER = "Your ledger is up to date and three tasks remain open. " * 40
+
+
+class FakeAgent:
+    """Stands in for EVEAgent; counts model calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat_with_route(self, message, include_history=True):
+        self.calls += 1
+        return {"response": ANSWER, "route": "llm", "failed": False}
+
+    def chat_stream(self, message, include_history=True, cancel=None, info=None):
+        self.calls += 1
+        info.update(route="llm")
+        for word in ANSWER.split(" "):
+            yield word + " "
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    fake = FakeAgent()
+    monkeypatch.setattr(eve_api, "get_eve", lambda: fake)
+    monkeypatch.setattr(eve_api, "RATE_LIMITER", None)
+    return fake
+
+
+def post_chat(payload, key, encoding, client="10.0.0.1"):
+    request = ApiRequest(method="POST", path=eve_api.CHAT_PATH, client=client,
+                         headers={"idempotency-key": key, "accept-encoding": encoding,
+                                  "content-type": "application/json"},
+                         body=json.dumps(payload).encode())
+    response = dispatch(request)
+    body = response.body
+    if response.stream is not None:
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+    return response, body
+
+
+def decode(response, body):
+    return gzip.decompress(body) if response.header("Content-Encoding") == "gzip" else body
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("first,second", [("gzip", "identity"), ("identity", "gzip"), ("gzip", "gzip")])
+def test_replay_is_encoded_for_the_replaying_client(agent, stream, first, second):
+    key = str(uuid.uuid4())
+    payload = {"message": "What is open?", "stream": stream}
+    original, original_body = post_chat(payload, key, first)
+    replay, replay_body = post_chat(payload, key, second)
+
+    assert agent.calls == 1
+    assert replay.header("Idempotent-Replayed") == "true"
+    assert replay.header("Content-Encoding") == ("gzip" if second == "gzip" else None)
+    assert [v for n, v in replay.headers if n == "Content-Encoding"] in ([], ["gzip"])
+    assert decode(replay, replay_body) == decode(original, original_body)
+
+
+def test_replay_drops_the_original_clients_quota(agent, monkeypatch):
+    from eve_ratelimit import RateLimiter
+    monkeypatch.setattr(eve_api, "RATE_LIMITER", RateLimiter({"chat": (60, 20), "voice": (30, 10)}))
+    key = str(uuid.uuid4())
+    original, _ = post_chat({"message": "hi"}, key, "identity", client="10.0.0.1")
+    assert original.header("RateLimit-Remaining") == "19"
+
+    snapshot = eve_api.IDEMPOTENCY.lookup(*eve_api._idempotency_scope(ApiRequest(
+        method="POST", path=eve_api.CHAT_PATH, headers={"idempotency-key": key},
+        body=json.dumps({"message": "hi"}).encode())))
+    assert snapshot is not None
+    assert not [name for name, _ in snapshot[1] if name.lower().startswith("ratelimit-")]
+
+
+CLIP = bytes(range(256)) * 40
+
+
+class FakeVoice:
+    """Stands in for EVEAgent's speech methods over a real TTS cache"""
+
+    def __init__(self, cache):
+        self.audio_cache = cache
+        self.syntheses = 0
+
+    def speech_etag(self, text):
+        return audio_cache_key("voice", "model", text)
+
+    def cached_speech(self, text):
+        return self.audio_cache.locate(self.speech_etag(text), count=False)
+
+    def speak_cached(self, text):
+        path = self.cached_speech(text)
+        if path is not None:
+            return path
+        self.syntheses += 1
+        self.audio_cache.put(self.speech_etag(text), CLIP)
+        return self.cached_speech(text)
+
+    def speak(self, text):
+        self.syntheses += 1
+        return CLIP
+
+
+@pytest.fixture
+def voice(monkeypatch, tmp_path):
+    fake = FakeVoice(AudioCache(str(tmp_path), 1 << 20))
+    monkeypatch.setattr(eve_api, "get_eve", lambda: fake)
+    monkeypatch.setattr(eve_api, "RATE_LIMITER", None)
+    return fake
+
+
+def get_voice(method="GET", text="hello", **headers):
+    response = dispatch(ApiRequest(method=method, path=eve_api.VOICE_PATH, query=f"text={text}",
+                                   client="10.0.0.1", headers=headers))
+    body = response.body
+    if response.stream is not None:
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+    return response, body
+
+
+def test_head_of_uncached_clip_does_not_synthesize(voice):
+    response, body = get_voice("HEAD")
+    assert response.status == 200
+    assert voice.syntheses == 0
+    assert body == b""
+    assert response.header("Content-Length") is None and response.unsized
+    assert response.header("ETag") == f'"{voice.speech_etag("hello")}"'
+    assert response.header("Content-Type") == "audio/mpeg"
+
+
+def test_head_of_cached_clip_reports_its_length(voice):
+    get_voice()
+    response, body = get_voice("HEAD")
+    assert voice.syntheses == 1
+    assert (response.status, body) == (200, b"")
+    assert response.header("Content-Length") == str(len(CLIP))
+
+    response, body = get_voice("HEAD", range="bytes=10-19")
+    assert voice.syntheses == 1
+    assert (response.status, body) == (206, b"")
+    assert response.header("Content-Length") == "10"
+    assert response.header("Content-Range") == f"bytes 10-19/{len(CLIP)}"
+
+
+def test_get_serves_the_whole_clip(voice):
+    response, body = get_voice()
+    assert (response.status, body) == (200, CLIP)
+    assert response.header("Content-Length") == str(len(CLIP))
+    assert response.header("Accept-Ranges") == "bytes"
+
+
+@pytest.mark.parametrize("header,start,end", [
+    ("bytes=0-0", 0, 0),
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, len(CLIP) - 1),
+    ("bytes=-16", len(CLIP) - 16, len(CLIP) - 1),
+    ("bytes=10200-99999", 10200, len(CLIP) - 1),
+])
+def test_range_requests(voice, header, start, end):
+    response, body = get_voice(range=header)
+    assert response.status == 206
+    assert body == CLIP[start:end + 1]
+    assert response.header("Content-Length") == str(end - start + 1)
+    assert response.header("Content-Range") == f"bytes {start}-{end}/{len(CLIP)}"
+
+
+def test_unsatisfiable_range(voice):
+    response, _ = get_voice(range=f"bytes={len(CLIP)}-")
+    assert response.status == 416
+
+
+@pytest.mark.parametrize("header", ["items=0-10", "bytes=0-1,4-5", "bytes=x-y"])
+def test_unusable_range_sends_the_whole_clip(voice, header):
+    response, body = get_voice(range=header)
+    assert (response.status, body) == (200, CLIP)
+
+
+def test_if_range_with_a_stale_etag_sends_the_whole_clip(voice):
+    etag = f'"{voice.speech_etag("hello")}"'
+    response, body = get_voice(range="bytes=0-9", **{"if-range": etag})
+    assert (response.status, body) == (206, CLIP[:10])
+    response, body = get_voice(range="bytes=0-9", **{"if-range": '"stale"'})
+    assert (response.status, body) == (200, CLIP)
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+@pytest.mark.parametrize("template", ['{}', 'W/{}', '"other", {}', '*'])
+def test_matching_etag_is_not_modified(voice, method, template):
+    etag = f'"{voice.speech_etag("hello")}"'
+    response, body = get_voice(method, **{"if-none-match": template.format(etag)})
+    assert (response.status, body) == (304, b"")
+    assert response.header("ETag") == etag
+    assert voice.syntheses == 0
+
+
+def test_other_etag_is_served(voice):
+    response, body = get_voice(**{"if-none-match": '"other"'})
+    assert (response.status, body) == (200, CLIP)
+    assert voice.syntheses == 1
+
+
+class RecordingHandler:
+    """Captures what write_http sends"""
+
+    def __init__(self):
+        self.headers = {}
+        self.wfile = io.BytesIO()
+
+    def send_response(self, status):
+        self.status = status
+
+    def send_header(self, name, value):
+        self.headers[name] = value
+
+    def end_headers(self):
+        pass
+
+
+def test_unsized_head_is_written_without_content_length(voice):
+    response, _ = get_voice("HEAD")
+    handler = RecordingHandler()
+    eve_api.write_http(handler, response)
+    assert handler.status == 200
+    assert "Content-Length" not in handler.headers
+    assert handler.wfile.getvalue() == b""
+
+
+def chat_status(monkeypatch):
+    monkeypatch.setattr(eve_api, "STATUS", StatusSnapshot(eve_api._build_status))
+    response = dispatch(ApiRequest(method="GET", path=eve_api.CHAT_PATH, client="10.0.0.1"))
+    return response.status, json.loads(response.body)
+
+
+def test_status_before_the_agent_is_loaded(monkeypatch):
+    monkeypatch.setattr(eve_api, "current_eve", lambda: None)
+    monkeypatch.setattr(eve_api, "eve_load_error", lambda: None)
+    status, body = chat_status(monkeypatch)
+    assert status == 200
+    assert body["status"] == "degraded" and body["agent_loaded"] is False
+    assert "not loaded" in body["error"]
+
+
+def test_status_after_the_agent_failed_to_load(monkeypatch):
+    monkeypatch.setattr(eve_api, "current_eve", lambda: None)
+    monkeypatch.setattr(eve_api, "eve_load_error", lambda: "RuntimeError: no API key")
+    status, body = chat_status(monkeypatch)
+    assert status == 503
+    assert body["status"] == "unavailable" and body["agent_loaded"] is False
+    assert "no API key" in body["error"]
+
+
+def test_status_when_eve_cannot_be_imported(monkeypatch):
+    monkeypatch.setattr(eve_api, "get_eve", None)
+    monkeypatch.setattr(eve_api, "EVE_IMPORT_ERROR", "No module named 'openai'")
+    status, body = chat_status(monkeypatch)
+    assert status == 503
+    assert body["status"] == "unavailable"
+    assert "openai" in body["error"]
+
+
+def test_failed_load_is_recorded(monkeypatch):
+    import eve_voice_agent
+
+    def broken():
+        raise RuntimeError("no API key")
+
+    monkeypatch.setattr(eve_voice_agent, "_eve_instance", None)
+    monkeypatch.setattr(eve_voice_agent, "_eve_load_error", None)
+    monkeypatch.setattr(eve_voice_agent, "EVEAgent", broken)
+    with pytest.raises(RuntimeError):
+        eve_voice_agent.get_eve()
+    assert eve_voice_agent.eve_load_error() == "RuntimeError: no API key"
+    assert eve_voice_agent.current_eve() is None
@@ -0,0 +1,118 @@
+"""
+Tests for eve_biometric: short or corrupt audio and the voiceprint cache
+"""
+
+import io
+import os
+import stat
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import eve_biometric  # noqa: E402
+from eve_biometric import VoiceprintVerifier, embed_audio  # noqa: E402
+
+
+def wav(samples, rate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes((np.asarray(samples) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def voice(seed, seconds=2.0, rate=16000):
+    # Harmonics with a wobbling pitch: enough voiced frames to embed
+    t = np.arange(int(seconds * rate)) / rate
+    pitch = 110 + 20 * seed + 5 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 8))
+    return wav(0.3 * signal / np.abs(signal).max() * (0.6 + 0.4 * np.sin(2 * np.pi * 2 * t) ** 2), rate)
+
+
+@pytest.mark.parametrize("audio", [
+    wav([0.1], rate=48000),           # one frame, nothing left after resampling
+    wav([], rate=16000),
+    wav([0.1] * 50),
+    b"RIFF",
+    b"RIFF" + b"\0" * 40,
+    voice(0)[:30],
+    voice(0)[:20] + b"\xff\xff" + voice(0)[22:200],
+    b"\x01",
+])
+def test_short_or_corrupt_audio_raises_value_error(audio):
+    with pytest.raises(ValueError):
+        embed_audio(audio)
+
+
+def claimed_frames(audio, frames):
+    # Rewrite the data chunk size, as a crafted upload would
+    return audio[:40] + (frames * 2).to_bytes(4, "little") + audio[44:]
+
+
+@pytest.mark.parametrize("audio,sample_rate", [
+    (wav([0.1] * 200, rate=1), 16000),          # ~3e9 positions if resampled to 16 kHz
+    (wav([0.1] * 200, rate=200000), 16000),
+    (claimed_frames(wav([0.1] * 200), 10 ** 9), 16000),
+    (b"\x00\x01" * 200, 1),                       # Raw PCM at a bogus rate
+    (b"\x00\x01" * (61 * 8000), 8000),            # Raw PCM over the length cap
+])
+def test_bad_rates_and_long_clips_are_rejected_before_decoding(audio, sample_rate, monkeypatch):
+    monkeypatch.setattr(eve_biometric, "resample", lambda *a: pytest.fail("resampled"))
+    with pytest.raises(ValueError):
+        eve_biometric.decode_audio(audio, sample_rate)
+
+
+def test_verify_rejects_short_audio_with_value_error():
+    verifier = VoiceprintVerifier(threshold=0.5)
+    verifier.enroll([voice(0)])
+    with pytest.raises(ValueError):
+        verifier.verify(wav([0.1], rate=48000))
+
+
+def make_verifier(tmp_path):
+    return VoiceprintVerifier(enrollment_dir=str(tmp_path / "clips"), cache_path=str(tmp_path / "vp" / "cache.npz"))
+
+
+def test_cache_is_private_and_bound_to_the_enrollment_audio(tmp_path):
+    owner = make_verifier(tmp_path)
+    owner.enroll([voice(0), voice(0, seconds=2.5)])
+    cache = tmp_path / "vp" / "cache.npz"
+    assert stat.S_IMODE(os.stat(cache.parent).st_mode) == 0o700
+    assert not list(cache.parent.glob("*.tmp"))
+
+    # A voiceprint built from someone else's audio, planted at the cache path
+    impostor = VoiceprintVerifier(enrollment_dir=str(tmp_path / "other"), cache_path=str(tmp_path / "planted.npz"))
+    impostor.enroll([voice(3)])
+    os.replace(tmp_path / "planted.npz", cache)
+
+    reloaded = make_verifier(tmp_path)
+    assert np.allclose(reloaded.embedding, owner.embedding)
+    assert not np.allclose(reloaded.embedding, impostor.embedding)
+
+
+def test_cache_is_reused_while_the_clips_are_unchanged(tmp_path, monkeypatch):
+    make_verifier(tmp_path).enroll([voice(0)])
+    calls = []
+    monkeypatch.setattr(eve_biometric, "embed_audio", lambda *a: calls.append(a))
+    assert make_verifier(tmp_path).is_enrolled
+    assert calls == []
+
+
+def test_no_clips_means_not_enrolled_even_with_a_cache(tmp_path):
+    make_verifier(tmp_path).enroll([voice(0)])
+    for clip in (tmp_path / "clips").glob("*.wav"):
+        clip.unlink()
+    assert not make_verifier(tmp_path).is_enrolled
+
+
+def test_default_cache_is_not_in_the_shared_temp_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("EVE_VOICEPRINT_CACHE", raising=False)
+    monkeypatch.delenv("EVE_VOICEPRINT_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    verifier = eve_biometric.verifier_from_env()
+    assert verifier.cache_path.parent == tmp_path / "eve" / "voiceprint"
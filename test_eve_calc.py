@@ -0,0 +1,71 @@
+"""
+Tests for eve_calc resource guards: hostile input must fail fast
+"""
+
+import time
+
+import pytest
+
+from eve_calc import CalculationError, CalculationLimitError, evaluate
+
+
+def fails_fast(expression, error=CalculationLimitError, budget=0.5, **kwargs):
+    started = time.perf_counter()
+    with pytest.raises(error):
+        evaluate(expression, **kwargs)
+    assert time.perf_counter() - started < budget
+
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9",
+    "2**5000",
+    "10**4000 * 10**4000",
+    "round(5, -10**7)",
+    "round(5.0, 10**7)",
+])
+def test_oversized_results_are_rejected(expression):
+    fails_fast(expression)
+
+
+def test_function_results_are_bit_capped():
+    fails_fast("sum([2**4095, 2**4095])")
+    fails_fast("max(2**4095, 2) * 4")
+
+
+def test_round_digits_must_be_integers():
+    with pytest.raises(CalculationError):
+        evaluate("round(2.5, 1.5)")
+
+
+@pytest.mark.parametrize("expression,expected", [
+    ("round(2.567, 2)", 2.57),
+    ("round(1234, -2)", 1200),
+    ("sum([1, 2, 3])", 6),
+    ("2**10 + 1", 1025),
+])
+def test_ordinary_arithmetic_still_works(expression, expected):
+    assert evaluate(expression) == expected
+
+
+def test_vector_mode_guards_constant_operands():
+    np = pytest.importorskip("numpy")
+    from eve_calc import evaluate_batch
+    for expression in ("value + 9**9**7", "value * 9**9**9", "value - 10**4000 * 10**4000"):
+        started = time.perf_counter()
+        with pytest.raises(CalculationLimitError):
+            evaluate_batch(expression, value=[1.0])
+        assert time.perf_counter() - started < 0.5
+    result = evaluate_batch("value * 2**3 + 1", value=np.array([1.0, 2.0]))
+    assert list(result) == [9.0, 17.0]
+
+
+def test_irr_tolerance_and_iterations_are_bounded():
+    pytest.importorskip("numpy")
+    assert evaluate("irr([-100, 50, 60])") == pytest.approx(0.0639, abs=1e-4)
+    assert evaluate("irr([-100, 50, 60], 0.2)") == pytest.approx(0.0639, abs=1e-4)
+    assert evaluate("irr([-100, 50, 60], 0.2, 1e-6, 50)") == pytest.approx(0.0639, abs=1e-4)
+    for expression in ("irr([-100, 50, 60], 0.1, 0, 100000)", "irr([-100, 50, 60], 0.1, 1e-10, 100000)"):
+        started = time.perf_counter()
+        with pytest.raises(ValueError):
+            evaluate(expression)
+        assert time.perf_counter() - started < 0.5
@@ -0,0 +1,99 @@
+"""
+Tests for eve_finance: numeric results against known values
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from eve_finance import (CALCULATOR_IRR_MAX_ITER, amortization_schedule, cagr, calculator_irr, compound, irr,
+                         npv, period_return, pmt, rolling_returns, volatility)
+
+
+def test_npv():
+    assert npv(0.1, [-100, 60, 60]) == pytest.approx(-100 + 60 / 1.1 + 60 / 1.21)
+    assert npv(0.0, [-100, 60, 60]) == pytest.approx(20.0)
+    assert npv([0.0, 0.1], [-100, 60, 60]) == pytest.approx([20.0, -100 + 60 / 1.1 + 60 / 1.21])
+
+
+def test_irr_known_values():
+    # -100 + 50x + 60x^2 = 0 with x = 1 / (1 + r)
+    x = (-50 + math.sqrt(50 ** 2 + 4 * 60 * 100)) / (2 * 60)
+    assert irr([-100, 50, 60]) == pytest.approx(1 / x - 1, abs=1e-12)
+    assert irr([-1000, 0, 0, 1331]) == pytest.approx(0.1, abs=1e-12)
+    assert irr([-100, 100]) == pytest.approx(0.0, abs=1e-12)
+    assert irr([-100, 90]) == pytest.approx(-0.1, abs=1e-12)
+
+
+def test_irr_zeroes_npv():
+    flows = [-5000, 1200, 1400, 1600, 1800, 400]
+    rate = irr(flows)
+    assert npv(rate, flows) == pytest.approx(0.0, abs=1e-8)
+    assert irr(flows, guess=0.5) == pytest.approx(rate, abs=1e-10)
+
+
+@pytest.mark.parametrize("flows", [[100, 50, 60], [-100, -50, -60], [0, 0, 0], [-100, 0, 0]])
+def test_irr_without_a_sign_change_is_nan(flows):
+    assert math.isnan(irr(flows))
+
+
+def test_irr_that_does_not_converge_is_nan():
+    flows = [-5000, 1200, 1400, 1600, 1800, 400]
+    assert math.isnan(irr(flows, max_iter=2))
+    assert irr(flows, max_iter=100) == pytest.approx(0.09404133, abs=1e-8)
+    assert math.isnan(irr(flows, tol=0.0))
+    # Newton diverges from a far-off start
+    assert math.isnan(irr(flows, guess=0.9))
+
+
+def test_irr_series_converge_independently():
+    result = irr([[-100, 110, 0], [100, 50, 60], [-1000, 0, 1210]])
+    assert result[0] == pytest.approx(0.1, abs=1e-12)
+    assert math.isnan(result[1])
+    assert result[2] == pytest.approx(0.1, abs=1e-12)
+
+
+def test_calculator_irr_bounds():
+    assert calculator_irr([-100, 110], 0.1, 1e-6, 50) == pytest.approx(0.1, abs=1e-6)
+    assert calculator_irr([-100, 110], 0.1, 1e-12, CALCULATOR_IRR_MAX_ITER) == pytest.approx(0.1)
+    for tol, max_iter in [(0, 100), (-1, 100), (2, 100), (1e-10, 0), (1e-10, CALCULATOR_IRR_MAX_ITER + 1),
+                          (1e-10, 10.5)]:
+        with pytest.raises(ValueError):
+            calculator_irr([-100, 110], 0.1, tol, max_iter)
+
+
+def test_pmt_and_amortization():
+    assert pmt(0.01, 12, 1000) == pytest.approx(88.848788, abs=1e-6)
+    assert pmt(0.0, 10, 1000) == pytest.approx(100.0)
+    schedule = amortization_schedule(1000, 0.01, 12)
+    assert schedule["balance"][-1] == pytest.approx(0.0, abs=1e-9)
+    assert schedule["principal"].sum() == pytest.approx(1000.0)
+    assert schedule["interest"][0] == pytest.approx(10.0)
+
+
+def test_growth():
+    assert cagr(100, 121, 2) == pytest.approx(0.1)
+    assert compound(100, 0.12, 1, 12) == pytest.approx(100 * 1.01 ** 12)
+    assert compound(100, 0.05, 2) == pytest.approx(110.25)
+
+
+def test_returns():
+    prices = [100, 110, 121, 108.9]
+    assert rolling_returns(prices, 1) == pytest.approx([0.1, 0.1, -0.1])
+    assert rolling_returns(prices, 2) == pytest.approx([0.21, -0.01])
+    assert period_return(prices, 3) == pytest.approx(0.089)
+    assert rolling_returns(prices, 4).size == 0
+    assert rolling_returns(prices, 0).size == 0
+    assert math.isnan(period_return(prices, 4))
+
+
+def test_volatility():
+    returns = np.array([0.01, -0.02, 0.03, 0.0])
+    prices = 100 * np.concatenate(([1.0], np.cumprod(1 + returns)))
+    expected = math.sqrt(sum((r - returns.mean()) ** 2 for r in returns) / 3)
+    assert volatility(prices) == pytest.approx(expected)
+    assert volatility(prices, 252) == pytest.approx(expected * math.sqrt(252))
+    assert volatility([100, 100, 100]) == 0.0
+    assert math.isnan(volatility([100, 101]))
@@ -0,0 +1,110 @@
+"""
+Tests for eve_gateway against local OpenAI-compatible stub servers
+"""
+
+import os
+import socket
+import sys
+
+import pytest
+
+pytest.importorskip("openai")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from stub_servers import OpenAIStub  # noqa: E402
+
+from eve_gateway import LLMGateway, LLMUnavailable, ProviderConfig  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+REPLY = "word0 word1 word2 word3"
+
+
+def dead_url() -> str:
+    """A local port with nothing listening (connection refused)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+
+def provider(name, base_url):
+    return ProviderConfig(name=name, model=f"{name}-model", api_key="test", base_url=base_url, timeout=5.0)
+
+
+@pytest.fixture
+def stubs():
+    started = []
+
+    def start(latency):
+        stub = OpenAIStub(latency=latency, jitter=0.0, tokens=4, token_interval=0.0).start()
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.stop()
+
+
+def test_routes_to_the_faster_provider(stubs):
+    slow, fast = stubs(0.15), stubs(0.01)
+    gateway = LLMGateway([provider("slow", slow.base_url), provider("fast", fast.base_url)])
+    results = [gateway.complete(MESSAGES) for _ in range(5)]
+
+    assert results[0].provider == "slow"  # Unmeasured providers go in configured order
+    assert [r.provider for r in results[1:]] == ["fast"] * 4
+    assert slow.requests == 1
+    assert results[-1].content == REPLY
+    assert results[-1].usage["completion_tokens"] == 4
+
+
+def test_connection_error_fails_over_and_cools_down(stubs):
+    live = stubs(0.0)
+    gateway = LLMGateway([provider("dead", dead_url()), provider("live", live.base_url)], base_cooldown=30.0)
+
+    assert gateway.complete(MESSAGES).provider == "live"
+    dead = gateway.status()["dead"]
+    assert not dead["healthy"] and dead["failures"] == 1 and dead["cooldown_s"] > 0
+    assert "Connection" in dead["last_error"]
+
+    # While cooling down, the dead provider is ranked last and not retried
+    assert [p.name for p in gateway.ranked()] == ["live", "dead"]
+    assert gateway.complete(MESSAGES).provider == "live"
+    assert gateway.status()["dead"]["failures"] == 1
+
+
+def test_cooldown_grows_with_consecutive_failures():
+    gateway = LLMGateway([provider("dead", dead_url())], base_cooldown=1.0, max_cooldown=3.0)
+    cooldowns = []
+    for _ in range(4):
+        with pytest.raises(LLMUnavailable):
+            gateway.complete(MESSAGES)
+        cooldowns.append(gateway.status()["dead"]["cooldown_s"])
+    assert cooldowns == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_streaming_fails_over_before_the_first_delta(stubs):
+    live = stubs(0.0)
+    gateway = LLMGateway([provider("dead", dead_url()), provider("live", live.base_url)])
+    stream = gateway.stream(MESSAGES, stream_options={"include_usage": True})
+
+    assert "".join(stream) == REPLY
+    assert stream.provider == "live" and stream.model == "live-model"
+    assert stream.first_token_latency is not None and stream.latency >= stream.first_token_latency
+    assert stream.usage["completion_tokens"] == 4
+    assert gateway.status()["dead"]["failures"] == 1
+
+
+def test_all_providers_down_raises_llm_unavailable():
+    gateway = LLMGateway([provider("a", dead_url()), provider("b", dead_url())])
+    with pytest.raises(LLMUnavailable) as error:
+        gateway.complete(MESSAGES)
+    assert [a["provider"] for a in error.value.attempts] == ["a", "b"]
+
+    with pytest.raises(LLMUnavailable) as error:
+        list(gateway.stream(MESSAGES))
+    assert len(error.value.attempts) == 2
+
+
+def test_no_providers_raises_llm_unavailable():
+    with pytest.raises(LLMUnavailable):
+        LLMGateway([]).complete(MESSAGES)
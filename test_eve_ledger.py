@@ -0,0 +1,44 @@
+"""
+Tests for eve_ledger: module row counts and refreshes per query
+"""
+
+import pytest
+
+from eve_ledger import LEDGER_WORKBOOK, TASKS_CSV, LedgerIndex
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "DarkEnergy"
+    sheet.append(["Parameter", "Unit", "Value (editable)"])
+    sheet.append(["H0 (Hubble rate today)", "s^-1", 2.2e-18])
+    sheet.append(["Omega_L (dark energy fraction)", "", 0.69])
+    sheet.append(["w", "", -1])
+    workbook.save(tmp_path / LEDGER_WORKBOOK)
+    (tmp_path / TASKS_CSV).write_text("Task_ID,Priority,Status,Due_Date\nT1,High,Open,2026-01-01\n")
+    return LedgerIndex(str(tmp_path))
+
+
+def test_module_counts_are_unique_rows(ledger):
+    assert ledger.query("physics") == {"modules": {"darkenergy": 3}}
+    rows = ledger.query("physics", "DarkEnergy")["rows"]
+    assert [row["Parameter"] for row in rows] == ["H0 (Hubble rate today)", "Omega_L (dark energy fraction)", "w"]
+    assert ledger.query("physics", "DarkEnergy:H0")["rows"]["Value (editable)"] == 2.2e-18
+
+
+@pytest.mark.parametrize("data_type,key", [
+    ("physics", "DarkEnergy:H0"),
+    ("tasks", "high"),
+    ("financial", "cash"),
+    ("dashboard", "owner"),
+    ("all", None),
+])
+def test_query_refreshes_once(ledger, monkeypatch, data_type, key):
+    calls = []
+    refresh = ledger.refresh
+    monkeypatch.setattr(ledger, "refresh", lambda: calls.append(1) or refresh())
+    ledger.query(data_type, key)
+    assert len(calls) == 1
@@ -0,0 +1,115 @@
+"""
+Tests for eve_logs: the ring buffer, its filters and the JSONL sink
+"""
+
+import json
+import random
+import threading
+from datetime import datetime
+
+from eve_logs import JsonlLogSink, LogRing
+
+
+def messages(records):
+    return [record.message for record in records]
+
+
+def test_ring_overwrites_oldest_first():
+    ring = LogRing(capacity=3)
+    for index in range(5):
+        ring.append(f"m{index}", timestamp=float(index))
+    assert len(ring) == 3
+    assert messages(ring) == ["m2", "m3", "m4"]
+    assert messages(ring.tail(2)) == ["m3", "m4"]
+    assert messages(ring.tail(10)) == ["m2", "m3", "m4"]
+    ring.clear()
+    assert len(ring) == 0 and ring.tail(5) == []
+
+
+def test_level_and_time_filters():
+    ring = LogRing(capacity=10)
+    for index in range(8):
+        ring.append(f"m{index}", level="error" if index % 2 else "info", timestamp=100.0 + index)
+
+    assert messages(ring.query(level="error")) == ["m1", "m3", "m5", "m7"]
+    assert messages(ring.query(level="error", limit=2)) == ["m5", "m7"]
+    assert messages(ring.query(since=102, until=104)) == ["m2", "m3", "m4"]
+    assert messages(ring.query(since=102, until=104, level="info")) == ["m2", "m4"]
+    assert messages(ring.query(since=datetime.fromtimestamp(106))) == ["m6", "m7"]
+    assert messages(ring.query(until=101, limit=1)) == ["m1"]
+    assert ring.query(level="nonexistent") == []
+
+
+def test_out_of_order_timestamps_are_still_found():
+    ring = LogRing(capacity=4)
+    ring.append("a", timestamp=10.0)
+    ring.append("b", timestamp=30.0)
+    ring.append("late", timestamp=15.0)  # Supplied out of order
+    ring.append("c", timestamp=40.0)
+
+    assert messages(ring.query(since=12, until=20)) == ["late"]
+    assert messages(ring.query(since=12)) == ["b", "late", "c"]
+    assert messages(ring.query(until=15, level="info")) == ["a", "late"]
+
+    # Once the out-of-order record has been overwritten, the ring is sorted again
+    for index in range(3):
+        ring.append(f"d{index}", timestamp=50.0 + index)
+    assert ring._inversions == 0
+    assert messages(ring.query(since=40)) == ["c", "d0", "d1", "d2"]
+
+
+def test_queries_match_a_linear_scan():
+    rng = random.Random(7)
+    ring = LogRing(capacity=50)
+    appended = []
+    for index in range(400):
+        timestamp = index + (rng.uniform(-30, 0) if rng.random() < 0.05 else 0.0)
+        level = rng.choice(["info", "warning", "error"])
+        appended.append(ring.append(f"m{index}", level=level, timestamp=timestamp))
+        if index % 37 == 0:
+            held = appended[-len(ring):]
+            since, until = sorted(rng.uniform(index - 60, index + 1) for _ in range(2))
+            for lvl in (None, "error"):
+                expected = [r for r in held if since <= r.timestamp <= until and lvl in (None, r.level)]
+                assert ring.query(level=lvl, since=since, until=until) == expected
+
+
+def test_concurrent_appends_stay_chronological():
+    ring = LogRing(capacity=4000)
+
+    def write():
+        for index in range(500):
+            ring.append(f"{threading.get_ident()}:{index}")
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    timestamps = [record.timestamp for record in ring]
+    assert len(timestamps) == 4000
+    assert timestamps == sorted(timestamps)
+    assert ring._inversions == 0
+
+
+def test_sink_batches_and_rotates(tmp_path):
+    path = tmp_path / "eve.jsonl"
+    sink = JsonlLogSink(str(path), "TEST-CODE", max_bytes=400, backups=2, batch_size=3, flush_interval=3600)
+    ring = LogRing(capacity=10, sink=sink)
+
+    ring.append("one", timestamp=1.0)
+    ring.append("two", timestamp=2.0)
+    assert not path.exists()  # Buffered until the batch fills
+    ring.append("three", level="error", timestamp=3.0)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["message"] for line in lines] == ["one", "two", "three"]
+    assert lines[2]["level"] == "error" and lines[2]["system_code"] == "TEST-CODE"
+
+    for index in range(12):
+        ring.append(f"more {index}", timestamp=10.0 + index)
+    ring.flush()
+    assert path.stat().st_size <= 400
+    assert (tmp_path / "eve.jsonl.1").exists() and (tmp_path / "eve.jsonl.2").exists()
+    assert not (tmp_path / "eve.jsonl.3").exists()
+    newest = [json.loads(line)["message"] for line in path.read_text().splitlines()]
+    assert newest[-1] == "more 11"
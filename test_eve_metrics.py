@@ -0,0 +1,121 @@
+"""
+Tests for eve_metrics: quantile sketch accuracy, merging and empty sketches
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from eve_metrics import QUANTILES, QuantileSketch
+
+ACCURACY = 0.01
+
+
+def samples(name, n=20000):
+    rng = np.random.default_rng(38)
+    return {
+        "lognormal": lambda: rng.lognormal(mean=-2.0, sigma=1.0, size=n),
+        "exponential": lambda: rng.exponential(scale=0.25, size=n),
+        "uniform": lambda: rng.uniform(0.001, 5.0, size=n),
+        "bimodal": lambda: np.concatenate([rng.normal(0.05, 0.005, n * 3 // 5), rng.normal(2.0, 0.2, n * 2 // 5)]),
+    }[name]()
+
+
+def sketch_of(values, accuracy=ACCURACY):
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(float(value))
+    return sketch
+
+
+def relative_error(estimate, exact):
+    return abs(estimate - exact) / exact
+
+
+@pytest.mark.parametrize("distribution", ["lognormal", "exponential", "uniform", "bimodal"])
+def test_quantiles_within_relative_accuracy(distribution):
+    values = samples(distribution)
+    sketch = sketch_of(values)
+    for q in QUANTILES:
+        # The sketch ranks like numpy's "lower" method: the sample at floor(q * (n - 1))
+        exact = np.percentile(values, q * 100, method="lower")
+        assert relative_error(sketch.quantile(q), exact) <= ACCURACY + 1e-12
+        # Interpolated percentiles differ from it by at most the gap to the next sample
+        assert relative_error(sketch.quantile(q), np.percentile(values, q * 100)) <= 2 * ACCURACY
+
+
+@pytest.mark.parametrize("accuracy", [0.005, 0.02, 0.05])
+def test_accuracy_parameter_is_honoured(accuracy):
+    values = samples("lognormal", 5000)
+    sketch = sketch_of(values, accuracy)
+    for q in QUANTILES:
+        exact = np.percentile(values, q * 100, method="lower")
+        assert relative_error(sketch.quantile(q), exact) <= accuracy + 1e-12
+
+
+def test_extremes_and_summary():
+    values = samples("exponential", 1000)
+    sketch = sketch_of(values)
+    assert sketch.count == 1000
+    assert sketch.total == pytest.approx(values.sum())
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+    assert sketch.quantile(0.0) == pytest.approx(values.min(), rel=ACCURACY)
+    assert sketch.quantile(1.0) == pytest.approx(values.max(), rel=ACCURACY)
+
+
+def test_single_value_is_exact():
+    sketch = sketch_of([0.123])
+    assert [sketch.quantile(q) for q in QUANTILES] == [0.123] * 3
+
+
+def test_values_below_min_value_share_the_lowest_bucket():
+    sketch = sketch_of([0.0, 1e-9, 1e-8, 1.0])
+    assert sketch.quantile(0.0) == pytest.approx(1e-6, rel=ACCURACY)
+    assert sketch.quantile(0.5) == pytest.approx(1e-6, rel=ACCURACY)
+    assert sketch.quantile(1.0) == pytest.approx(1.0, rel=ACCURACY)
+    # Estimates are clamped to the observed range
+    assert sketch_of([0.0, 1e-9, 1e-8]).quantile(0.5) == 1e-8
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+    assert sketch.count == 0
+    assert [sketch.quantile(q) for q in QUANTILES] == [None] * 3
+
+
+def test_merge_matches_one_sketch_over_all_values():
+    values = samples("lognormal")
+    whole = sketch_of(values)
+    merged = QuantileSketch(ACCURACY)
+    for part in np.array_split(values, 3):
+        merged.merge(sketch_of(part))
+    assert merged.count == whole.count
+    assert merged.total == pytest.approx(whole.total)
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+    assert [merged.quantile(q) for q in QUANTILES] == [whole.quantile(q) for q in QUANTILES]
+
+
+def test_merge_with_empty_sketches():
+    values = samples("uniform", 1000)
+    sketch = sketch_of(values)
+    expected = [sketch.quantile(q) for q in QUANTILES]
+    sketch.merge(QuantileSketch(ACCURACY))
+    assert sketch.count == 1000
+    assert [sketch.quantile(q) for q in QUANTILES] == expected
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+
+    empty = QuantileSketch(ACCURACY)
+    empty.merge(sketch)
+    assert [empty.quantile(q) for q in QUANTILES] == expected
+
+    both_empty = QuantileSketch(ACCURACY)
+    both_empty.merge(QuantileSketch(ACCURACY))
+    assert both_empty.quantile(0.5) is None
+    assert (both_empty.min, both_empty.max) == (math.inf, -math.inf)
+
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
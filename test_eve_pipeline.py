@@ -0,0 +1,90 @@
+"""
+Tests for eve_pipeline: sentence splitting and overlapped synthesis
+"""
+
+import threading
+import time
+
+import pytest
+
+from eve_pipeline import pipeline_synthesis, split_sentences
+
+TEXT = ("Here is where things stand this morning. Your ledger is up to date! "
+        "Three tasks remain open, and one is due soon. Shall I draft a summary?")
+SENTENCES = ["Here is where things stand this morning.", "Your ledger is up to date!",
+             "Three tasks remain open, and one is due soon.", "Shall I draft a summary?"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(TEXT)])
+def test_sentences_are_the_same_however_the_text_is_chunked(size):
+    deltas = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+    assert list(split_sentences(deltas)) == SENTENCES
+
+
+def test_boundaries_spanning_deltas():
+    deltas = ["He said \"it is done", ".", "\"", " ", "Then he left the room quietly", ".)", "\n", "Fin"]
+    expected = ['He said "it is done.', "Then he left the room quietly.", "Fin"]
+    assert list(split_sentences(["".join(deltas)], min_chars=5)) == expected
+    assert list(split_sentences(deltas, min_chars=5)) == expected
+
+
+def test_short_fragments_merge_with_the_next_sentence():
+    deltas = ["Hi. ", "Dr. ", "Smith will see you at three today. ", "Ok."]
+    assert list(split_sentences(deltas)) == ["Hi. Dr. Smith will see you at three today.", "Ok."]
+    assert list(split_sentences(["3.14 is pi. ", "e.g.x stays whole here."], min_chars=1)) == [
+        "3.14 is pi.", "e.g.x stays whole here."]
+    assert list(split_sentences(["\n\n", "\n"], min_chars=0)) == []
+
+
+def test_long_reply_without_boundaries_is_linear():
+    deltas = ["x = compute(value)  "] * 20000  # 400k characters, no sentence end
+    started = time.perf_counter()
+    assert list(split_sentences(deltas)) == ["".join(deltas).strip()]
+    assert time.perf_counter() - started < 1.0
+
+
+def test_audio_comes_back_in_sentence_order():
+    delays = {"a": 0.08, "b": 0.0, "c": 0.04, "d": 0.0}
+
+    def synthesize(text):
+        time.sleep(delays[text])
+        return text.upper().encode()
+
+    results = list(pipeline_synthesis(iter("abcd"), synthesize, max_workers=4))
+    assert results == [("a", b"A"), ("b", b"B"), ("c", b"C"), ("d", b"D")]
+
+
+def test_producer_errors_reach_the_consumer():
+    def sentences():
+        yield "one"
+        raise RuntimeError("stream broke")
+
+    pipeline = pipeline_synthesis(sentences(), lambda text: b"")
+    assert next(pipeline) == ("one", b"")
+    with pytest.raises(RuntimeError, match="stream broke"):
+        next(pipeline)
+
+
+def test_early_close_cancels_and_closes_upstream():
+    cancel = threading.Event()
+    pulled, closed = [], threading.Event()
+
+    def upstream():
+        # Stands in for split_sentences(chat_stream(cancel=cancel))
+        try:
+            for index in range(1000):
+                if cancel.is_set():
+                    return
+                pulled.append(index)
+                yield f"sentence {index}"
+                time.sleep(0.005)
+        finally:
+            closed.set()
+
+    pipeline = pipeline_synthesis(upstream(), lambda text: b"", max_pending=2, cancel=cancel)
+    assert next(pipeline)[0] == "sentence 0"
+    pipeline.close()
+
+    assert cancel.is_set()
+    assert closed.wait(2)
+    assert len(pulled) < 10
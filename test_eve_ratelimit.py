@@ -0,0 +1,134 @@
+"""
+Tests for eve_ratelimit: token accounting and the API's batch cost
+"""
+
+import json
+import math
+
+import pytest
+
+import eve_api
+from eve_api import ApiRequest, dispatch
+from eve_ratelimit import MemoryBackend, RateLimitBackend, RateLimiter, RedisBackend
+
+
+def test_backend_must_implement_take():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_cost_is_charged_in_full():
+    limiter = RateLimiter({"chat": (60, 20)})
+    quota = limiter.take("chat", "a", 15)
+    assert quota.allowed and quota.remaining == pytest.approx(5, abs=0.1)
+    quota = limiter.take("chat", "a", 15)
+    assert not quota.allowed
+    assert quota.retry_after == pytest.approx(10, abs=0.1)
+
+
+def test_cost_above_burst_is_refused_without_spending():
+    limiter = RateLimiter({"chat": (60, 20)})
+    quota = limiter.take("chat", "a", 21)
+    assert not quota.allowed and math.isinf(quota.retry_after)
+    assert limiter.take("chat", "a", 20).allowed
+    assert limiter.status()["limited"] == 1
+
+
+def test_buckets_are_per_client_and_policy():
+    limiter = RateLimiter({"chat": (60, 2), "voice": (30, 1)})
+    assert limiter.take("chat", "a").allowed
+    assert limiter.take("chat", "a").allowed
+    assert not limiter.take("chat", "a").allowed
+    assert limiter.take("chat", "b").allowed
+    assert limiter.take("voice", "a").allowed
+
+
+def test_backend_failure_allows_the_request():
+    class Broken(RateLimitBackend):
+        def take(self, key, cost, rate, burst):
+            raise ConnectionError("down")
+
+    limiter = RateLimiter({"chat": (60, 20)}, Broken())
+    assert limiter.take("chat", "a").allowed
+    assert limiter.status()["backend_errors"] == 1
+
+
+def test_redis_backend_matches_memory_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    redis = RateLimiter({"chat": (60, 5)}, RedisBackend(client=fakeredis.FakeRedis()))
+    memory = RateLimiter({"chat": (60, 5)}, MemoryBackend())
+    for cost in (2, 2, 2, 1, 6):
+        a, b = redis.take("chat", "a", cost), memory.take("chat", "a", cost)
+        assert a.allowed == b.allowed
+        assert a.remaining == pytest.approx(b.remaining, abs=0.1)
+
+
+def post_batch(messages, client="10.0.0.1"):
+    return dispatch(ApiRequest(method="POST", path=eve_api.BATCH_PATH, client=client,
+                               headers={"content-type": "application/json"},
+                               body=json.dumps({"messages": messages}).encode()))
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter({"chat": (60, 20), "voice": (30, 10)})
+    monkeypatch.setattr(eve_api, "RATE_LIMITER", limiter)
+    return limiter
+
+
+def test_batch_is_charged_per_distinct_message(limiter):
+    request = ApiRequest(method="POST", path=eve_api.BATCH_PATH, client="10.0.0.1",
+                         body=json.dumps({"messages": [f"q{i}" for i in range(15)] + ["q0"]}).encode())
+    eve_api.throttle(request)
+    assert dict(request.quota)["RateLimit-Remaining"] == "5"
+    with pytest.raises(eve_api.ApiError) as error:
+        eve_api.throttle(ApiRequest(method="POST", path=eve_api.BATCH_PATH, client="10.0.0.1",
+                                    body=json.dumps({"messages": [f"q{i}" for i in range(6)]}).encode()))
+    assert error.value.status == 429
+
+
+def test_batch_larger_than_burst_is_rejected(limiter):
+    response = post_batch([f"question {i}" for i in range(21)])
+    assert response.status == 429
+    assert response.header("Retry-After") is None
+    assert "more than the limit of 20" in json.loads(response.body)["error"]
+    # Nothing was spent, so a batch that fits still goes through the limiter
+    request = ApiRequest(method="POST", path=eve_api.BATCH_PATH, client="10.0.0.1",
+                         body=json.dumps({"messages": [f"q{i}" for i in range(20)]}).encode())
+    eve_api.throttle(request)
+    assert dict(request.quota)["RateLimit-Remaining"] == "0"
+
+
+@pytest.mark.parametrize("name,value", [
+    ("EVE_API_RATE_CHAT_BURST", "ten"),
+    ("EVE_API_RATE_CHAT_BURST", "2.5"),
+    ("EVE_API_RATE_CHAT_PER_MIN", "-1"),
+    ("EVE_API_RATE_VOICE_PER_MIN", "nan"),
+])
+def test_malformed_settings_fall_back_to_defaults(monkeypatch, capsys, name, value):
+    from eve_ratelimit import DEFAULT_POLICIES, rate_limiter_from_env
+    monkeypatch.setenv(name, value)
+    limiter = rate_limiter_from_env()
+    policies = limiter.status()["policies"]
+    assert {k: (v["per_minute"], v["burst"]) for k, v in policies.items()} == DEFAULT_POLICIES
+    assert name in limiter.status()["config_errors"][0]
+    assert name in capsys.readouterr().err
+
+
+def test_unusable_redis_url_falls_back_to_memory(monkeypatch):
+    from eve_ratelimit import rate_limiter_from_env
+    monkeypatch.setenv("EVE_API_RATE_LIMIT_REDIS_URL", "not-a-redis-url")
+    limiter = rate_limiter_from_env()
+    assert limiter.backend.name == "memory"
+    assert "Redis" in limiter.status()["config_errors"][0]
+    assert limiter.take("chat", "a").allowed
+
+
+def test_valid_settings_are_used(monkeypatch):
+    from eve_ratelimit import rate_limiter_from_env
+    monkeypatch.setenv("EVE_API_RATE_CHAT_PER_MIN", "120")
+    monkeypatch.setenv("EVE_API_RATE_CHAT_BURST", "64")
+    status = rate_limiter_from_env().status()
+    assert status["policies"]["chat"] == {"per_minute": 120.0, "burst": 64}
+    assert "config_errors" not in status
@@ -0,0 +1,43 @@
+"""
+Tests for eve_router: what must not be taken for arithmetic
+"""
+
+import pytest
+
+from eve_router import ROUTE_CALCULATOR, ROUTE_LLM, route_intent
+
+
+@pytest.mark.parametrize("message", [
+    "2024-10-15",
+    "what is 2024-10-15?",
+    "Remind me on 2024-1-5 + 1",
+    "12 34",
+    "2 (3)",
+    "(1)(2)",
+    "2 max(4, 5)",
+    "1,5 + 2",
+    "[1, 2]",
+    "1, 2",
+    "1 000 + 5",
+    "42",
+    "what is the meaning of 42?",
+    "call 555-1234",
+])
+def test_not_arithmetic(message):
+    assert route_intent(message).route == ROUTE_LLM
+
+
+@pytest.mark.parametrize("message,expression", [
+    ("1,000 + 5", "1000 + 5"),
+    ("what's 1,234,567 * 2?", "1234567 * 2"),
+    ("what is 2 + 2?", "2 + 2"),
+    ("max(1, 2) + 3", "max(1, 2) + 3"),
+    ("round(2.567, 2)", "round(2.567, 2)"),
+    ("sum([1, 2, 3])", "sum([1, 2, 3])"),
+    ("2*(3+4)", "2*(3+4)"),
+    ("-5 + 3", "-5 + 3"),
+])
+def test_arithmetic(message, expression):
+    intent = route_intent(message)
+    assert intent.route == ROUTE_CALCULATOR
+    assert intent.argument == expression
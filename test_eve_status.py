@@ -0,0 +1,121 @@
+"""
+Tests for eve_status: stale-while-revalidate status snapshots
+"""
+
+import threading
+import time
+
+from eve_status import StatusSnapshot
+
+
+class GatedBuild:
+    """A build function that counts calls and can be held open"""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        self.started.set()
+        self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return {"version": call}
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def read_concurrently(snapshot, readers=32):
+    barrier = threading.Barrier(readers)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(snapshot.get()[0])
+
+    threads = [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_first_reads_build_once():
+    build = GatedBuild()
+    snapshot = StatusSnapshot(build, interval=60)
+    assert read_concurrently(snapshot) == [{"version": 1}] * 32
+    assert build.calls == 1
+
+
+def test_fresh_value_is_served_without_rebuilding():
+    build = GatedBuild()
+    snapshot = StatusSnapshot(build, interval=60)
+    snapshot.prime()
+    for _ in range(100):
+        value, age = snapshot.get()
+    assert value == {"version": 1} and 0 <= age < 60
+    assert build.calls == 1
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    build = GatedBuild()
+    snapshot = StatusSnapshot(build, interval=60)
+    snapshot.prime()
+    build.gate.clear()
+    build.started.clear()
+    snapshot.invalidate()
+
+    # Every reader gets the stale value at once; only one rebuild starts
+    started = time.monotonic()
+    assert read_concurrently(snapshot) == [{"version": 1}] * 32
+    assert time.monotonic() - started < 2
+    assert build.started.wait(5)
+    assert read_concurrently(snapshot) == [{"version": 1}] * 32
+    assert build.calls == 2
+
+    build.gate.set()
+    wait_for(lambda: snapshot.refreshes == 2)
+    value, age = snapshot.get()
+    assert value == {"version": 2} and age < 1
+    assert build.calls == 2
+
+
+def test_failed_refresh_keeps_the_last_value():
+    build = GatedBuild()
+    snapshot = StatusSnapshot(build, interval=60)
+    snapshot.prime()
+    build.fail = True
+    snapshot.invalidate()
+    assert snapshot.get()[0] == {"version": 1}
+    wait_for(lambda: snapshot.errors == 1)
+
+    # Not retried before another interval has passed
+    assert snapshot.get()[0] == {"version": 1}
+    time.sleep(0.05)
+    assert build.calls == 2
+    status = snapshot.status()
+    assert status["errors"] == 1 and status["last_error"] == "backend down"
+    assert status["refreshes"] == 1
+
+
+def test_refresh_after_interval():
+    build = GatedBuild()
+    snapshot = StatusSnapshot(build, interval=0.05)
+    snapshot.prime()
+    time.sleep(0.06)
+    assert snapshot.get()[0] == {"version": 1}
+    wait_for(lambda: snapshot.refreshes == 2)
+    assert snapshot.get()[0] == {"version": 2}
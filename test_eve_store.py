@@ -0,0 +1,132 @@
+"""
+Tests for eve_store: writes after close and failed commits
+"""
+
+import sqlite3
+
+from eve_store import EVEStore
+
+
+def test_writes_after_close_are_ignored(tmp_path):
+    store = EVEStore(str(tmp_path / "eve.db"), flush_interval=0.01)
+    store.record_message("s", "user", "kept")
+    store.close()
+    store.record_message("s", "user", "dropped")
+    store.record_log(0.0, "info", "dropped")
+    store.clear_session("s")
+    assert store.flush(timeout=0.1)
+    store.close()
+
+    reopened = EVEStore(str(tmp_path / "eve.db"))
+    try:
+        assert reopened.recent_messages("s") == [{"role": "user", "content": "kept"}]
+    finally:
+        reopened.close()
+
+
+def test_failed_commits_are_reported_once_per_outage(tmp_path):
+    path = str(tmp_path / "eve.db")
+    errors = []
+    store = EVEStore(path, flush_interval=0.01, on_error=errors.append)
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TRIGGER fail BEFORE INSERT ON messages "
+                           "BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+    try:
+        for attempt in range(3):
+            store.record_message("s", "user", f"lost {attempt}")
+            assert store.flush()
+        assert store.write_errors == 3
+        assert len(errors) == 1 and "disk full" in errors[0]
+
+        with sqlite3.connect(path) as connection:
+            connection.execute("DROP TRIGGER fail")
+        store.record_message("s", "user", "saved")
+        assert store.flush()
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TRIGGER fail BEFORE INSERT ON messages "
+                               "BEGIN SELECT RAISE(ABORT, 'disk full again'); END")
+        store.record_message("s", "user", "lost again")
+        assert store.flush()
+        assert len(errors) == 2
+    finally:
+        store.close()
+
+
+def test_unwritable_path_disables_the_store(tmp_path):
+    errors = []
+    store = EVEStore(str(tmp_path), on_error=errors.append)  # A directory can't be opened as a database
+    assert store.disabled
+    assert len(errors) == 1 and "Store unavailable" in errors[0]
+    store.record_message("s", "user", "ignored")
+    store.record_log(0.0, "info", "ignored")
+    assert store._queue.qsize() == 0
+    assert store.flush(timeout=5) is False
+    assert store.recent_messages("s") == [] and store.logs_between() == []
+    store.close()
+
+
+def test_writer_that_cannot_connect_disables_the_store(tmp_path, monkeypatch):
+    import eve_store
+    connect = eve_store._connect
+    calls = []
+
+    def connect_reader_only(path):
+        calls.append(path)
+        if len(calls) > 1:
+            raise sqlite3.OperationalError("unable to open database file")
+        return connect(path)
+
+    monkeypatch.setattr(eve_store, "_connect", connect_reader_only)
+    errors = []
+    store = EVEStore(str(tmp_path / "eve.db"), on_error=errors.append)
+    store._writer.join(timeout=5)
+    assert store.disabled and "could not open" in errors[0]
+    store.record_message("s", "user", "ignored")
+    assert store.flush(timeout=5) is False
+    store.close()
+
+
+def test_writer_survives_unexpected_errors(tmp_path, monkeypatch):
+    errors = []
+    store = EVEStore(str(tmp_path / "eve.db"), flush_interval=0.01, on_error=errors.append)
+    next_batch = store._next_batch
+    failures = [RuntimeError("boom")]
+
+    def flaky():
+        if failures:
+            raise failures.pop()
+        return next_batch()
+
+    monkeypatch.setattr(store, "_next_batch", flaky)
+    store.record_message("s", "user", "saved")
+    assert store.flush()
+    assert store._writer.is_alive()
+    assert store.recent_messages("s") == [{"role": "user", "content": "saved"}]
+    assert store.write_errors == 1 and "RuntimeError: boom" in errors[0]
+    store.close()
+
+
+def test_full_queue_drops_and_counts(tmp_path, monkeypatch):
+    import threading
+    errors = []
+    store = EVEStore(str(tmp_path / "eve.db"), flush_interval=0.01, max_queue=3, on_error=errors.append)
+    taken, release = threading.Event(), threading.Event()
+    next_batch = store._next_batch
+
+    def stalled():
+        batch = next_batch()
+        taken.set()
+        release.wait()
+        return batch
+
+    monkeypatch.setattr(store, "_next_batch", stalled)
+    store.record_message("s", "user", "first")  # Taken by the writer, which then stalls
+    assert taken.wait(5)
+    for index in range(10):
+        store.record_message("s", "user", f"m{index}")
+    assert store.dropped == 7
+    release.set()
+    assert store.flush()
+    assert len(store.recent_messages("s")) == 4
+    assert any("7 item(s) dropped" in error for error in errors)
+    store.close()
@@ -0,0 +1,74 @@
+"""
+Tests for eve_vad: WAV validation and endpointing
+"""
+
+import io
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import eve_vad  # noqa: E402
+from eve_vad import Endpointer, endpoint_stream, read_wav  # noqa: E402
+
+
+def wav(samples, rate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("audio", [
+    wav([100] * 64, rate=8),
+    wav([100] * 64, rate=200000),
+    wav([100] * 64)[:40] + (10 ** 9).to_bytes(4, "little") + wav([100] * 64)[44:],
+    b"RIFF",
+])
+def test_read_wav_rejects_bad_rates_and_lengths(audio):
+    with pytest.raises(ValueError):
+        read_wav(audio)
+
+
+@pytest.mark.parametrize("sample_rate,frame_ms", [(8, 20), (40, 20), (16000, 0)])
+def test_endpointer_rejects_empty_frames(sample_rate, frame_ms):
+    with pytest.raises(ValueError):
+        Endpointer(sample_rate=sample_rate, frame_ms=frame_ms)
+
+
+def test_transcribe_rejects_bad_rate_with_a_log(monkeypatch):
+    import eve_voice_agent
+    monkeypatch.setattr(eve_voice_agent, "SPEECH_RECOGNITION_AVAILABLE", True)
+    monkeypatch.setenv("EVE_STORE_PATH", "")
+    monkeypatch.setenv("EVE_LOG_FILE", "")
+    agent = eve_voice_agent.EVEAgent()
+    logged = []
+    agent._log = lambda message, level="info": logged.append((level, message))
+    assert agent.transcribe(wav([100] * 64, rate=8)) == ""
+    assert logged and logged[0][0] == "error"
+
+
+def test_speech_between_silences_is_one_utterance():
+    rate = 16000
+    rng = np.random.default_rng(0)
+    silence = rng.normal(0, 30, rate).astype("<i2")
+    t = np.arange(rate) / rate
+    speech = (8000 * np.sin(2 * np.pi * 220 * t)).astype("<i2")
+    pcm = np.concatenate([silence, speech, silence]).tobytes()
+    chunks = [pcm[i:i + 999] for i in range(0, len(pcm), 999)]  # Frames split across chunks
+
+    utterances = list(endpoint_stream(chunks, sample_rate=rate))
+    assert len(utterances) == 1
+    assert utterances[0].start == pytest.approx(1.0, abs=0.25)
+    assert utterances[0].duration == pytest.approx(1.0, abs=0.4)
+    assert read_wav(utterances[0].wav_bytes())[1] == rate
+
+
+def test_max_clip_length_is_enforced_from_the_header(monkeypatch):
+    monkeypatch.setattr(eve_vad, "MAX_CLIP_SECONDS", 0.001)
+    with pytest.raises(ValueError):
+        read_wav(wav([100] * 64))